@@ -1,15 +1,20 @@
+import hashlib
+import hmac
 import logging
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import ValidationError
 
-from firebase_admin import auth
+from app.auth import firebase
 from app.auth.firebase import decode_token
+from app.core.config import METRICS_TOKEN
 from app.schemas.firebase import FirebaseClaims
 
 from app.models.user import User
-from app.data_access.user_dal import UserDAL
-from app.data_access.deps import get_user_dal
+from app.data_access.user_dal import AsyncUserDAL, user_identity_cache
+from app.data_access.collection_version_dal import AsyncCollectionVersionDAL, Collection
+from app.data_access.category_dal import AsyncCategoryDAL
+from app.data_access.deps import get_category_dal, get_collection_version_dal, get_user_dal
 
 logger = logging.getLogger(__name__)
 
@@ -43,22 +48,22 @@ def get_bearer_token(
 def get_firebase_claims(id_token: str = Depends(get_bearer_token)) -> FirebaseClaims:
     try:
         return decode_token(id_token)
-    except auth.RevokedIdTokenError:
+    except firebase.auth.RevokedIdTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="ID token has been revoked"
         )
-    except auth.UserDisabledError:
+    except firebase.auth.UserDisabledError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User account is disabled"
         )
-    except auth.ExpiredIdTokenError:
+    except firebase.auth.ExpiredIdTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="ID token is expired"
         )
-    except auth.InvalidIdTokenError:
+    except firebase.auth.InvalidIdTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="ID token is invalid"
@@ -81,12 +86,12 @@ def get_firebase_claims(id_token: str = Depends(get_bearer_token)) -> FirebaseCl
         )
 
 
-def get_current_user(
+async def get_current_user(
     claims: FirebaseClaims = Depends(get_firebase_claims),
-    user_dal: UserDAL = Depends(get_user_dal)
+    user_dal: AsyncUserDAL = Depends(get_user_dal)
 ) -> User:
     firebase_uid = claims.uid
-    user = user_dal.get_user_by_firebase_uid(firebase_uid)
+    user = await user_dal.get_user_by_firebase_uid(firebase_uid)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -95,7 +100,80 @@ def get_current_user(
     return user
         
 
-def get_current_user_id(
-    user: User = Depends(get_current_user)
+async def get_current_user_id(
+    claims: FirebaseClaims = Depends(get_firebase_claims),
+    user_dal: AsyncUserDAL = Depends(get_user_dal)
 ) -> int:
-    return user.user_id
+    # the cache hit path never touches the session, so no connection is checked out for auth
+    identity = user_identity_cache.get(claims.uid)
+    if not identity:
+        identity = await user_dal.get_identity_by_firebase_uid(claims.uid)
+    if not identity:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return identity.user_id
+
+
+# clients must revalidate (If-None-Match) before reusing a cached response; shared caches must not store it
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+
+def require_metrics_token(authorization: str | None = Header(default=None)) -> None:
+    """
+    Guard for internal telemetry (/metrics, pool and recognition counters): only callers sending
+    `Authorization: Bearer <METRICS_TOKEN>` get through. 404 while METRICS_TOKEN is unset, so an
+    unconfigured deployment doesn't advertise the endpoints.
+    """
+    if METRICS_TOKEN is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not hmac.compare_digest((authorization or "").encode(), f"Bearer {METRICS_TOKEN}".encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of `etag` against an If-None-Match header (a list of tags, or *)."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == opaque
+        for candidate in (tag.strip() for tag in if_none_match.split(","))
+    )
+
+
+def conditional_get(collection: Collection, *, embeds_categories: bool = False):
+    """
+    Dependency for GET routes that serve one of the user's collections.
+
+    The ETag is derived from the user's collection version (bumped by the DALs on every
+    write) and the request URL, so it costs one primary-key lookup. A matching
+    If-None-Match answers 304 before the route body, and so the list query, runs.
+    `embeds_categories` also folds in the categories snapshot version, for routes that
+    can embed category names (categories change outside the user's writes).
+    """
+    async def check_not_modified(
+        request: Request,
+        response: Response,
+        user_id: int = Depends(get_current_user_id),
+        collection_version_dal: AsyncCollectionVersionDAL = Depends(get_collection_version_dal),
+        category_dal: AsyncCategoryDAL = Depends(get_category_dal)
+    ) -> None:
+        version = await collection_version_dal.get(user_id=user_id, collection=collection)
+        if embeds_categories:
+            version = f"{version}:{(await category_dal.get_snapshot()).version}"
+        digest = hashlib.sha256(
+            f"{user_id}:{collection}:{version}:{request.url.path}?{request.url.query}".encode("utf-8")
+        ).hexdigest()[:32]
+        etag = f'W/"{digest}"'
+        headers = {"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return check_not_modified
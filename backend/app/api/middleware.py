@@ -0,0 +1,109 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import SQL_QUERY_STATS, SQL_REPEATED_QUERY_THRESHOLD
+from app.core.metrics import http_request_duration, http_requests_in_flight
+from app.db.query_stats import track_queries
+
+logger = logging.getLogger(__name__)
+
+# methods recorded as-is; anything else a client sends is labelled "other"
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+# id(route) -> full path template; routes live as long as the app
+_route_templates: dict[int, str] = {}
+
+
+def route_template(scope: Scope) -> str:
+    """
+    The full path template of the route that handled `scope` (`/products/{product_id}`),
+    or `unmatched`.
+
+    The router only records the matched route, whose path is relative to the router it
+    was included into. The include prefixes are static, so the prefix is whatever precedes
+    the part of the request path the route matched; it is worked out once per route.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = _route_templates.get(id(route))
+    if template is None:
+        path = scope["path"]
+        start = 0
+        while start != -1 and not route.path_regex.match(path[start:]):
+            start = path.find("/", start + 1)
+        template = _route_templates[id(route)] = (path[:start] if start != -1 else "") + route.path
+    return template
+
+
+class RequestMetricsMiddleware:
+    """
+    Records every HTTP request into `http_request_duration` and `http_requests_in_flight`.
+
+    Plain ASGI rather than BaseHTTPMiddleware, which would add a task and a stream per
+    request. Requests are labelled by route template (`/products/{product_id}`), never the
+    raw path, so the series stay bounded; requests no route matched share `unmatched`, and
+    methods outside METHODS share `other`.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # an exception that escapes the app becomes a 500 in ServerErrorMiddleware, outside this one
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            method = scope["method"] if scope["method"] in METHODS else "other"
+            http_request_duration.observe(time.perf_counter() - start, method, route_template(scope), str(status_code))
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the SQL statements and DB time of every HTTP request (SQL_QUERY_STATS).
+
+    Logs a warning for each statement shape that ran more than SQL_REPEATED_QUERY_THRESHOLD
+    times - the signature of an N+1 - and in "headers" mode reports the totals in
+    X-DB-Query-Count / X-DB-Query-Time-Ms (statements run before the response started).
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_query_headers(message: Message) -> None:
+                if message["type"] == "http.response.start" and SQL_QUERY_STATS == "headers":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(stats.count)
+                    headers["X-DB-Query-Time-Ms"] = f"{stats.seconds * 1000:.1f}"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_query_headers)
+            finally:
+                for shape, count in stats.repeated(SQL_REPEATED_QUERY_THRESHOLD):
+                    logger.warning(
+                        "%s %s ran the same statement %d times (%d statements in total): %.500s",
+                        scope["method"], route_template(scope), count, stats.count, shape,
+                    )
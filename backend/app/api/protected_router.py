@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 from app.api.deps import get_firebase_claims
-from app.api.routes import user, grocery_run, inventory_batch, product
+from app.api.routes import user, grocery_run, inventory_batch, product, stock, reports, sync, recognizeItem, catalog, category
 
 private_api_router = APIRouter(
     dependencies=[Depends(get_firebase_claims)]
@@ -9,4 +9,10 @@ private_api_router = APIRouter(
 private_api_router.include_router(user.router, prefix="/user",  tags=["user"])
 private_api_router.include_router(grocery_run.router, prefix="/grocery-runs",  tags=["grocery runs"])
 private_api_router.include_router(product.router, prefix="/products",  tags=["products"])
-private_api_router.include_router(inventory_batch.router, prefix="/inventory-batches",  tags=["inventory batches"])
\ No newline at end of file
+private_api_router.include_router(inventory_batch.router, prefix="/inventory-batches",  tags=["inventory batches"])
+private_api_router.include_router(stock.router, prefix="/stock",  tags=["stock"])
+private_api_router.include_router(reports.router, prefix="/reports",  tags=["reports"])
+private_api_router.include_router(sync.router, prefix="/sync",  tags=["sync"])
+private_api_router.include_router(recognizeItem.router, prefix="/recognize-item",  tags=["recognition"])
+private_api_router.include_router(catalog.router, prefix="/catalog",  tags=["catalog"])
+private_api_router.include_router(category.router, prefix="/categories",  tags=["categories"])
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
-from app.api.routes import health
+from app.api.routes import health, metrics
 
 public_api_router = APIRouter()
 
-public_api_router.include_router(health.router, prefix="/health", tags=["health"])
\ No newline at end of file
+public_api_router.include_router(health.router, prefix="/health", tags=["health"])
+public_api_router.include_router(metrics.router, tags=["metrics"])
@@ -0,0 +1,28 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from fastapi import Response
+from pydantic_core import to_json
+from sqlalchemy import Row
+
+
+def row_dicts(rows: Sequence[Row]) -> list[dict[str, Any]]:
+    """Turn result rows into dicts, reading the column names once rather than per row via `_mapping`."""
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def json_rows_response(items: Iterable[dict[str, Any]], response: Response) -> Response:
+    """
+    Encode plain rows straight to JSON bytes, bypassing response_model validation.
+
+    pydantic-core's encoder formats Decimals, datetimes and enums exactly as the
+    *Read schemas do, so callers only need to emit the schema's keys in field order.
+    Headers set on the route's `response` (ETag, next cursor) are carried over,
+    since FastAPI only merges them into responses it builds itself.
+    """
+    fast = Response(content=to_json(list(items)), media_type="application/json")
+    fast.headers.update(response.headers)
+    return fast
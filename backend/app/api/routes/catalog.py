@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from app.schemas.catalog import CatalogEntryRead
+
+from app.api.deps import get_current_user_id
+from app.core.config import CATALOG_CACHE_MAX_AGE_SECONDS
+from app.data_access.catalog_dal import AsyncCatalogDAL
+from app.data_access.product_dal import AsyncProductDAL
+from app.data_access.deps import get_catalog_dal, get_product_dal
+from app.services.barcode_catalog import barcode_forms, normalize_barcode
+
+router = APIRouter()
+
+@router.get("/barcode/{code}", response_model=CatalogEntryRead)
+async def get_catalog_entry(
+    code: str,
+    response: Response,
+    user_id: int = Depends(get_current_user_id),
+    catalog_dal: AsyncCatalogDAL = Depends(get_catalog_dal),
+    product_dal: AsyncProductDAL = Depends(get_product_dal)
+):
+    """
+    Look a scanned barcode up in the shared OpenFoodFacts catalog, falling back to
+    the caller's own products (for items the catalog does not know).
+    """
+    barcode = normalize_barcode(code)
+    if barcode is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid barcode")
+
+    entry = await catalog_dal.get_by_barcode(barcode)
+    if entry:
+        # catalog rows only change on re-import; let the device reuse the answer
+        response.headers["Cache-Control"] = f"private, max-age={CATALOG_CACHE_MAX_AGE_SECONDS}"
+        return entry
+
+    # user products keep the barcode as entered: match the UPC-A / EAN-13 / ... forms alike
+    product = await product_dal.get_by_any_barcode(user_id=user_id, barcodes=barcode_forms(barcode))
+    if product:
+        return CatalogEntryRead(
+            source="product",
+            product_id=product.id,
+            barcode=product.barcode,
+            name=product.name,
+            brand=product.brand,
+            quantity=product.size,
+        )
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Barcode {code} not found"
+    )
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from app.schemas.category import CategoryRead
+
+from app.api.deps import CONDITIONAL_CACHE_CONTROL, etag_matches
+from app.data_access.category_dal import AsyncCategoryDAL
+from app.data_access.deps import get_category_dal
+
+router = APIRouter()
+
+@router.get("/", response_model=list[CategoryRead])
+async def get_categories(
+    request: Request,
+    category_dal: AsyncCategoryDAL = Depends(get_category_dal)
+):
+    """
+    All categories, by name. Served from the in-process snapshot: the body is encoded once
+    per categories version and its ETag answers a matching If-None-Match with 304.
+    """
+    snapshot = await category_dal.get_snapshot()
+    headers = {"ETag": snapshot.etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
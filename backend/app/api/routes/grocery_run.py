@@ -1,45 +1,83 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
-from app.schemas.grocery_run import GroceryRunRead, GroceryRunCreate, GroceryRunUpdate
+from app.schemas.grocery_run import (
+    GroceryRunBatchSummary,
+    GroceryRunCreate,
+    GroceryRunInclude,
+    GroceryRunRead,
+    GroceryRunUpdate,
+)
 
-from app.api.deps import get_current_user_id
-from app.data_access.grocery_run_dal import GroceryRunDAL
+from app.api.deps import conditional_get, get_current_user_id
+from app.api.responses import json_rows_response, row_dicts
+from app.core.config import LIST_READ_MODE
+from app.data_access.grocery_run_dal import AsyncGroceryRunDAL
 from app.data_access.deps import get_grocery_run_dal
+from app.data_access.pagination import NEXT_CURSOR_HEADER
+from app.core.exceptions import InvalidCursorError
 
 router = APIRouter()
 
-@router.get("/", response_model=list[GroceryRunRead])
-def get_grocery_runs(
+@router.get("/", response_model=list[GroceryRunRead], dependencies=[Depends(conditional_get("grocery_runs"))])
+async def get_grocery_runs(
+    response: Response,
     user_id: int = Depends(get_current_user_id),
-    grocery_run_dal: GroceryRunDAL = Depends(get_grocery_run_dal),
-    offset: int = Query(0, ge=0),
+    grocery_run_dal: AsyncGroceryRunDAL = Depends(get_grocery_run_dal),
+    cursor: str | None = Query(None, description=f"Opaque cursor from the previous page's {NEXT_CURSOR_HEADER} header"),
+    offset: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=200),
-    archived: bool | None = Query(None)
+    archived: bool | None = Query(None),
+    include: list[GroceryRunInclude] = Query([], description="Related data to embed in each run")
 ):
-    return grocery_run_dal.get_all_by_user_id(
-        user_id=user_id,
-        offset=offset,
-        limit=limit,
-        archived=archived
-    )
+    include_batches = "inventory_batches" in include
+    # embedded batches need the ORM's selectinload, so that combination keeps the ORM path
+    as_rows = LIST_READ_MODE == "rows" and not include_batches
+    try:
+        grocery_runs = await grocery_run_dal.get_all_by_user_id(
+            user_id=user_id,
+            offset=offset,
+            limit=limit,
+            archived=archived,
+            cursor=cursor,
+            include_batches=include_batches,
+            as_rows=as_rows
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if len(grocery_runs) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = grocery_run_dal.cursor_for(grocery_runs[-1])
+    if as_rows:
+        # rows hold the run columns followed by the summary aggregates; nest the latter as batch_summary
+        summary_fields = GroceryRunBatchSummary.model_fields
+        items = row_dicts(grocery_runs)
+        for item in items:
+            item["inventory_batches"] = None
+            item["batch_summary"] = {name: item.pop(name) for name in summary_fields}
+        return json_rows_response(items, response)
+    return grocery_runs
 
 
 @router.post("/", response_model=GroceryRunRead, status_code=status.HTTP_201_CREATED)
-def create_grocery_run(
+async def create_grocery_run(
     data: GroceryRunCreate,
     user_id: int = Depends(get_current_user_id),
-    grocery_run_dal: GroceryRunDAL = Depends(get_grocery_run_dal)
+    grocery_run_dal: AsyncGroceryRunDAL = Depends(get_grocery_run_dal)
 ):
-    return grocery_run_dal.create(user_id=user_id, data=data)
+    return await grocery_run_dal.create(user_id=user_id, data=data)
 
 
-@router.get("/{grocery_run_id}", response_model=GroceryRunRead)
-def get_grocery_run(
+@router.get("/{grocery_run_id}", response_model=GroceryRunRead, dependencies=[Depends(conditional_get("grocery_runs"))])
+async def get_grocery_run(
     grocery_run_id: int,
     user_id: int = Depends(get_current_user_id),
-    grocery_run_dal: GroceryRunDAL = Depends(get_grocery_run_dal)
+    grocery_run_dal: AsyncGroceryRunDAL = Depends(get_grocery_run_dal),
+    include: list[GroceryRunInclude] = Query([], description="Related data to embed in the run")
 ):
-    grocery_run = grocery_run_dal.get_by_id(user_id=user_id, grocery_run_id=grocery_run_id)
+    grocery_run = await grocery_run_dal.get_by_id(
+        user_id=user_id,
+        grocery_run_id=grocery_run_id,
+        include_batches="inventory_batches" in include
+    )
     if not grocery_run:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -49,13 +87,13 @@ def get_grocery_run(
 
 
 @router.patch("/{grocery_run_id}", response_model=GroceryRunRead)
-def patch_grocery_run(
+async def patch_grocery_run(
     data: GroceryRunUpdate,
     grocery_run_id: int,
     user_id: int = Depends(get_current_user_id),
-    grocery_run_dal: GroceryRunDAL = Depends(get_grocery_run_dal)
+    grocery_run_dal: AsyncGroceryRunDAL = Depends(get_grocery_run_dal)
 ):
-    grocery_run = grocery_run_dal.update(user_id=user_id, grocery_run_id=grocery_run_id, data=data)
+    grocery_run = await grocery_run_dal.update(user_id=user_id, grocery_run_id=grocery_run_id, data=data)
     if not grocery_run:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -65,12 +103,12 @@ def patch_grocery_run(
 
 
 @router.delete("/{grocery_run_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_grocery_run(
+async def delete_grocery_run(
     grocery_run_id: int,
     user_id: int = Depends(get_current_user_id),
-    grocery_run_dal: GroceryRunDAL = Depends(get_grocery_run_dal)
+    grocery_run_dal: AsyncGroceryRunDAL = Depends(get_grocery_run_dal)
 ):
-    deleted = grocery_run_dal.delete_by_id(user_id=user_id, grocery_run_id=grocery_run_id)
+    deleted = await grocery_run_dal.delete_by_id(user_id=user_id, grocery_run_id=grocery_run_id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,8 +1,14 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from app.api.deps import require_metrics_token
+from app.core.readiness import readiness
 from app.db.deps import get_db
+from app.db.pool import pool_stats
+from app.services.ai_recognition import recognition_stats
+from app.services.recognition_cache import recognition_cache
 
 router = APIRouter()
 
@@ -15,3 +21,19 @@ def db_check(db: Session = Depends(get_db)):
     # Test DB connection
     db.execute(text("SELECT 1"))
     return {"db_connected": True}
+
+@router.get("/db-pool", dependencies=[Depends(require_metrics_token)])
+def db_pool():
+    # pool counters only; does not touch the database. Internal telemetry: METRICS_TOKEN only
+    return pool_stats()
+
+@router.get("/ai-recognition", dependencies=[Depends(require_metrics_token)])
+def ai_recognition():
+    # model call outcomes, retries, in-flight count and latency histogram for this process, plus the result cache
+    return {**recognition_stats(), "cache": recognition_cache.stats()}
+
+@router.get("/ready")
+def ready():
+    # 503 until startup warm-up (pool connections, compiled statements) has finished
+    report = readiness.snapshot()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
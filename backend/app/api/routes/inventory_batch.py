@@ -1,41 +1,84 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Annotated
 
-from app.schemas.inventory_batch import InventoryBatchRead, InventoryBatchCreate, InventoryBatchUpdate
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
 
-from app.api.deps import get_current_user_id
-from app.data_access.inventory_batch_dal import InventoryBatchDAL
-from app.core.exceptions import QuantityValidationError
+from app.schemas.inventory_batch import (
+    BulkIdError,
+    BulkItemError,
+    InventoryBatchBulkCreateResult,
+    InventoryBatchBulkUpdateItem,
+    InventoryBatchBulkUpdateResult,
+    InventoryBatchCreate,
+    InventoryBatchRead,
+    InventoryBatchUpdate,
+)
+
+from app.api.deps import conditional_get, get_current_user_id
+from app.api.responses import json_rows_response, row_dicts
+from app.core.config import LIST_READ_MODE
+from app.data_access.inventory_batch_dal import AsyncInventoryBatchDAL
+from app.core.exceptions import InvalidCursorError, QuantityValidationError
 from app.data_access.deps import get_inventory_batch_dal
+from app.data_access.pagination import NEXT_CURSOR_HEADER
 from app.models.enums import StorageLocation
 
 router = APIRouter()
 
-@router.get("/", response_model=list[InventoryBatchRead])
-def get_inventory_batches(
+# a large grocery haul; keeps a single request's INSERT and IN-lists bounded
+MAX_BULK_ITEMS = 200
+
+@router.get("/", response_model=list[InventoryBatchRead], dependencies=[Depends(conditional_get("inventory_batches"))])
+async def get_inventory_batches(
+    response: Response,
     user_id: int = Depends(get_current_user_id),
-    inventory_batch_dal: InventoryBatchDAL = Depends(get_inventory_batch_dal),
-    offset: int = Query(0, ge=0),
+    inventory_batch_dal: AsyncInventoryBatchDAL = Depends(get_inventory_batch_dal),
+    cursor: str | None = Query(None, description=f"Opaque cursor from the previous page's {NEXT_CURSOR_HEADER} header"),
+    offset: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=200),
     storage_location: StorageLocation | None = Query(None),
     grocery_run_id: int | None = Query(None)
 ):
-    return inventory_batch_dal.get_all_by_user_id(
-        user_id=user_id,
-        offset=offset,
-        limit=limit,
-        storage_location=storage_location,
-        grocery_run_id=grocery_run_id
+    try:
+        inventory_batches = await inventory_batch_dal.get_all_by_user_id(
+            user_id=user_id,
+            offset=offset,
+            limit=limit,
+            storage_location=storage_location,
+            grocery_run_id=grocery_run_id,
+            cursor=cursor,
+            as_rows=LIST_READ_MODE == "rows"
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if len(inventory_batches) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = inventory_batch_dal.cursor_for(inventory_batches[-1])
+    if LIST_READ_MODE == "rows":
+        return json_rows_response(row_dicts(inventory_batches), response)
+    return inventory_batches
+
+
+@router.get("/expiring", response_model=list[InventoryBatchRead])
+async def get_expiring_inventory_batches(
+    user_id: int = Depends(get_current_user_id),
+    inventory_batch_dal: AsyncInventoryBatchDAL = Depends(get_inventory_batch_dal),
+    days: int = Query(7, ge=0, le=365, description="Window, in days from now"),
+    include_expired: bool = Query(False, description="Also return open batches that are already past expiry"),
+    limit: int = Query(100, ge=1, le=200)
+):
+    """Open (not fully consumed) batches expiring soon, soonest first."""
+    return await inventory_batch_dal.get_expiring(
+        user_id=user_id, days=days, include_expired=include_expired, limit=limit
     )
 
 
 @router.post("/", response_model=InventoryBatchRead, status_code=status.HTTP_201_CREATED)
-def create_inventory_batch(
+async def create_inventory_batch(
     data: InventoryBatchCreate,
     user_id: int = Depends(get_current_user_id),
-    inventory_batch_dal: InventoryBatchDAL = Depends(get_inventory_batch_dal)
+    inventory_batch_dal: AsyncInventoryBatchDAL = Depends(get_inventory_batch_dal)
 ):
     try:
-        batch = inventory_batch_dal.create(user_id=user_id, data=data)
+        batch = await inventory_batch_dal.create(user_id=user_id, data=data)
     except QuantityValidationError as e:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e))
     # returning a 404 here because a 403 might be bad security optics
@@ -48,13 +91,49 @@ def create_inventory_batch(
     return batch
 
 
-@router.get("/{inventory_batch_id}", response_model=InventoryBatchRead)
-def get_inventory_batch(
+@router.post("/bulk", response_model=InventoryBatchBulkCreateResult, status_code=status.HTTP_201_CREATED)
+async def create_inventory_batches_bulk(
+    items: Annotated[list[InventoryBatchCreate], Body(min_length=1, max_length=MAX_BULK_ITEMS)],
+    user_id: int = Depends(get_current_user_id),
+    inventory_batch_dal: AsyncInventoryBatchDAL = Depends(get_inventory_batch_dal)
+):
+    """
+    Create the batches for a whole grocery run in one request.
+    Items that fail validation or reference resources the user doesn't own
+    are reported in `errors` by index; the rest are still created.
+    """
+    created, errors = await inventory_batch_dal.create_many(user_id=user_id, items=items)
+    return InventoryBatchBulkCreateResult(
+        created=created,
+        errors=[BulkItemError(index=index, detail=detail) for index, detail in errors.items()],
+    )
+
+
+@router.patch("/bulk", response_model=InventoryBatchBulkUpdateResult)
+async def update_inventory_batches_bulk(
+    items: Annotated[list[InventoryBatchBulkUpdateItem], Body(min_length=1, max_length=MAX_BULK_ITEMS)],
+    user_id: int = Depends(get_current_user_id),
+    inventory_batch_dal: AsyncInventoryBatchDAL = Depends(get_inventory_batch_dal)
+):
+    """
+    Mark many batches used/spoiled/disposed in one transaction.
+    Ids that don't exist, belong to another user, or would break the quantity
+    rules are reported in `errors`; every other batch is still updated.
+    """
+    updated, errors = await inventory_batch_dal.update_many(user_id=user_id, items=items)
+    return InventoryBatchBulkUpdateResult(
+        updated=updated,
+        errors=[BulkIdError(id=batch_id, detail=detail) for batch_id, detail in errors.items()],
+    )
+
+
+@router.get("/{inventory_batch_id}", response_model=InventoryBatchRead, dependencies=[Depends(conditional_get("inventory_batches"))])
+async def get_inventory_batch(
     inventory_batch_id: int,
     user_id: int = Depends(get_current_user_id),
-    inventory_batch_dal: InventoryBatchDAL = Depends(get_inventory_batch_dal)
+    inventory_batch_dal: AsyncInventoryBatchDAL = Depends(get_inventory_batch_dal)
 ):
-    inventory_batch = inventory_batch_dal.get_by_id(user_id=user_id, inventory_batch_id=inventory_batch_id)
+    inventory_batch = await inventory_batch_dal.get_by_id(user_id=user_id, inventory_batch_id=inventory_batch_id)
     if not inventory_batch:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,14 +143,14 @@ def get_inventory_batch(
 
 
 @router.patch("/{inventory_batch_id}", response_model=InventoryBatchRead)
-def patch_inventory_batch(
+async def patch_inventory_batch(
     data: InventoryBatchUpdate,
     inventory_batch_id: int,
     user_id: int = Depends(get_current_user_id),
-    inventory_batch_dal: InventoryBatchDAL = Depends(get_inventory_batch_dal)
+    inventory_batch_dal: AsyncInventoryBatchDAL = Depends(get_inventory_batch_dal)
 ):
     try:
-        inventory_batch = inventory_batch_dal.update(user_id=user_id, inventory_batch_id=inventory_batch_id, data=data)
+        inventory_batch = await inventory_batch_dal.update(user_id=user_id, inventory_batch_id=inventory_batch_id, data=data)
     except QuantityValidationError as e:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e))
     if not inventory_batch:
@@ -83,12 +162,12 @@ def patch_inventory_batch(
 
 
 @router.delete("/{inventory_batch_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_inventory_batch(
+async def delete_inventory_batch(
     inventory_batch_id: int,
     user_id: int = Depends(get_current_user_id),
-    inventory_batch_dal: InventoryBatchDAL = Depends(get_inventory_batch_dal)
+    inventory_batch_dal: AsyncInventoryBatchDAL = Depends(get_inventory_batch_dal)
 ):
-    deleted = inventory_batch_dal.delete_by_id(user_id=user_id, inventory_batch_id=inventory_batch_id)
+    deleted = await inventory_batch_dal.delete_by_id(user_id=user_id, inventory_batch_id=inventory_batch_id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
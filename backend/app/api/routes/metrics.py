@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends, Response
+
+from app.api.deps import require_metrics_token
+from app.core.metrics import registry
+
+router = APIRouter()
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    # in-memory counters only; no database or network calls, so scraping is cheap
+    return Response(registry.render(), media_type=CONTENT_TYPE)
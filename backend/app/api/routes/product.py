@@ -1,32 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
-from app.schemas.product import ProductRead, ProductCreate, ProductUpdate
+from app.schemas.product import ProductRead, ProductCreate, ProductUpdate, ProductWithCategoryRead
 
-from app.api.deps import get_current_user_id
-from app.data_access.product_dal import ProductDAL
-from app.core.exceptions import UniqueBarcodeError
-from app.data_access.deps import get_product_dal
+from app.api.deps import conditional_get, get_current_user_id
+from app.api.responses import json_rows_response, row_dicts
+from app.core.config import LIST_READ_MODE
+from app.data_access.category_dal import AsyncCategoryDAL
+from app.data_access.product_dal import AsyncProductDAL
+from app.core.exceptions import InvalidCursorError, UniqueBarcodeError
+from app.data_access.deps import get_category_dal, get_product_dal
+from app.data_access.pagination import NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
-@router.get("/", response_model=list[ProductRead])
-def get_products(
+@router.get(
+    "/",
+    response_model=list[ProductWithCategoryRead],
+    # products without the embedded names leave category_name unset: it is not sent
+    response_model_exclude_unset=True,
+    dependencies=[Depends(conditional_get("products", embeds_categories=True))]
+)
+async def get_products(
+    response: Response,
     user_id: int = Depends(get_current_user_id),
-    product_dal: ProductDAL = Depends(get_product_dal),
-    offset: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=200)
+    product_dal: AsyncProductDAL = Depends(get_product_dal),
+    category_dal: AsyncCategoryDAL = Depends(get_category_dal),
+    cursor: str | None = Query(None, description=f"Opaque cursor from the previous page's {NEXT_CURSOR_HEADER} header"),
+    offset: int = Query(0, ge=0, deprecated=True),
+    limit: int = Query(100, ge=1, le=200),
+    include_category_name: bool = Query(
+        False, description="Add each product's `category_name`, from the categories snapshot (no join)"
+    )
 ):
-    return product_dal.get_all_by_user_id(user_id=user_id, offset=offset, limit=limit)
+    try:
+        products = await product_dal.get_all_by_user_id(
+            user_id=user_id, offset=offset, limit=limit, cursor=cursor, as_rows=LIST_READ_MODE == "rows"
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if len(products) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = product_dal.cursor_for(products[-1])
+    if include_category_name:
+        names = (await category_dal.get_snapshot()).names
+        items = row_dicts(products) if LIST_READ_MODE == "rows" else [
+            ProductRead.model_validate(product).model_dump() for product in products
+        ]
+        for item in items:
+            item["category_name"] = names.get(item["category_id"])
+        return json_rows_response(items, response)
+    if LIST_READ_MODE == "rows":
+        return json_rows_response(row_dicts(products), response)
+    return products
 
 
 @router.post("/", response_model=ProductRead, status_code=status.HTTP_201_CREATED)
-def create_product(
+async def create_product(
     data: ProductCreate,
     user_id: int = Depends(get_current_user_id),
-    product_dal: ProductDAL = Depends(get_product_dal)
+    product_dal: AsyncProductDAL = Depends(get_product_dal)
 ):
     try:
-        return product_dal.create(user_id=user_id, data=data)
+        return await product_dal.create(user_id=user_id, data=data)
     except UniqueBarcodeError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -34,13 +68,24 @@ def create_product(
         )
 
 
-@router.get("/{product_id}", response_model=ProductRead)
-def get_product(
+@router.get("/search", response_model=list[ProductRead])
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=100, description="Part of a product name or brand; typos are tolerated"),
+    limit: int = Query(10, ge=1, le=50),
+    user_id: int = Depends(get_current_user_id),
+    product_dal: AsyncProductDAL = Depends(get_product_dal)
+):
+    """Autocomplete: the user's best-matching products, best first (see ProductDAL.search for the ranking)."""
+    return await product_dal.search(user_id=user_id, query=q, limit=limit)
+
+
+@router.get("/{product_id}", response_model=ProductRead, dependencies=[Depends(conditional_get("products"))])
+async def get_product(
     product_id: int,
     user_id: int = Depends(get_current_user_id),
-    product_dal: ProductDAL = Depends(get_product_dal)
+    product_dal: AsyncProductDAL = Depends(get_product_dal)
 ):
-    product = product_dal.get_by_id(user_id=user_id, product_id=product_id)
+    product = await product_dal.get_by_id(user_id=user_id, product_id=product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -50,14 +95,14 @@ def get_product(
 
 
 @router.patch("/{product_id}", response_model=ProductRead)
-def patch_product(
+async def patch_product(
     data: ProductUpdate,
     product_id: int,
     user_id: int = Depends(get_current_user_id),
-    product_dal: ProductDAL = Depends(get_product_dal)
+    product_dal: AsyncProductDAL = Depends(get_product_dal)
 ):
     try:
-        product = product_dal.update(user_id=user_id, product_id=product_id, data=data)
+        product = await product_dal.update(user_id=user_id, product_id=product_id, data=data)
     except UniqueBarcodeError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -72,25 +117,25 @@ def patch_product(
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_product(
+async def delete_product(
     product_id: int,
     user_id: int = Depends(get_current_user_id),
-    product_dal: ProductDAL = Depends(get_product_dal)
+    product_dal: AsyncProductDAL = Depends(get_product_dal)
 ):
-    deleted = product_dal.delete_by_id(user_id=user_id, product_id=product_id)
+    deleted = await product_dal.delete_by_id(user_id=user_id, product_id=product_id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Product {product_id} not found"
         )
 
-@router.get("/by-barcode/{barcode}", response_model=ProductRead)
-def get_product_by_barcode(
+@router.get("/by-barcode/{barcode}", response_model=ProductRead, dependencies=[Depends(conditional_get("products"))])
+async def get_product_by_barcode(
     barcode: str,
     user_id: int = Depends(get_current_user_id),
-    product_dal: ProductDAL = Depends(get_product_dal)
+    product_dal: AsyncProductDAL = Depends(get_product_dal)
 ):
-    product = product_dal.get_by_barcode(user_id=user_id, barcode=barcode)
+    product = await product_dal.get_by_barcode(user_id=user_id, barcode=barcode)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,31 +1,98 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import asyncio
+import logging
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.uploads import MULTIPART_OVERHEAD, BodyLimitRoute, max_body_size, read_upload
+from app.core.config import AI_RECOGNITION_BATCH_CONCURRENCY, AI_RECOGNITION_BATCH_MAX_IMAGES
+from app.core.exceptions import ImageProcessingError
+from app.schemas.recognition import RecognitionBatchItem, RecognitionBatchRead
 from app.services.ai_recognition import recognize_item_with_ai
+from app.services.image_preprocessing import prepare_image
+from app.services.recognition_cache import recognition_cache
 
-import base64
+logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=BodyLimitRoute)
 
 MAX_FILE_SIZE = 2 * 1024 * 1024  # 2 MB
 
 
-@router.post("/")
-async def recognize_item(image: UploadFile = File(...)):
+async def recognize_upload(image: UploadFile) -> dict:
+    """Validate, prepare and recognize one uploaded image; failures raise HTTPException."""
     if image.content_type not in {"image/jpeg", "image/png"}:
         raise HTTPException(status_code=400, detail="Unsupported image type")
 
-    raw = await image.read()
+    raw = await read_upload(image, MAX_FILE_SIZE)
+
+    async def recognize():
+        # downscaled, metadata-free JPEG: a fraction of the upload's size once base64-encoded
+        prepared = await asyncio.to_thread(prepare_image, raw)
+        return await recognize_item_with_ai(prepared.data_url())
+
+    # repeat photos are answered from the cache without a model call
+    try:
+        return await recognition_cache.get_or_recognize(raw, recognize)
+    except ImageProcessingError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
-    if len(raw) > MAX_FILE_SIZE:
+@router.post("/")
+@max_body_size(MAX_FILE_SIZE + MULTIPART_OVERHEAD)
+async def recognize_item(image: UploadFile = File(...)):
+    return await recognize_upload(image)
+
+
+@router.post("/batch", response_model=RecognitionBatchRead)
+@max_body_size(AI_RECOGNITION_BATCH_MAX_IMAGES * (MAX_FILE_SIZE + MULTIPART_OVERHEAD))
+async def recognize_items(
+    images: list[UploadFile] = File(...),
+    stream: bool = Query(False, description="Send each result as an NDJSON line as soon as it is ready"),
+):
+    """
+    Recognize several images in one request, AI_RECOGNITION_BATCH_CONCURRENCY at a time.
+
+    Every image gets its own entry: a rejected or failing image does not fail the others.
+    With `stream=true` the entries are sent as NDJSON lines in completion order (use
+    `index` to place them); otherwise they are returned together, in input order.
+    """
+    if len(images) > AI_RECOGNITION_BATCH_MAX_IMAGES:
         raise HTTPException(
-            status_code = 413,
-            detail = "Imgage too large. The maximum size is 2MB"
+            status_code=400,
+            detail=f"Too many images. The maximum is {AI_RECOGNITION_BATCH_MAX_IMAGES} per request",
         )
 
-    b64 = base64.b64encode(raw).decode("utf-8")
-    data_url = f"data:{image.content_type};base64,{b64}"
+    slots = asyncio.Semaphore(AI_RECOGNITION_BATCH_CONCURRENCY)
+
+    async def recognize_one(index: int, image: UploadFile) -> RecognitionBatchItem:
+        async with slots:
+            try:
+                result = await recognize_upload(image)
+            except HTTPException as e:
+                return RecognitionBatchItem(
+                    index=index, filename=image.filename, status_code=e.status_code, error=e.detail
+                )
+            except Exception:
+                logger.exception("Recognition of batch image %d failed", index)
+                return RecognitionBatchItem(
+                    index=index, filename=image.filename, status_code=500, error="Internal server error"
+                )
+        return RecognitionBatchItem(index=index, filename=image.filename, status_code=200, result=result)
 
-    # call your AI service here
-    result = await recognize_item_with_ai(data_url)
+    if not stream:
+        results = await asyncio.gather(*(recognize_one(i, image) for i, image in enumerate(images)))
+        return RecognitionBatchRead(results=results)
 
-    return result
+    async def ndjson_lines():
+        tasks = [asyncio.create_task(recognize_one(i, image)) for i, image in enumerate(images)]
+        try:
+            for done in asyncio.as_completed(tasks):
+                item = await done
+                yield item.model_dump_json() + "\n"
+        finally:
+            # the client went away mid-stream; stop the remaining recognitions
+            for task in tasks:
+                task.cancel()
 
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
@@ -0,0 +1,27 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+
+from app.schemas.waste_report import WasteReportRow
+
+from app.api.deps import get_current_user_id
+from app.data_access.waste_rollup_dal import AsyncWasteRollupDAL, WasteGroupBy
+from app.data_access.deps import get_waste_rollup_dal
+
+router = APIRouter()
+
+@router.get("/waste", response_model=list[WasteReportRow])
+async def get_waste_report(
+    user_id: int = Depends(get_current_user_id),
+    waste_rollup_dal: AsyncWasteRollupDAL = Depends(get_waste_rollup_dal),
+    group_by: list[WasteGroupBy] = Query([]),
+    start: date | None = Query(None, description="first month to include (any day in it)"),
+    end: date | None = Query(None, description="last month to include (any day in it)"),
+):
+    """
+    Used vs spoiled vs disposed quantities, grouped by any of month / product / category.
+
+    Batches count towards the month they were added in. Served from the monthly
+    waste_rollups table, so the cost grows with months x products, not batches.
+    """
+    return await waste_rollup_dal.report(user_id=user_id, group_by=group_by, start=start, end=end)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.schemas.product_stock import ProductStockRead
+
+from app.api.deps import get_current_user_id
+from app.data_access.product_stock_dal import AsyncProductStockDAL
+from app.data_access.deps import get_product_stock_dal
+from app.models.enums import StorageLocation
+
+router = APIRouter()
+
+@router.get("/", response_model=list[ProductStockRead])
+async def get_stock(
+    user_id: int = Depends(get_current_user_id),
+    product_stock_dal: AsyncProductStockDAL = Depends(get_product_stock_dal),
+    product_id: int | None = Query(None),
+    storage_location: StorageLocation | None = Query(None)
+):
+    """Current quantity, open batch count and next expiry per product and storage location."""
+    return await product_stock_dal.get_all_by_user_id(
+        user_id=user_id,
+        product_id=product_id,
+        storage_location=storage_location
+    )
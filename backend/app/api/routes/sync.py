@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.schemas.sync import SyncChangesRead
+
+from app.api.deps import get_current_user_id
+from app.data_access.sync_dal import AsyncSyncDAL
+from app.core.exceptions import InvalidCursorError, SyncHistoryExpiredError
+from app.data_access.deps import get_sync_dal
+
+router = APIRouter()
+
+@router.get("/changes", response_model=SyncChangesRead)
+async def get_changes(
+    user_id: int = Depends(get_current_user_id),
+    sync_dal: AsyncSyncDAL = Depends(get_sync_dal),
+    since: datetime | None = Query(None, description="Start of the first sync (omit for a full download)"),
+    cursor: str | None = Query(None, description="`cursor` from the previous response; takes precedence over since"),
+    limit: int = Query(200, ge=1, le=500)
+):
+    """
+    Grocery runs, products and inventory batches changed since the last sync, plus tombstones
+    for deleted rows, oldest first. Keep calling with the returned cursor while `has_more`.
+    """
+    try:
+        return await sync_dal.get_changes(user_id=user_id, since=since, cursor=cursor, limit=limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except SyncHistoryExpiredError as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
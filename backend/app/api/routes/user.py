@@ -5,22 +5,23 @@ from app.models.user import User
 from app.schemas.user import UserReadPrivate
 
 from app.api.deps import get_current_user, get_firebase_claims
+from app.auth.firebase import invalidate_user_tokens
 from app.schemas.firebase import FirebaseClaims
-from app.data_access.user_dal import UserDAL
+from app.data_access.user_dal import AsyncUserDAL
 from app.data_access.deps import get_user_dal
 
 router = APIRouter()
 
 @router.get("/profile", response_model=UserReadPrivate)
-def get_private_profile(user: User = Depends(get_current_user)):
+async def get_private_profile(user: User = Depends(get_current_user)):
     return user
 
 
 @router.post("/", response_model=UserReadPrivate)
-def create_user(
+async def create_user(
     response: Response,
     claims: FirebaseClaims = Depends(get_firebase_claims),
-    user_dal: UserDAL = Depends(get_user_dal)
+    user_dal: AsyncUserDAL = Depends(get_user_dal)
 ):
     """Sign-up endpoint -- still requires Firebase idToken in Authorization header."""
     firebase_uid = claims.uid
@@ -34,7 +35,7 @@ def create_user(
     # TODO:
     # check if email is verified?
     try:
-        user, created = user_dal.create_user_or_get_existing(
+        user, created = await user_dal.create_user_or_get_existing(
             firebase_uid=firebase_uid,
             email=claims.email,
             display_name=claims.name,
@@ -51,8 +52,11 @@ def create_user(
 
 
 @router.delete("/profile", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user: User = Depends(get_current_user),
-    user_dal: UserDAL = Depends(get_user_dal)
+    user_dal: AsyncUserDAL = Depends(get_user_dal)
 ) -> None:
-    user_dal.delete_user(user)
+    firebase_uid = user.firebase_uid
+    await user_dal.delete_user(user)
+    # cached claims would otherwise keep authenticating this uid until the token expires
+    invalidate_user_tokens(firebase_uid)
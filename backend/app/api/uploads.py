@@ -0,0 +1,79 @@
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, Request, Response, UploadFile, status
+from fastapi.routing import APIRoute
+from starlette.types import Message
+
+# multipart boundaries and part headers on top of the file bytes themselves
+MULTIPART_OVERHEAD = 16 * 1024
+
+Endpoint = TypeVar("Endpoint", bound=Callable[..., Any])
+
+
+def too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Upload too large. The maximum size is {max_bytes // (1024 * 1024)}MB",
+    )
+
+
+def max_body_size(max_bytes: int) -> Callable[[Endpoint], Endpoint]:
+    """Mark an endpoint on a `BodyLimitRoute` router with the largest request body it accepts."""
+    def decorate(endpoint: Endpoint) -> Endpoint:
+        endpoint.max_body_size = max_bytes
+        return endpoint
+    return decorate
+
+
+class BodyLimitRoute(APIRoute):
+    """
+    Rejects a request with 413 once its body is over the endpoint's `max_body_size`.
+
+    A declared Content-Length is checked before anything is read. Chunked requests carry no
+    length, so the body is also counted as FastAPI receives it for form parsing, and parsing
+    stops at the first message past the limit instead of spooling the rest.
+
+    Dependencies run only after form parsing, so this check has to live in the route handler.
+    """
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        max_bytes = getattr(self.endpoint, "max_body_size", None)
+        if max_bytes is None:
+            return handler
+
+        async def limited_handler(request: Request) -> Response:
+            content_length = request.headers.get("content-length", "")
+            if content_length.isdigit() and int(content_length) > max_bytes:
+                raise too_large(max_bytes - MULTIPART_OVERHEAD)
+
+            receive = request.receive
+            received = 0
+
+            async def limited_receive() -> Message:
+                nonlocal received
+                message = await receive()
+                if message["type"] == "http.request":
+                    received += len(message.get("body", b""))
+                    if received > max_bytes:
+                        raise too_large(max_bytes - MULTIPART_OVERHEAD)
+                return message
+
+            return await handler(Request(request.scope, limited_receive))
+
+        return limited_handler
+
+
+async def read_upload(upload: UploadFile, max_bytes: int) -> bytes:
+    """
+    The contents of `upload`, or 413 if it is over `max_bytes`.
+
+    The body is already spooled by form parsing (and bounded by `BodyLimitRoute`); this bounds
+    one file of a multi-file request, from its recorded size when there is one.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise too_large(max_bytes)
+    data = await upload.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise too_large(max_bytes)
+    return data
@@ -1,26 +1,176 @@
-import google.auth
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any
 
-import firebase_admin
-from firebase_admin import auth, credentials
+from app.core.cache import TTLCache
+from app.core.config import (
+    FIREBASE_CLAIMS_CACHE_MAX_SIZE,
+    FIREBASE_CLAIMS_CACHE_MAX_TTL_SECONDS,
+    FIREBASE_REVOCATION_CHECK_INTERVAL_SECONDS,
+    FIREBASE_REVOCATION_CHECK_MODE,
+)
+from app.core.metrics import auth_verify_duration
 from app.schemas.firebase import FirebaseClaims
 
+logger = logging.getLogger(__name__)
 
-def init_firebase() -> None:
+
+@dataclass(frozen=True)
+class VerifiedToken:
+    claims: FirebaseClaims
+    # time.monotonic() of the last successful check_revoked=True verification
+    revocation_checked_at: float
+
+
+# keyed by token digest so raw bearer tokens never sit in process memory as dict keys
+claims_cache: TTLCache[str, VerifiedToken] = TTLCache(
+    max_size=FIREBASE_CLAIMS_CACHE_MAX_SIZE,
+    ttl_seconds=FIREBASE_CLAIMS_CACHE_MAX_TTL_SECONDS,
+)
+
+_revocation_executor: ThreadPoolExecutor | None = None
+_revocation_pending: set[str] = set()
+_revocation_lock = threading.Lock()
+
+
+# the firebase_admin / google-auth imports cost ~0.1 s, so they happen on first use, not at import
+_app: Any = None
+_app_lock = threading.Lock()
+
+
+def _auth() -> ModuleType:
+    from firebase_admin import auth
+    return auth
+
+
+def __getattr__(name: str) -> Any:
+    # `firebase.auth` for callers (and tests) that want the SDK module without importing it eagerly
+    if name == "auth":
+        return _auth()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def init_firebase():
     """
     Initialize Firebase SDK using default credentials.
     For local development define env var GOOGLE_APPLICATION_CREDENTIALS.
     """
+    import firebase_admin
+    import google.auth
+    from firebase_admin import credentials
+
     # get_app() raising a ValueError means the instance does not exist
     try:
-        firebase_admin.get_app()
+        return firebase_admin.get_app()
     except ValueError:
         # this is here so that an exception will be raised if credentials are missing
-        # this exception is caught in startup, logs some useful info, then raises a RuntimeError
+        # (google.auth.exceptions.DefaultCredentialsError; startup logs useful info about it)
         google.auth.default()
         # ApplicationDefault() is still needed to configure the app easily
-        firebase_admin.initialize_app(credentials.ApplicationDefault())
+        return firebase_admin.initialize_app(credentials.ApplicationDefault())
+
+
+def get_firebase_app():
+    """The default Firebase app, initialized on first use (startup warm-up does it before readiness)."""
+    global _app
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                _app = init_firebase()
+    return _app
+
+
+def token_digest(id_token: str) -> str:
+    return hashlib.sha256(id_token.encode("utf-8")).hexdigest()
+
+
+def _verify_and_cache(id_token: str, digest: str) -> FirebaseClaims:
+    """Verify against Firebase (including revocation) and cache the claims until the token's `exp`."""
+    get_firebase_app()
+    auth = _auth()
+    try:
+        decoded = auth.verify_id_token(id_token, check_revoked=True)
+    except (auth.RevokedIdTokenError, auth.UserDisabledError, auth.ExpiredIdTokenError):
+        # a token that was revoked/disabled since we cached it must not be served again;
+        # other failures (e.g. fetching Google's certificates) say nothing about the token
+        claims_cache.pop(digest)
+        raise
+    claims = FirebaseClaims.model_validate(decoded)
+
+    exp = decoded.get("exp")
+    if exp is not None:
+        claims_cache.set(
+            digest,
+            VerifiedToken(claims=claims, revocation_checked_at=time.monotonic()),
+            ttl_seconds=exp - time.time(),
+        )
+    return claims
+
+
+def _background_revocation_check(id_token: str, digest: str) -> None:
+    auth = _auth()
+    try:
+        _verify_and_cache(id_token, digest)
+    except (auth.RevokedIdTokenError, auth.UserDisabledError, auth.ExpiredIdTokenError):
+        logger.info("Cached Firebase token failed its revocation re-check; evicted")
+    except Exception:
+        # leave the entry in place; it is still due, so the next request retries the check
+        logger.exception("Background Firebase revocation check failed")
+    finally:
+        with _revocation_lock:
+            _revocation_pending.discard(digest)
+
+
+def _schedule_revocation_check(id_token: str, digest: str) -> None:
+    global _revocation_executor
+    with _revocation_lock:
+        if digest in _revocation_pending:
+            return
+        _revocation_pending.add(digest)
+        if _revocation_executor is None:
+            _revocation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="firebase-revocation")
+    _revocation_executor.submit(_background_revocation_check, id_token, digest)
 
 
 def decode_token(id_token: str) -> FirebaseClaims:
-    decoded = auth.verify_id_token(id_token, check_revoked=True)
-    return FirebaseClaims.model_validate(decoded)
+    """
+    Return verified claims for `id_token`.
+
+    The first sighting of a token is fully verified with `check_revoked=True`.
+    Afterwards the cached claims are served until the token expires, and the
+    revocation check is repeated once per FIREBASE_REVOCATION_CHECK_INTERVAL_SECONDS,
+    either inline or on a background thread depending on FIREBASE_REVOCATION_CHECK_MODE.
+    """
+    start = time.perf_counter()
+    result = "failed"
+    try:
+        digest = token_digest(id_token)
+        cached = claims_cache.get(digest)
+        if cached is None:
+            claims = _verify_and_cache(id_token, digest)
+            result = "verified"
+            return claims
+
+        if time.monotonic() - cached.revocation_checked_at < FIREBASE_REVOCATION_CHECK_INTERVAL_SECONDS:
+            result = "cached"
+            return cached.claims
+
+        if FIREBASE_REVOCATION_CHECK_MODE == "background":
+            _schedule_revocation_check(id_token, digest)
+            result = "cached"
+            return cached.claims
+        claims = _verify_and_cache(id_token, digest)
+        result = "verified"
+        return claims
+    finally:
+        auth_verify_duration.observe(time.perf_counter() - start, result)
+
+
+def invalidate_user_tokens(firebase_uid: str) -> int:
+    """Drop every cached token for `firebase_uid`; returns the number of entries removed."""
+    return claims_cache.discard_where(lambda entry: entry.claims.uid == firebase_uid)
@@ -0,0 +1,51 @@
+"""
+Maintenance for the catalog_products barcode catalog.
+
+    python -m app.commands.barcode_catalog import PATH [--batch-size 2000]
+
+`import` streams an OpenFoodFacts dump (JSONL or the tab-separated CSV export, optionally
+gzipped, from https://world.openfoodfacts.org/data) record by record and upserts the products
+that have a barcode and a name, committing every --batch-size rows. Memory stays flat however
+large the dump is, and re-running it with a newer dump refreshes the catalog in place.
+"""
+import argparse
+import sys
+from itertools import islice
+
+from app.data_access.catalog_dal import CatalogDAL
+from app.db.session import SessionLocal
+from app.services.barcode_catalog import catalog_row, iter_dump_records
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.commands.barcode_catalog", description=__doc__.split("\n")[1])
+    parser.add_argument("action", choices=["import"])
+    parser.add_argument("path", help="OpenFoodFacts dump (.jsonl, .csv, optionally .gz)")
+    parser.add_argument("--batch-size", type=int, default=2000, help="rows per upsert and commit")
+    args = parser.parse_args(argv)
+
+    records = skipped = imported = 0
+
+    def rows():
+        nonlocal records, skipped
+        for record in iter_dump_records(args.path):
+            records += 1
+            row = catalog_row(record)
+            if row is None:
+                skipped += 1
+            else:
+                yield row
+
+    stream = rows()
+    with SessionLocal() as db:
+        dal = CatalogDAL(db)
+        while batch := list(islice(stream, args.batch_size)):
+            imported += dal.upsert_many(batch)
+            db.commit()
+            print(f"... {records} records read", file=sys.stderr)
+    print(f"catalog_products imported: {imported} rows from {records} records ({skipped} without barcode or name)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Bring the database schema to the head migration (the deploy step before new tasks start).
+
+    python -m app.commands.migrate upgrade
+
+A database created by the old startup create_all has the 0001 tables but no alembic_version:
+it is stamped 0001 first (once), then upgraded like any other. Stamp and upgrade run in one
+transaction, so on Postgres a failed migration leaves the schema as it was.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from app.db.schema import INITIAL_REVISION, current_revision
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def upgrade(engine: Engine, config: Config) -> str | None:
+    """Stamp a create_all-built database at INITIAL_REVISION, then upgrade to head; returns the new revision."""
+    adopt = current_revision(engine) is None and inspect(engine).has_table("users")
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        if adopt:
+            command.stamp(config, INITIAL_REVISION)
+        command.upgrade(config, "head")
+    return current_revision(engine)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.commands.migrate", description=__doc__.split("\n")[1])
+    parser.add_argument("action", choices=["upgrade"])
+    parser.parse_args(argv)
+
+    from app.db.session import engine
+    revision = upgrade(engine, Config(str(ALEMBIC_INI)))
+    print(f"schema at revision {revision}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
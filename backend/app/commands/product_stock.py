@@ -0,0 +1,39 @@
+"""
+Maintenance for the product_stock summary table.
+
+    python -m app.commands.product_stock rebuild [--user-id ID]
+    python -m app.commands.product_stock check [--user-id ID]
+
+`rebuild` recomputes the summary from inventory_batches in one transaction.
+`check` reports rows that differ from a fresh aggregate and exits 1 if any do.
+"""
+import argparse
+import sys
+
+from app.data_access.product_stock_dal import ProductStockDAL
+from app.db.session import SessionLocal
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.commands.product_stock", description=__doc__.split("\n")[1])
+    parser.add_argument("action", choices=["rebuild", "check"])
+    parser.add_argument("--user-id", type=int, default=None, help="limit to one user (default: everyone)")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        dal = ProductStockDAL(db)
+        if args.action == "rebuild":
+            rows = dal.rebuild(user_id=args.user_id)
+            db.commit()
+            print(f"product_stock rebuilt: {rows} rows")
+            return 0
+
+        discrepancies = dal.check(user_id=args.user_id)
+        for row in discrepancies:
+            print(dict(row._mapping))
+        print(f"product_stock check: {len(discrepancies)} inconsistent rows")
+        return 1 if discrepancies else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""
+Maintenance for the sync_tombstones table.
+
+    python -m app.commands.sync_tombstones prune
+
+`prune` deletes tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS. /sync/changes answers
+410 for positions that old, so devices re-download instead of missing deletions.
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import SYNC_TOMBSTONE_RETENTION_DAYS
+from app.data_access.sync_dal import SyncDAL
+from app.db.session import SessionLocal
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.commands.sync_tombstones", description=__doc__.split("\n")[1])
+    parser.add_argument("action", choices=["prune"])
+    parser.parse_args(argv)
+
+    older_than = datetime.now(timezone.utc) - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+    with SessionLocal() as db:
+        rows = SyncDAL(db).prune_tombstones(older_than=older_than)
+        db.commit()
+    print(f"sync_tombstones pruned: {rows} rows older than {older_than.isoformat()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+"""
+Maintenance for the waste_rollups table.
+
+    python -m app.commands.waste_rollups backfill [--user-id ID]
+
+`backfill` rebuilds the monthly rollups from the full inventory_batches history in one
+transaction. Run it once after deploying the table, and whenever rows were changed outside the API.
+"""
+import argparse
+import sys
+
+from app.data_access.waste_rollup_dal import WasteRollupDAL
+from app.db.session import SessionLocal
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.commands.waste_rollups", description=__doc__.split("\n")[1])
+    parser.add_argument("action", choices=["backfill"])
+    parser.add_argument("--user-id", type=int, default=None, help="limit to one user (default: everyone)")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        rows = WasteRollupDAL(db).rebuild(user_id=args.user_id)
+        db.commit()
+    print(f"waste_rollups backfilled: {rows} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
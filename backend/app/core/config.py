@@ -6,3 +6,119 @@ load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL is not set. Add it to your .env file.")
+
+# Verified Firebase ID token claims are cached per token digest until the token's own `exp`
+# (capped by the max TTL) so protected requests don't pay a Firebase round trip each time.
+FIREBASE_CLAIMS_CACHE_MAX_SIZE = int(os.getenv("FIREBASE_CLAIMS_CACHE_MAX_SIZE", "10000"))
+FIREBASE_CLAIMS_CACHE_MAX_TTL_SECONDS = int(os.getenv("FIREBASE_CLAIMS_CACHE_MAX_TTL_SECONDS", "3600"))
+# how often a cached token is re-checked against Firebase for revocation
+FIREBASE_REVOCATION_CHECK_INTERVAL_SECONDS = int(os.getenv("FIREBASE_REVOCATION_CHECK_INTERVAL_SECONDS", "300"))
+# "interval": re-check inline on the first request after the interval elapses
+# "background": keep serving the cached claims and re-check on a background thread
+FIREBASE_REVOCATION_CHECK_MODE = os.getenv("FIREBASE_REVOCATION_CHECK_MODE", "interval")
+if FIREBASE_REVOCATION_CHECK_MODE not in {"interval", "background"}:
+    raise RuntimeError("FIREBASE_REVOCATION_CHECK_MODE must be 'interval' or 'background'.")
+
+# firebase_uid -> (user_id, email, display_name) so get_current_user_id can skip the users SELECT
+USER_IDENTITY_CACHE_MAX_SIZE = int(os.getenv("USER_IDENTITY_CACHE_MAX_SIZE", "10000"))
+USER_IDENTITY_CACHE_TTL_SECONDS = int(os.getenv("USER_IDENTITY_CACHE_TTL_SECONDS", "600"))
+
+# "sync": psycopg2 engine, DAL calls run in the threadpool
+# "async": asyncpg engine + AsyncSession, DAL calls run on the event loop
+DB_MODE = os.getenv("DB_MODE", "sync")
+if DB_MODE not in {"sync", "async"}:
+    raise RuntimeError("DB_MODE must be 'sync' or 'async'.")
+# optional override; otherwise derived from DATABASE_URL by swapping in an async driver
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# "orm": list endpoints load ORM objects and serialize them through the *Read schemas
+# "rows": they select the schema's columns as plain rows and encode them straight to JSON bytes
+LIST_READ_MODE = os.getenv("LIST_READ_MODE", "orm")
+if LIST_READ_MODE not in {"orm", "rows"}:
+    raise RuntimeError("LIST_READ_MODE must be 'orm' or 'rows'.")
+
+# connection pool sizing; each ECS task holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections per engine
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+# recycle before RDS/NAT idle timeouts silently drop the connection; -1 disables
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+# "always": ping on every checkout, "never": no ping, "idle": ping only connections idle longer than
+# DB_POOL_PRE_PING_IDLE_SECONDS (skips the extra round trip for hot connections)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "idle")
+if DB_POOL_PRE_PING not in {"always", "never", "idle"}:
+    raise RuntimeError("DB_POOL_PRE_PING must be 'always', 'never' or 'idle'.")
+DB_POOL_PRE_PING_IDLE_SECONDS = float(os.getenv("DB_POOL_PRE_PING_IDLE_SECONDS", "60"))
+# server-side statement_timeout set on every new connection; 0 disables
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+# per-request SQL accounting (app/db/query_stats.py)
+# "log": warn when one statement shape runs more than SQL_REPEATED_QUERY_THRESHOLD times in a request
+# "headers": also send X-DB-Query-Count / X-DB-Query-Time-Ms on every response (dev and staging only)
+# "off": no per-request tracking
+SQL_QUERY_STATS = os.getenv("SQL_QUERY_STATS", "log")
+if SQL_QUERY_STATS not in {"off", "log", "headers"}:
+    raise RuntimeError("SQL_QUERY_STATS must be 'off', 'log' or 'headers'.")
+SQL_REPEATED_QUERY_THRESHOLD = int(os.getenv("SQL_REPEATED_QUERY_THRESHOLD", "5"))
+
+# GET /metrics is served only when this is set, and only to scrapers sending `Authorization: Bearer <token>`
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+
+# startup: the schema is managed by migrations (python -m app.commands.migrate upgrade, a deploy
+# step), never created by the app. "require": refuse to start unless alembic_version is at
+# app.db.schema.SCHEMA_REVISION, "warn": log the mismatch and start anyway, "off": skip the check
+DB_SCHEMA_CHECK = os.getenv("DB_SCHEMA_CHECK", "warn")
+if DB_SCHEMA_CHECK not in {"require", "warn", "off"}:
+    raise RuntimeError("DB_SCHEMA_CHECK must be 'require', 'warn' or 'off'.")
+# connections opened per engine during startup warm-up, before the app reports ready; 0 disables
+DB_POOL_WARM_CONNECTIONS = int(os.getenv("DB_POOL_WARM_CONNECTIONS", str(DB_POOL_SIZE)))
+# initialize the Firebase SDK during warm-up (failing startup without credentials);
+# false leaves it to the first token verification
+FIREBASE_INIT_ON_STARTUP = os.getenv("FIREBASE_INIT_ON_STARTUP", "true").lower() in {"1", "true", "yes"}
+
+# /sync/changes: a caught-up cursor restarts this far in the past, so rows from transactions that
+# committed after a later-stamped one (updated_at is the transaction start) are still delivered
+SYNC_CURSOR_OVERLAP_SECONDS = int(os.getenv("SYNC_CURSOR_OVERLAP_SECONDS", "60"))
+# deletion tombstones are kept this long; older sync positions must re-download everything
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "90"))
+
+# /recognize-item model calls (OPENAI_API_KEY / OPENAI_BASE_URL are read by the OpenAI client itself)
+AI_RECOGNITION_MODEL = os.getenv("AI_RECOGNITION_MODEL", "gpt-4.1-mini")
+# per-attempt deadline for one model round trip
+AI_RECOGNITION_TIMEOUT_SECONDS = float(os.getenv("AI_RECOGNITION_TIMEOUT_SECONDS", "20"))
+# extra attempts after a timeout, connection error, 429 or 5xx; backoff is jittered up to base * 2^attempt
+AI_RECOGNITION_MAX_RETRIES = int(os.getenv("AI_RECOGNITION_MAX_RETRIES", "2"))
+AI_RECOGNITION_BACKOFF_SECONDS = float(os.getenv("AI_RECOGNITION_BACKOFF_SECONDS", "0.5"))
+# model calls in flight per process; further recognitions wait for a slot
+AI_RECOGNITION_MAX_CONCURRENCY = int(os.getenv("AI_RECOGNITION_MAX_CONCURRENCY", "8"))
+if AI_RECOGNITION_MAX_CONCURRENCY < 1:
+    raise RuntimeError("AI_RECOGNITION_MAX_CONCURRENCY must be >= 1.")
+
+# /recognize-item result cache, keyed by the upload's sha256 and a perceptual hash of the decoded image
+AI_RECOGNITION_CACHE_MAX_SIZE = int(os.getenv("AI_RECOGNITION_CACHE_MAX_SIZE", "5000"))
+# how many of the 64 perceptual-hash bits may differ for a near-duplicate photo to reuse a result; -1 disables
+AI_RECOGNITION_CACHE_MAX_DISTANCE = int(os.getenv("AI_RECOGNITION_CACHE_MAX_DISTANCE", "4"))
+# results less confident than this (and failures) are never cached
+AI_RECOGNITION_CACHE_MIN_CONFIDENCE = float(os.getenv("AI_RECOGNITION_CACHE_MIN_CONFIDENCE", "0.6"))
+# optional JSON-lines file that keeps cached results across restarts
+AI_RECOGNITION_CACHE_PATH = os.getenv("AI_RECOGNITION_CACHE_PATH") or None
+
+# uploads are downscaled and re-encoded before recognition; the model itself scales images to fit
+# 2048px and then 768px on the short side, so anything larger only costs upload bytes and tokens
+AI_RECOGNITION_IMAGE_MAX_SHORT_SIDE = int(os.getenv("AI_RECOGNITION_IMAGE_MAX_SHORT_SIDE", "768"))
+AI_RECOGNITION_IMAGE_MAX_LONG_SIDE = int(os.getenv("AI_RECOGNITION_IMAGE_MAX_LONG_SIDE", "2048"))
+AI_RECOGNITION_IMAGE_JPEG_QUALITY = int(os.getenv("AI_RECOGNITION_IMAGE_JPEG_QUALITY", "85"))
+
+# POST /recognize-item/batch: images accepted per request, and how many of them one request
+# reads, prepares and recognizes at a time (model calls are also capped by AI_RECOGNITION_MAX_CONCURRENCY)
+AI_RECOGNITION_BATCH_MAX_IMAGES = int(os.getenv("AI_RECOGNITION_BATCH_MAX_IMAGES", "30"))
+AI_RECOGNITION_BATCH_CONCURRENCY = int(os.getenv("AI_RECOGNITION_BATCH_CONCURRENCY", "4"))
+if AI_RECOGNITION_BATCH_CONCURRENCY < 1:
+    raise RuntimeError("AI_RECOGNITION_BATCH_CONCURRENCY must be >= 1.")
+
+# GET /catalog/barcode/{code}: how long devices may reuse a catalog answer (the catalog only changes on import)
+CATALOG_CACHE_MAX_AGE_SECONDS = int(os.getenv("CATALOG_CACHE_MAX_AGE_SECONDS", "86400"))
+
+# GET /categories and embedded category names are served from an in-process snapshot of the categories
+# table; within this many seconds of the last version check it is trusted without a query (0: check every time)
+CATEGORY_SNAPSHOT_CHECK_SECONDS = float(os.getenv("CATEGORY_SNAPSHOT_CHECK_SECONDS", "5"))
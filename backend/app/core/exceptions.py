@@ -5,4 +5,20 @@ class QuantityValidationError(ValueError):
 
 class UniqueBarcodeError(ValueError):
     """Raised when a user tries to create/update a product with a duplicate barcode."""
-    pass
\ No newline at end of file
+    pass
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+    pass
+
+class SyncHistoryExpiredError(ValueError):
+    """Raised when a sync position is older than the retained deletion history."""
+    pass
+
+class ImageProcessingError(ValueError):
+    """Raised when an uploaded image cannot be decoded or is not a supported format."""
+    pass
+
+class SchemaRevisionError(RuntimeError):
+    """Raised at startup when the database is not migrated to the revision this build expects."""
+    pass
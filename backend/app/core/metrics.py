@@ -0,0 +1,226 @@
+"""
+In-process metrics in the Prometheus text exposition format, served at GET /metrics.
+
+Metrics that are updated on the request path (latency histograms, in-flight gauges) live
+here and cost one lock and one bisect per observation. Components that already keep their
+own counters (the connection pools, AI recognition) register a collector instead, which
+renders their snapshot only when /metrics is scraped.
+"""
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+# upper bounds (seconds) for request and DAL latency histograms
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+T = TypeVar("T")
+
+# one labelled series: label name -> value
+Labels = dict[str, str]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def sample_lines(name: str, documentation: str, kind: str, series: Iterable[tuple[Labels, float]]) -> Iterator[str]:
+    """A counter or gauge family: HELP/TYPE header, then one line per labelled value."""
+    yield f"# HELP {name} {documentation}"
+    yield f"# TYPE {name} {kind}"
+    for labels, value in series:
+        yield f"{name}{_format_labels(labels)} {_format_value(value)}"
+
+
+def histogram_lines(
+    name: str,
+    documentation: str,
+    series: Iterable[tuple[Labels, Iterable[float], Iterable[int], float]],
+) -> Iterator[str]:
+    """
+    A histogram family. Each series is (labels, bucket upper bounds, per-bucket counts, sum);
+    counts are per bucket as the in-process metrics keep them and are made cumulative here.
+    The last bound must be +Inf.
+    """
+    yield f"# HELP {name} {documentation}"
+    yield f"# TYPE {name} histogram"
+    for labels, bounds, counts, total in series:
+        # label text is built once per series, not per bucket line
+        formatted = _format_labels(labels)
+        bucket_prefix = f"{name}_bucket{{{formatted[1:-1]}," if labels else f"{name}_bucket{{"
+        cumulative = 0
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            yield f'{bucket_prefix}le="{_format_value(bound)}"}} {cumulative}'
+        yield f"{name}_sum{formatted} {_format_value(round(total, 6))}"
+        yield f"{name}_count{formatted} {cumulative}"
+
+
+class Histogram:
+    """Thread-safe labelled histogram; `observe` takes the label values positionally, in `labelnames` order."""
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        if buckets[-1] != float("inf"):
+            raise ValueError("the last bucket must be +Inf")
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts, sum]
+        self._series: dict[tuple[str, ...], list[Any]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series = {}
+
+    def snapshot(self) -> dict[tuple[str, ...], tuple[list[int], float]]:
+        """label values -> (per-bucket counts, sum)"""
+        with self._lock:
+            return {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+
+    def collect(self) -> Iterator[str]:
+        return histogram_lines(self.name, self.documentation, (
+            (dict(zip(self.labelnames, labels)), self.buckets, counts, total)
+            for labels, (counts, total) in sorted(self.snapshot().items())
+        ))
+
+
+class Gauge:
+    """Thread-safe labelled gauge for values that go up and down (e.g. requests in flight)."""
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values = {}
+
+    def collect(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return sample_lines(self.name, self.documentation, "gauge", (
+            (dict(zip(self.labelnames, labels)), value) for labels, value in values
+        ))
+
+
+class MetricsRegistry:
+    """Everything /metrics renders: metrics owned here, plus collectors for components with their own counters."""
+    def __init__(self):
+        self._metrics: list[Histogram | Gauge] = []
+        self._collectors: list[Callable[[], Iterable[str]]] = []
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        metric = Histogram(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        metric = Gauge(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        """`collector` is called on every scrape and returns exposition lines (see `sample_lines`)."""
+        self._collectors.append(collector)
+
+    def clear(self) -> None:
+        """Reset the metrics owned here (collectors report their components' own counters)."""
+        for metric in self._metrics:
+            metric.clear()
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the end of the response body, by route template and status.",
+    ("method", "route", "status"),
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled.",
+)
+dal_call_duration = registry.histogram(
+    "dal_call_duration_seconds",
+    "Time spent in data access layer methods, including the queries they run.",
+    ("dal", "method"),
+)
+auth_verify_duration = registry.histogram(
+    "auth_verify_duration_seconds",
+    "Time to resolve a Firebase ID token to claims; result is cached, verified or failed.",
+    ("result",),
+)
+
+
+def instrument_dal(cls: type[T]) -> type[T]:
+    """
+    Class decorator: time every public method of a sync DAL into `dal_call_duration`,
+    labelled `dal=<class name>, method=<method name>`.
+
+    Static and class methods are left alone; they do not touch the database.
+    """
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(attr):
+            continue
+        setattr(cls, name, _timed(attr, cls.__name__, name))
+    return cls
+
+
+def _timed(fn: Callable[..., Any], dal: str, method: str) -> Callable[..., Any]:
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            dal_call_duration.observe(time.perf_counter() - start, dal, method)
+    return wrapper
@@ -0,0 +1,58 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+class Readiness:
+    """
+    Startup progress for GET /health/ready: the app is ready once warm-up has finished.
+
+    Each warm-up step records how long it took and, if it failed, why. A failed step
+    is logged and reported but does not keep the app unready; warm-up only saves
+    the first requests work they would otherwise do themselves.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._ready_after: float | None = None
+        self._steps: dict[str, dict[str, Any]] = {}
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[dict[str, Any]]:
+        """Time the block as step `name`; the yielded dict can carry extra details for the report."""
+        details: dict[str, Any] = {}
+        start = time.perf_counter()
+        try:
+            yield details
+        except Exception as e:
+            details["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            with self._lock:
+                self._steps[name] = {"seconds": round(time.perf_counter() - start, 4), **details}
+
+    def mark_ready(self) -> None:
+        with self._lock:
+            self._ready_after = time.monotonic() - self._started_at
+
+    @property
+    def ready(self) -> bool:
+        return self._ready_after is not None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._started_at = time.monotonic()
+            self._ready_after = None
+            self._steps = {}
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self._ready_after is not None,
+                "ready_after_seconds": round(self._ready_after, 4) if self._ready_after is not None else None,
+                "steps": dict(self._steps),
+            }
+
+
+readiness = Readiness()
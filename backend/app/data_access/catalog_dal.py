@@ -0,0 +1,54 @@
+from collections.abc import Iterable
+from typing import Any
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.core.metrics import instrument_dal
+from app.db.deps import SessionRunner
+from app.models.catalog_product import CatalogProduct
+from app.services.barcode_catalog import CATALOG_COLUMNS
+
+
+@instrument_dal
+class CatalogDAL:
+    """SQLAlchemy-backed data access helpers for the shared `CatalogProduct` barcode catalog."""
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_barcode(self, barcode: str) -> CatalogProduct | None:
+        """Return the catalog entry for a normalized barcode (primary key lookup), or None."""
+        return self.db.get(CatalogProduct, barcode)
+
+    def upsert_many(self, rows: Iterable[dict[str, Any]]) -> int:
+        """
+        Insert or update catalog rows in one INSERT ... ON CONFLICT DO UPDATE; returns the rows sent.
+
+        An existing row is only replaced by data at least as new (by last_modified_t), so
+        importing an older dump over a newer one is harmless. Later duplicates in `rows` win.
+        """
+        by_barcode = {row["barcode"]: row for row in rows}
+        if not by_barcode:
+            return 0
+        dialect_insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(CatalogProduct).values(list(by_barcode.values()))
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[CatalogProduct.barcode],
+            set_={column: stmt.excluded[column] for column in CATALOG_COLUMNS if column != "barcode"},
+            where=(
+                CatalogProduct.last_modified_t.is_(None)
+                | stmt.excluded.last_modified_t.is_(None)
+                | (stmt.excluded.last_modified_t >= CatalogProduct.last_modified_t)
+            ),
+        ))
+        return len(by_barcode)
+
+
+class AsyncCatalogDAL:
+    """
+    Awaitable `CatalogDAL`. Every call runs the sync implementation through a
+    `SessionRunner` (AsyncSession.run_sync on the async stack, the threadpool on the sync stack).
+    """
+    def __init__(self, run: SessionRunner):
+        self.run = run
+
+    async def get_by_barcode(self, barcode: str) -> CatalogProduct | None:
+        return await self.run(lambda db: CatalogDAL(db).get_by_barcode(barcode))
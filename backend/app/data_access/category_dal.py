@@ -0,0 +1,140 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import CATEGORY_SNAPSHOT_CHECK_SECONDS
+from app.core.metrics import instrument_dal
+from app.db.deps import SessionRunner
+from app.models.category import Category
+from app.models.category_version import CategoryVersion
+from app.schemas.category import CategoryRead
+
+_categories_json = TypeAdapter(list[CategoryRead])
+
+
+@dataclass(frozen=True)
+class CategorySnapshot:
+    """The whole categories table at one version, with everything the read paths need precomputed."""
+    version: str
+    categories: tuple[CategoryRead, ...]
+    # category_id -> category_name, for embedding names into product responses
+    names: dict[int, str]
+    etag: str
+    # GET /categories response body
+    body: bytes
+
+    @classmethod
+    def build(cls, version: str, rows: list[Category]) -> "CategorySnapshot":
+        categories = tuple(CategoryRead.model_validate(row) for row in rows)
+        return cls(
+            version=version,
+            categories=categories,
+            names={category.category_id: category.category_name for category in categories},
+            etag=f'W/"{hashlib.sha256(version.encode("utf-8")).hexdigest()[:32]}"',
+            body=_categories_json.dump_json(list(categories)),
+        )
+
+
+class CategorySnapshotCache:
+    """
+    Process-wide snapshot of the global categories table.
+
+    The snapshot is keyed by the table's version (the `CategoryVersion` counter). Within
+    `check_seconds` of the last check it is served without touching the database; after
+    that one primary-key read confirms the version and the table is only re-read when it
+    changed.
+    """
+    def __init__(self, *, check_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.check_seconds = check_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot: CategorySnapshot | None = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.version_checks = 0
+        self.reloads = 0
+
+    def fresh(self) -> CategorySnapshot | None:
+        """The snapshot if it was confirmed within `check_seconds`, else None (the caller must check)."""
+        with self._lock:
+            if self._snapshot is None or self._clock() - self._checked_at >= self.check_seconds:
+                return None
+            self.hits += 1
+            return self._snapshot
+
+    def get(self, dal: "CategoryDAL") -> CategorySnapshot:
+        """The current snapshot, confirming its version through `dal` and reloading if it changed."""
+        snapshot = self.fresh()
+        if snapshot is not None:
+            return snapshot
+        version = dal.get_version()
+        with self._lock:
+            self.version_checks += 1
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version == version:
+                self._checked_at = self._clock()
+                return snapshot
+        # concurrent reloads of a small table are harmless; the last one wins
+        snapshot = CategorySnapshot.build(version, dal.get_all())
+        with self._lock:
+            self._snapshot = snapshot
+            self._checked_at = self._clock()
+            self.reloads += 1
+        return snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._checked_at = 0.0
+            self.hits = self.version_checks = self.reloads = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self._snapshot.version if self._snapshot else None,
+                "size": len(self._snapshot.categories) if self._snapshot else 0,
+                "hits": self.hits,
+                "version_checks": self.version_checks,
+                "reloads": self.reloads,
+            }
+
+
+category_snapshot_cache = CategorySnapshotCache(check_seconds=CATEGORY_SNAPSHOT_CHECK_SECONDS)
+
+
+@instrument_dal
+class CategoryDAL:
+    """SQLAlchemy-backed data access helpers for the global `Category` table."""
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_version(self) -> str:
+        """Changes with every committed insert, update or delete of categories (one primary-key read)."""
+        return str(self.db.scalar(select(CategoryVersion.version).where(CategoryVersion.id == 1)))
+
+    def get_all(self) -> list[Category]:
+        return self.db.query(Category).order_by(Category.category_name.asc(), Category.category_id.asc()).all()
+
+    def get_snapshot(self) -> CategorySnapshot:
+        return category_snapshot_cache.get(self)
+
+
+class AsyncCategoryDAL:
+    """
+    Awaitable `CategoryDAL`. A snapshot confirmed within CATEGORY_SNAPSHOT_CHECK_SECONDS is
+    returned without running anything on the session, so no connection is checked out.
+    """
+    def __init__(self, run: SessionRunner):
+        self.run = run
+
+    async def get_snapshot(self) -> CategorySnapshot:
+        snapshot = category_snapshot_cache.fresh()
+        if snapshot is not None:
+            return snapshot
+        return await self.run(lambda db: CategoryDAL(db).get_snapshot())
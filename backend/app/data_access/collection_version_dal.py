@@ -0,0 +1,54 @@
+from collections.abc import Iterable
+from typing import Literal
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.core.metrics import instrument_dal
+from app.db.deps import SessionRunner
+from app.models.collection_version import CollectionVersion
+
+Collection = Literal["products", "grocery_runs", "inventory_batches"]
+
+
+@instrument_dal
+class CollectionVersionDAL:
+    """SQLAlchemy-backed data access helpers for the per-user `CollectionVersion` counters."""
+    def __init__(self, db: Session):
+        self.db = db
+
+    def bump(self, *, user_id: int | ColumnElement[int], collections: Iterable[Collection]) -> None:
+        """
+        Increment the user's version of each collection in the caller's transaction
+        (one INSERT ... ON CONFLICT DO UPDATE, creating missing counters at 1).
+
+        `user_id` may be a scalar subquery for writes that only know a related row.
+        """
+        rows = [{"user_id": user_id, "collection": collection, "version": 1} for collection in sorted(set(collections))]
+        if not rows:
+            return
+        dialect_insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(CollectionVersion).values(rows)
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[CollectionVersion.user_id, CollectionVersion.collection],
+            set_={"version": CollectionVersion.version + 1, "updated_at": func.now()},
+        ))
+
+    def get(self, *, user_id: int, collection: Collection) -> int:
+        """Return the user's current version of `collection` (0 if it was never written)."""
+        version = self.db.scalar(
+            select(CollectionVersion.version)
+            .where(CollectionVersion.user_id == user_id, CollectionVersion.collection == collection)
+        )
+        return version or 0
+
+
+class AsyncCollectionVersionDAL:
+    """
+    Awaitable `CollectionVersionDAL`. Every call runs the sync implementation through a
+    `SessionRunner` (AsyncSession.run_sync on the async stack, the threadpool on the sync stack).
+    """
+    def __init__(self, run: SessionRunner):
+        self.run = run
+
+    async def get(self, *, user_id: int, collection: Collection) -> int:
+        return await self.run(lambda db: CollectionVersionDAL(db).get(user_id=user_id, collection=collection))
@@ -1,23 +1,56 @@
 from fastapi import Depends
-from sqlalchemy.orm import Session
 
-from app.db.deps import get_db
-from app.data_access.user_dal import UserDAL
-from app.data_access.grocery_run_dal import GroceryRunDAL
-from app.data_access.product_dal import ProductDAL
-from app.data_access.inventory_batch_dal import InventoryBatchDAL
+from app.core.config import DB_MODE
+from app.db.deps import SessionRunner, get_async_session_runner, get_threadpool_session_runner
+from app.data_access.user_dal import AsyncUserDAL
+from app.data_access.catalog_dal import AsyncCatalogDAL
+from app.data_access.category_dal import AsyncCategoryDAL
+from app.data_access.collection_version_dal import AsyncCollectionVersionDAL
+from app.data_access.grocery_run_dal import AsyncGroceryRunDAL
+from app.data_access.product_dal import AsyncProductDAL
+from app.data_access.inventory_batch_dal import AsyncInventoryBatchDAL
+from app.data_access.product_stock_dal import AsyncProductStockDAL
+from app.data_access.sync_dal import AsyncSyncDAL
+from app.data_access.waste_rollup_dal import AsyncWasteRollupDAL
 
+# DB_MODE picks the stack; routes are identical either way so both can be benchmarked side by side
+get_session_runner = get_async_session_runner if DB_MODE == "async" else get_threadpool_session_runner
 
-def get_user_dal(db: Session = Depends(get_db)) -> UserDAL:
-    return UserDAL(db)
 
-def get_grocery_run_dal(db: Session = Depends(get_db)) -> GroceryRunDAL:
-    return GroceryRunDAL(db)
+def get_user_dal(run: SessionRunner = Depends(get_session_runner)) -> AsyncUserDAL:
+    return AsyncUserDAL(run)
 
+def get_grocery_run_dal(run: SessionRunner = Depends(get_session_runner)) -> AsyncGroceryRunDAL:
+    return AsyncGroceryRunDAL(run)
 
-def get_product_dal(db: Session = Depends(get_db)) -> ProductDAL:
-    return ProductDAL(db)
 
+def get_product_dal(run: SessionRunner = Depends(get_session_runner)) -> AsyncProductDAL:
+    return AsyncProductDAL(run)
 
-def get_inventory_batch_dal(db: Session = Depends(get_db)) -> InventoryBatchDAL:
-    return InventoryBatchDAL(db)
+
+def get_inventory_batch_dal(run: SessionRunner = Depends(get_session_runner)) -> AsyncInventoryBatchDAL:
+    return AsyncInventoryBatchDAL(run)
+
+
+def get_product_stock_dal(run: SessionRunner = Depends(get_session_runner)) -> AsyncProductStockDAL:
+    return AsyncProductStockDAL(run)
+
+
+def get_waste_rollup_dal(run: SessionRunner = Depends(get_session_runner)) -> AsyncWasteRollupDAL:
+    return AsyncWasteRollupDAL(run)
+
+
+def get_collection_version_dal(run: SessionRunner = Depends(get_session_runner)) -> AsyncCollectionVersionDAL:
+    return AsyncCollectionVersionDAL(run)
+
+
+def get_sync_dal(run: SessionRunner = Depends(get_session_runner)) -> AsyncSyncDAL:
+    return AsyncSyncDAL(run)
+
+
+def get_catalog_dal(run: SessionRunner = Depends(get_session_runner)) -> AsyncCatalogDAL:
+    return AsyncCatalogDAL(run)
+
+
+def get_category_dal(run: SessionRunner = Depends(get_session_runner)) -> AsyncCategoryDAL:
+    return AsyncCategoryDAL(run)
@@ -1,29 +1,73 @@
-from sqlalchemy.orm import Session, joinedload
+from datetime import date
+from sqlalchemy import func, insert, select, tuple_, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, Session, selectinload, with_expression
+from app.core.metrics import instrument_dal
+from app.data_access.collection_version_dal import CollectionVersionDAL
+from app.data_access.sync_dal import SyncDAL
+from app.data_access.pagination import decode_cursor, encode_cursor
+from app.data_access.product_stock_dal import ProductStockDAL
+from app.data_access.waste_rollup_dal import WasteRollupDAL, rollup_key
+from app.db.deps import SessionRunner
 from app.models.grocery_run import GroceryRun
-from app.schemas.grocery_run import GroceryRunCreate, GroceryRunUpdate
+from app.models.inventory_batch import InventoryBatch
+from app.schemas.grocery_run import GroceryRunCreate, GroceryRunRead, GroceryRunUpdate
 
+# the GroceryRunRead column fields, in schema order, for plain-row reads
+READ_COLUMNS = [
+    getattr(GroceryRun, name) for name in GroceryRunRead.model_fields
+    if name not in ("inventory_batches", "batch_summary")
+]
 
+
+def batch_summary_columns() -> dict:
+    """The GroceryRunBatchSummary fields as correlated aggregates (served by ix_batches_run_completed)."""
+    def batch_aggregate(aggregate, *, open_only: bool = False):
+        subquery = select(aggregate).where(InventoryBatch.grocery_run_id == GroceryRun.id)
+        if open_only:
+            subquery = subquery.where(InventoryBatch.completed_at.is_(None))
+        return subquery.scalar_subquery()
+
+    return {
+        "batch_count": batch_aggregate(func.count()),
+        "open_batch_count": batch_aggregate(func.count(), open_only=True),
+        "next_expiry_at": batch_aggregate(func.min(InventoryBatch.expired_at), open_only=True),
+    }
+
+
+@instrument_dal
 class GroceryRunDAL:
     """SQLAlchemy-backed data access helpers for `GroceryRun` records."""
     def __init__(self, db: Session):
         self.db = db
 
     def create(self, *, user_id: int, data: GroceryRunCreate) -> GroceryRun:
-        """Create and persist a new grocery run."""
-        grocery_run = GroceryRun(user_id=user_id, **data.model_dump())
-        self.db.add(grocery_run)
-        self.db.flush()
-        self.db.refresh(grocery_run)
+        """Create and persist a new grocery run (one INSERT ... RETURNING)."""
+        grocery_run = self.db.scalars(
+            insert(GroceryRun).values(user_id=user_id, **data.model_dump()).returning(GroceryRun)
+        ).one()
+        CollectionVersionDAL(self.db).bump(user_id=user_id, collections=["grocery_runs"])
         return grocery_run
+
+    @staticmethod
+    def _with_loads(query: Query, *, include_batches: bool) -> Query:
+        """
+        Add the batch summary expressions and, if asked, one selectinload of the batches.
+        """
+        query = query.options(*(
+            with_expression(getattr(GroceryRun, name), column)
+            for name, column in batch_summary_columns().items()
+        ))
+        if include_batches:
+            query = query.options(selectinload(GroceryRun.inventory_batches))
+        return query
     
-    def get_by_id(self, *, user_id: int, grocery_run_id: int) -> GroceryRun | None:
-        """Return a single grocery run by id and user."""
-        return (
-            self.db.query(GroceryRun)
-            .options(joinedload(GroceryRun.inventory_batches))
-            .filter(GroceryRun.id == grocery_run_id, GroceryRun.user_id == user_id)
-            .first()
-        )
+    def get_by_id(
+        self, *, user_id: int, grocery_run_id: int, include_batches: bool = False
+    ) -> GroceryRun | None:
+        """Return a single grocery run by id and user, with its batch summary (and batches if asked)."""
+        query = self.db.query(GroceryRun).filter(GroceryRun.id == grocery_run_id, GroceryRun.user_id == user_id)
+        return self._with_loads(query, include_batches=include_batches).first()
     
     def get_all_by_user_id(
         self,
@@ -32,20 +76,50 @@ class GroceryRunDAL:
         offset: int = 0,
         limit: int = 100,
         archived: bool | None = None,
-    ) -> list[GroceryRun]:
-        """Return a paginated list of grocery runs for a user."""
-        query = self.db.query(GroceryRun).filter(GroceryRun.user_id == user_id)
+        cursor: str | None = None,
+        include_batches: bool = False,
+        as_rows: bool = False,
+    ) -> list[GroceryRun] | list[Row]:
+        """
+        Return a paginated list of grocery runs for a user, each with its batch
+        summary; `include_batches` loads every page's batches in one extra query.
+
+        Ordered by trip_date descending with id as a unique tiebreaker. Pass the
+        `cursor_for` of the last row of a page as `cursor` to get the next page
+        via an index range scan on (user_id, trip_date) instead of OFFSET.
+
+        `as_rows` selects the GroceryRunRead columns plus the summary aggregates as
+        plain rows (no ORM hydration); it can't be combined with `include_batches`.
+        """
+        if as_rows:
+            if include_batches:
+                raise ValueError("as_rows can't embed inventory batches")
+            summary = batch_summary_columns()
+            query = self.db.query(*READ_COLUMNS, *(column.label(name) for name, column in summary.items()))
+        else:
+            query = self.db.query(GroceryRun)
+        query = query.filter(GroceryRun.user_id == user_id)
 
         if archived is not None:
             query = query.filter(GroceryRun.archived == archived)
+        if cursor:
+            trip_date, run_id = decode_cursor(cursor, date.fromisoformat, int)
+            query = query.filter(tuple_(GroceryRun.trip_date, GroceryRun.id) < (trip_date, run_id))
 
+        if not as_rows:
+            query = self._with_loads(query, include_batches=include_batches)
         # just going with a logical default for ordering currently
         return (
-            query.order_by(GroceryRun.trip_date.desc())
+            query.order_by(GroceryRun.trip_date.desc(), GroceryRun.id.desc())
             .offset(offset)
             .limit(limit)
             .all()
         )
+
+    @staticmethod
+    def cursor_for(grocery_run: GroceryRun) -> str:
+        """Return the cursor that continues a page ending with `grocery_run`."""
+        return encode_cursor(grocery_run.trip_date, grocery_run.id)
     
     def update(
             self,
@@ -54,28 +128,106 @@ class GroceryRunDAL:
             grocery_run_id: int,
             data: GroceryRunUpdate
         ) -> GroceryRun | None:
-        grocery_run = self.get_by_id(user_id=user_id, grocery_run_id=grocery_run_id)
-        if not grocery_run:
-            return None
-        
+        """Patch a grocery run with one UPDATE ... WHERE id AND user_id RETURNING."""
         # we get the patch object
         # excluse_unset=True so we don't overwrite with Pydantic model defaults, only actual passed through patch values
-        # then overwrite the patched fields in the actual object
         patch_grocery_run = data.model_dump(exclude_unset=True)
-        for field, val in patch_grocery_run.items():
-            setattr(grocery_run, field, val)
+        if not patch_grocery_run:
+            return self.get_by_id(user_id=user_id, grocery_run_id=grocery_run_id)
 
-        self.db.flush()
-        self.db.refresh(grocery_run)
+        grocery_run = self.db.scalars(
+            update(GroceryRun)
+            .where(GroceryRun.id == grocery_run_id, GroceryRun.user_id == user_id)
+            .values(**patch_grocery_run)
+            .returning(GroceryRun),
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        ).one_or_none()
+        if grocery_run:
+            CollectionVersionDAL(self.db).bump(user_id=user_id, collections=["grocery_runs"])
         return grocery_run
 
     def delete_by_object(self, grocery_run: GroceryRun) -> None:
+        # the batches go with the run via ON DELETE CASCADE; their stock and rollup rows
+        # and sync tombstones must follow
+        batches = self.db.execute(
+            select(
+                InventoryBatch.id, InventoryBatch.product_id, InventoryBatch.storage_location, InventoryBatch.added_at
+            )
+            .where(InventoryBatch.grocery_run_id == grocery_run.id)
+        ).all()
         self.db.delete(grocery_run)
         self.db.flush()
+        ProductStockDAL(self.db).refresh((batch.product_id, batch.storage_location) for batch in batches)
+        WasteRollupDAL(self.db).refresh(rollup_key(batch.product_id, batch.added_at) for batch in batches)
+        CollectionVersionDAL(self.db).bump(
+            user_id=grocery_run.user_id, collections=["grocery_runs", "inventory_batches"]
+        )
+        sync_dal = SyncDAL(self.db)
+        sync_dal.record_deletions(user_id=grocery_run.user_id, collection="grocery_runs", row_ids=[grocery_run.id])
+        sync_dal.record_deletions(
+            user_id=grocery_run.user_id, collection="inventory_batches", row_ids=[batch.id for batch in batches]
+        )
 
     def delete_by_id(self, *, user_id: int, grocery_run_id: int) -> bool:
-        grocery_run = self.get_by_id(user_id=user_id, grocery_run_id=grocery_run_id)
+        grocery_run = (
+            self.db.query(GroceryRun)
+            .filter(GroceryRun.id == grocery_run_id, GroceryRun.user_id == user_id)
+            .first()
+        )
         if not grocery_run:
             return False
         self.delete_by_object(grocery_run)
         return True
+
+
+class AsyncGroceryRunDAL:
+    """
+    Awaitable `GroceryRunDAL`. Every call runs the sync implementation through a
+    `SessionRunner` (AsyncSession.run_sync on the async stack, the threadpool on the sync stack).
+    """
+    def __init__(self, run: SessionRunner):
+        self.run = run
+
+    async def create(self, *, user_id: int, data: GroceryRunCreate) -> GroceryRun:
+        return await self.run(lambda db: GroceryRunDAL(db).create(user_id=user_id, data=data))
+
+    async def get_by_id(
+        self, *, user_id: int, grocery_run_id: int, include_batches: bool = False
+    ) -> GroceryRun | None:
+        return await self.run(lambda db: GroceryRunDAL(db).get_by_id(
+            user_id=user_id, grocery_run_id=grocery_run_id, include_batches=include_batches
+        ))
+
+    async def get_all_by_user_id(
+        self,
+        *,
+        user_id: int,
+        offset: int = 0,
+        limit: int = 100,
+        archived: bool | None = None,
+        cursor: str | None = None,
+        include_batches: bool = False,
+        as_rows: bool = False,
+    ) -> list[GroceryRun] | list[Row]:
+        return await self.run(lambda db: GroceryRunDAL(db).get_all_by_user_id(
+            user_id=user_id,
+            offset=offset,
+            limit=limit,
+            archived=archived,
+            cursor=cursor,
+            include_batches=include_batches,
+            as_rows=as_rows,
+        ))
+
+    cursor_for = staticmethod(GroceryRunDAL.cursor_for)
+
+    async def update(self, *, user_id: int, grocery_run_id: int, data: GroceryRunUpdate) -> GroceryRun | None:
+        return await self.run(lambda db: GroceryRunDAL(db).update(
+            user_id=user_id, grocery_run_id=grocery_run_id, data=data
+        ))
+
+    async def delete_by_object(self, grocery_run: GroceryRun) -> None:
+        return await self.run(lambda db: GroceryRunDAL(db).delete_by_object(grocery_run))
+
+    async def delete_by_id(self, *, user_id: int, grocery_run_id: int) -> bool:
+        return await self.run(lambda db: GroceryRunDAL(db).delete_by_id(user_id=user_id, grocery_run_id=grocery_run_id))
@@ -1,14 +1,38 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, and_, case, cast, column, func, insert, literal, null, or_, select, tuple_, update, values
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, aliased
+from app.db.deps import SessionRunner
 from app.models.inventory_batch import InventoryBatch
 from app.models.grocery_run import GroceryRun
 from app.models.product import Product
-from app.schemas.inventory_batch import InventoryBatchCreate, InventoryBatchUpdate
+from app.schemas.inventory_batch import (
+    InventoryBatchBulkUpdateItem,
+    InventoryBatchCreate,
+    InventoryBatchRead,
+    InventoryBatchUpdate,
+)
 from app.core.exceptions import QuantityValidationError
+from app.core.metrics import instrument_dal
+from app.data_access.collection_version_dal import CollectionVersionDAL
+from app.data_access.pagination import decode_cursor, encode_cursor, optional
+from app.data_access.product_stock_dal import ProductStockDAL
+from app.data_access.sync_dal import SyncDAL
+from app.data_access.waste_rollup_dal import WasteRollupDAL, rollup_key
+
+# batch writes also change the batch summary embedded in grocery run responses
+BATCH_COLLECTIONS = ["inventory_batches", "grocery_runs"]
+
+# the InventoryBatchRead fields as columns, in schema order, for plain-row reads
+READ_COLUMNS = [getattr(InventoryBatch, name) for name in InventoryBatchRead.model_fields]
 
 Qty = Decimal | None
 
+# the consumption columns a bulk update may change
+QUANTITY_PATCH_FIELDS = ("quantity_used", "quantity_spoiled", "quantity_disposed")
+
 def validate_and_get_completed_at(*, qty_added: Decimal, qty_used: Qty, qty_spoiled: Qty, qty_disposed: Qty):
     qty_used = qty_used or Decimal("0")
     qty_spoiled = qty_spoiled or Decimal("0")
@@ -26,31 +50,37 @@ def validate_and_get_completed_at(*, qty_added: Decimal, qty_used: Qty, qty_spoi
     return func.now() if (qty_added - qty_used - qty_spoiled - qty_disposed) == 0 else None
 
 
+def quantity_rules_sql(*, qty_added, qty_used, qty_spoiled, qty_disposed) -> list:
+    """
+    The checks of `validate_and_get_completed_at` as SQL conditions, for writes
+    that compute the new quantities inside the statement.
+    """
+    return [
+        qty_added >= 0,
+        qty_used >= 0,
+        qty_spoiled >= 0,
+        qty_disposed >= 0,
+        qty_used + qty_spoiled + qty_disposed <= qty_added,
+    ]
+
+
+def completed_at_sql(*, qty_added, qty_used, qty_spoiled, qty_disposed):
+    """SQL counterpart of the `completed_at` returned by `validate_and_get_completed_at`."""
+    return case((qty_added - qty_used - qty_spoiled - qty_disposed == 0, func.now()), else_=None)
+
+
+@instrument_dal
 class InventoryBatchDAL:
     """SQLAlchemy-backed data access helpers for `InventoryBatch` records."""
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, *, user_id: int, data: InventoryBatchCreate) -> InventoryBatch:
-        """Create and persist a new inventory batch."""
-        # we must ensure the user owns both the grocery_run and product
-        # associated with the new inventory batch
-        grocery_run = (
-            self.db.query(GroceryRun)
-            .filter(GroceryRun.id == data.grocery_run_id)
-            .first()
-        )
-        if not grocery_run or grocery_run.user_id != user_id:
-            return None
-
-        product = (
-            self.db.query(Product)
-            .filter(Product.id == data.product_id)
-            .first()
-        )
-        if not product or product.user_id != user_id:
-            return None
+    def create(self, *, user_id: int, data: InventoryBatchCreate) -> InventoryBatch | None:
+        """
+        Create and persist a new inventory batch.
 
+        Returns None if the user doesn't own both the grocery run and the product.
+        """
         # ensure all quantities are positive
         # ensure used + spoiled + disposed <= added
         # batch is completed if qty_added - qty_used - qty_spoiled - qty_disposed == 0
@@ -62,15 +92,114 @@ class InventoryBatchDAL:
             qty_disposed=data.quantity_disposed,
         )
 
-        inventory_batch = InventoryBatch(**data.model_dump())
-        if not inventory_batch.storage_location:
-            inventory_batch.storage_location = product.default_storage_location
-        inventory_batch.completed_at = completed_at
-        self.db.add(inventory_batch)
-        self.db.flush()
-        self.db.refresh(inventory_batch)
+        # INSERT ... SELECT: the row only exists if the user owns both the grocery_run
+        # and the product, so the ownership check, the storage_location default and
+        # reading back server-generated columns all happen in one statement.
+        # Explicit casts: a bare parameter in a SELECT list has no type for Postgres to infer.
+        qty_type = InventoryBatch.quantity_added.type
+        columns = {
+            "grocery_run_id": GroceryRun.id,
+            "product_id": Product.id,
+            "quantity_added": cast(data.quantity_added, qty_type),
+            "quantity_used": cast(data.quantity_used or Decimal("0"), qty_type),
+            "quantity_spoiled": cast(data.quantity_spoiled or Decimal("0"), qty_type),
+            "quantity_disposed": cast(data.quantity_disposed or Decimal("0"), qty_type),
+            "storage_location": func.coalesce(
+                cast(data.storage_location, InventoryBatch.storage_location.type),
+                Product.default_storage_location,
+            ),
+            # CAST(<text> AS DATETIME) yields a number on SQLite, so only NULL gets the cast
+            "expired_at": (
+                literal(data.expired_at, InventoryBatch.expired_at.type)
+                if data.expired_at is not None
+                else cast(null(), InventoryBatch.expired_at.type)
+            ),
+            "completed_at": (
+                completed_at if completed_at is not None else cast(null(), InventoryBatch.completed_at.type)
+            ),
+        }
+        owned = (
+            select(*columns.values())
+            .select_from(GroceryRun)
+            .join(Product, and_(Product.id == data.product_id, Product.user_id == user_id))
+            .where(GroceryRun.id == data.grocery_run_id, GroceryRun.user_id == user_id)
+        )
+        inventory_batch = self.db.scalars(
+            insert(InventoryBatch).from_select(list(columns), owned).returning(InventoryBatch)
+        ).one_or_none()
+        if inventory_batch:
+            ProductStockDAL(self.db).refresh([(inventory_batch.product_id, inventory_batch.storage_location)])
+            WasteRollupDAL(self.db).refresh([rollup_key(inventory_batch.product_id, inventory_batch.added_at)])
+            CollectionVersionDAL(self.db).bump(user_id=user_id, collections=BATCH_COLLECTIONS)
         return inventory_batch
-    
+
+    def create_many(
+        self, *, user_id: int, items: list[InventoryBatchCreate]
+    ) -> tuple[list[InventoryBatch], dict[int, str]]:
+        """
+        Create many inventory batches in one go.
+
+        Ownership of every referenced grocery run and product is checked with
+        one set-based SELECT each, quantities are validated per item, and all
+        valid rows go in as a single multi-row INSERT ... RETURNING.
+
+        Returns the created batches in input order and a map of
+        input index -> error message for the items that were rejected.
+        """
+        run_ids = {item.grocery_run_id for item in items}
+        product_ids = {item.product_id for item in items}
+        owned_run_ids = set(self.db.scalars(
+            select(GroceryRun.id).where(GroceryRun.user_id == user_id, GroceryRun.id.in_(run_ids))
+        ))
+        default_locations = dict(self.db.execute(
+            select(Product.id, Product.default_storage_location)
+            .where(Product.user_id == user_id, Product.id.in_(product_ids))
+        ).all())
+
+        # one timestamp for every batch completed by this request
+        now = datetime.now(timezone.utc)
+        rows, errors = [], {}
+        for index, item in enumerate(items):
+            if item.grocery_run_id not in owned_run_ids or item.product_id not in default_locations:
+                errors[index] = "Referenced resource not found"
+                continue
+            try:
+                completed_at = validate_and_get_completed_at(
+                    qty_added=item.quantity_added,
+                    qty_used=item.quantity_used,
+                    qty_spoiled=item.quantity_spoiled,
+                    qty_disposed=item.quantity_disposed,
+                )
+            except QuantityValidationError as e:
+                errors[index] = str(e)
+                continue
+            rows.append({
+                "grocery_run_id": item.grocery_run_id,
+                "product_id": item.product_id,
+                "quantity_added": item.quantity_added,
+                "quantity_used": item.quantity_used or Decimal("0"),
+                "quantity_spoiled": item.quantity_spoiled or Decimal("0"),
+                "quantity_disposed": item.quantity_disposed or Decimal("0"),
+                "storage_location": item.storage_location or default_locations[item.product_id],
+                "expired_at": item.expired_at,
+                "completed_at": now if completed_at is not None else None,
+            })
+
+        if not rows:
+            return [], errors
+        # render_nulls keeps None-valued rows in the same batch, so this is one
+        # INSERT ... VALUES (...), (...) RETURNING; sort_by_parameter_order has
+        # SQLAlchemy return the rows in `rows` order, which RETURNING alone doesn't promise.
+        created = self.db.scalars(
+            insert(InventoryBatch).returning(InventoryBatch, sort_by_parameter_order=True),
+            rows,
+            execution_options={"render_nulls": True},
+        ).all()
+        ProductStockDAL(self.db).refresh((batch.product_id, batch.storage_location) for batch in created)
+        WasteRollupDAL(self.db).refresh(rollup_key(batch.product_id, batch.added_at) for batch in created)
+        CollectionVersionDAL(self.db).bump(user_id=user_id, collections=BATCH_COLLECTIONS)
+        return created, errors
+
     def get_by_id(self, *, user_id: int, inventory_batch_id: int) -> InventoryBatch | None:
         """Return a single inventory batch by id and user."""
         return (
@@ -87,18 +216,25 @@ class InventoryBatchDAL:
         offset: int = 0,
         limit: int = 100,
         storage_location: str | None = None,
-        grocery_run_id: int | None = None
-    ) -> list[InventoryBatch]:
+        grocery_run_id: int | None = None,
+        cursor: str | None = None,
+        as_rows: bool = False,
+    ) -> list[InventoryBatch] | list[Row]:
         """
         Return a paginated list of inventory batches for a user,
         with optional filters for storage_location and grocery_run_id.
         
         Joins grocery_runs on grocery_run_id.
 
-        Orders by expired_at descending.
+        Orders by expired_at descending (batches without an expiry first, as
+        Postgres does for DESC) with id as a unique tiebreaker; `cursor` (from
+        `cursor_for`) continues after the last row of the previous page.
+
+        `as_rows` selects just the InventoryBatchRead columns as plain rows,
+        skipping ORM hydration, for responses that are encoded straight to JSON.
         """
         query = (
-            self.db.query(InventoryBatch)
+            (self.db.query(*READ_COLUMNS) if as_rows else self.db.query(InventoryBatch))
             .join(InventoryBatch.grocery_run)
             .filter(GroceryRun.user_id == user_id)
         )
@@ -107,12 +243,56 @@ class InventoryBatchDAL:
             query = query.filter(InventoryBatch.storage_location == storage_location)
         if grocery_run_id:
             query = query.filter(InventoryBatch.grocery_run_id == grocery_run_id)
+        if cursor:
+            expired_at, batch_id = decode_cursor(cursor, optional(datetime.fromisoformat), int)
+            if expired_at is None:
+                # still inside the NULL block: the rest of it, then every dated batch
+                query = query.filter(or_(
+                    and_(InventoryBatch.expired_at.is_(None), InventoryBatch.id < batch_id),
+                    InventoryBatch.expired_at.isnot(None),
+                ))
+            else:
+                query = query.filter(tuple_(InventoryBatch.expired_at, InventoryBatch.id) < (expired_at, batch_id))
         return (
-            query.order_by(InventoryBatch.expired_at.desc())
+            query.order_by(InventoryBatch.expired_at.desc().nulls_first(), InventoryBatch.id.desc())
             .offset(offset)
             .limit(limit)
             .all()
         )
+
+    def get_expiring(
+        self,
+        *,
+        user_id: int,
+        days: int,
+        include_expired: bool = False,
+        limit: int = 100,
+    ) -> list[InventoryBatch]:
+        """
+        Return the user's open batches that expire within the next `days` days
+        (and those already past their expiry if `include_expired`), soonest first.
+
+        The filters match the partial index ix_batches_open_run_expiry, so the
+        lookup never reads completed batches.
+        """
+        now = datetime.now(timezone.utc)
+        query = (
+            self.db.query(InventoryBatch)
+            .join(InventoryBatch.grocery_run)
+            .filter(
+                GroceryRun.user_id == user_id,
+                InventoryBatch.completed_at.is_(None),
+                InventoryBatch.expired_at < now + timedelta(days=days),
+            )
+        )
+        if not include_expired:
+            query = query.filter(InventoryBatch.expired_at >= now)
+        return query.order_by(InventoryBatch.expired_at.asc(), InventoryBatch.id.asc()).limit(limit).all()
+
+    @staticmethod
+    def cursor_for(inventory_batch: InventoryBatch) -> str:
+        """Return the cursor that continues a page ending with `inventory_batch`."""
+        return encode_cursor(inventory_batch.expired_at, inventory_batch.id)
     
     def update(
             self,
@@ -121,32 +301,205 @@ class InventoryBatchDAL:
             inventory_batch_id: int,
             data: InventoryBatchUpdate
         ) -> InventoryBatch | None:
-        inventory_batch = self.get_by_id(user_id=user_id, inventory_batch_id=inventory_batch_id)
-        if not inventory_batch:
-            return None
-        # we get the patch object
+        """
+        Patch an inventory batch in a single UPDATE ... RETURNING.
+
+        Ownership of the batch (and of a newly referenced grocery run or product)
+        and the quantity rules are part of the WHERE clause, and `completed_at`
+        is recomputed in SQL. Only when nothing was updated does one more SELECT
+        tell a missing batch (None) apart from invalid quantities (raises).
+        """
         # excluse_unset=True so we don't overwrite with Pydantic model defaults, only actual passed through patch values
-        # then overwrite the patched fields in the actual object (plus validate quantities)
-        # TODO: replace with DB level checks later
-        patch = data.model_dump(exclude_unset=True)
-        completed_at = validate_and_get_completed_at(
-            qty_added=patch.get("quantity_added", inventory_batch.quantity_added),
-            qty_used=patch.get("quantity_used", inventory_batch.quantity_used),
-            qty_spoiled=patch.get("quantity_spoiled", inventory_batch.quantity_spoiled),
-            qty_disposed=patch.get("quantity_disposed", inventory_batch.quantity_disposed),
+        # completed_at is always derived from the quantities, and None can't clear a NOT NULL column
+        patch = {
+            field: val
+            for field, val in data.model_dump(exclude_unset=True).items()
+            if field != "completed_at" and (val is not None or field in ("storage_location", "expired_at"))
+        }
+        # patched quantities as (typed) bound values, the rest read from the row being updated
+        qty = {
+            field: (
+                cast(patch[field], InventoryBatch.quantity_added.type)
+                if field in patch
+                else getattr(InventoryBatch, field)
+            )
+            for field in ("quantity_added", *QUANTITY_PATCH_FIELDS)
+        }
+        qty_args = {
+            "qty_added": qty["quantity_added"],
+            "qty_used": qty["quantity_used"],
+            "qty_spoiled": qty["quantity_spoiled"],
+            "qty_disposed": qty["quantity_disposed"],
+        }
+
+        conditions = [
+            InventoryBatch.id == inventory_batch_id,
+            InventoryBatch.grocery_run_id == GroceryRun.id,
+            GroceryRun.user_id == user_id,
+            *quantity_rules_sql(**qty_args),
+        ]
+        # moving the batch requires owning its new grocery run / product as well
+        if "grocery_run_id" in patch:
+            target_run = aliased(GroceryRun)
+            conditions.append(
+                select(target_run.id)
+                .where(target_run.id == patch["grocery_run_id"], target_run.user_id == user_id)
+                .exists()
+            )
+        if "product_id" in patch:
+            conditions.append(
+                select(Product.id)
+                .where(Product.id == patch["product_id"], Product.user_id == user_id)
+                .exists()
+            )
+
+        # moving the batch to another product/location also changes the stock (and, for a
+        # product move, rollup) row it leaves; RETURNING only has the new values, so read
+        # the old keys first (only in that case)
+        stock_keys, rollup_keys = set(), set()
+        if "product_id" in patch or "storage_location" in patch:
+            for product_id, storage_location, added_at in self.db.execute(
+                select(InventoryBatch.product_id, InventoryBatch.storage_location, InventoryBatch.added_at)
+                .where(InventoryBatch.id == inventory_batch_id)
+            ):
+                stock_keys.add((product_id, storage_location))
+                rollup_keys.add(rollup_key(product_id, added_at))
+
+        stmt = (
+            update(InventoryBatch)
+            .where(*conditions)
+            .values(**patch, completed_at=completed_at_sql(**qty_args))
+            .returning(InventoryBatch)
         )
-        for field, val in patch.items():
-            setattr(inventory_batch, field, val)
+        inventory_batch = self.db.scalars(
+            stmt,
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        ).one_or_none()
+        if inventory_batch:
+            stock_keys.add((inventory_batch.product_id, inventory_batch.storage_location))
+            ProductStockDAL(self.db).refresh(stock_keys)
+            # the rollups only sum quantities per product, so a location/date-only patch leaves them alone
+            if "product_id" in patch or patch.keys() & {"quantity_added", *QUANTITY_PATCH_FIELDS}:
+                rollup_keys.add(rollup_key(inventory_batch.product_id, inventory_batch.added_at))
+                WasteRollupDAL(self.db).refresh(rollup_keys)
+            CollectionVersionDAL(self.db).bump(user_id=user_id, collections=BATCH_COLLECTIONS)
+            return inventory_batch
 
-        inventory_batch.completed_at = completed_at
+        current = self.get_by_id(user_id=user_id, inventory_batch_id=inventory_batch_id)
+        if current:
+            # raises if the quantities were the reason; otherwise a referenced resource wasn't owned
+            validate_and_get_completed_at(
+                qty_added=patch.get("quantity_added", current.quantity_added),
+                qty_used=patch.get("quantity_used", current.quantity_used),
+                qty_spoiled=patch.get("quantity_spoiled", current.quantity_spoiled),
+                qty_disposed=patch.get("quantity_disposed", current.quantity_disposed),
+            )
+        return None
 
-        self.db.flush()
-        self.db.refresh(inventory_batch)
-        return inventory_batch
+    def update_many(
+        self, *, user_id: int, items: list[InventoryBatchBulkUpdateItem]
+    ) -> tuple[list[InventoryBatch], dict[int, str]]:
+        """
+        Apply used/spoiled/disposed changes to many batches in one statement.
+
+        The patches are sent as a VALUES list and joined in an
+        UPDATE ... FROM ... RETURNING that also enforces ownership and the
+        quantity rules, and recomputes `completed_at` in SQL. Batches the
+        UPDATE skipped are classified with one extra SELECT, only when needed.
+
+        Returns the updated batches in input order and a map of
+        batch id -> error message for the rejected ones.
+        """
+        # an id patched twice would make UPDATE ... FROM pick one row arbitrarily
+        id_counts = Counter(item.id for item in items)
+        errors = {batch_id: "Duplicate id in request" for batch_id, count in id_counts.items() if count > 1}
+
+        # one (id, <field>_delta, <field>) triple group per item: delta items fill the
+        # deltas and leave absolutes NULL, absolute items do the opposite
+        rows = []
+        for item in items:
+            if item.id in errors:
+                continue
+            row = [item.id]
+            for field in QUANTITY_PATCH_FIELDS:
+                value = getattr(item, field)
+                row += [value or Decimal("0"), None] if item.mode == "delta" else [Decimal("0"), value]
+            rows.append(tuple(row))
+        if not rows:
+            return [], errors
+
+        qty_type = InventoryBatch.quantity_used.type
+        patch_columns = [column("id", Integer)]
+        for field in QUANTITY_PATCH_FIELDS:
+            patch_columns += [column(f"{field}_delta", qty_type), column(field, qty_type)]
+        patch = values(*patch_columns, name="patch").data(rows).cte("patch")
+
+        # absolute value when given, otherwise current value + delta (0 for untouched fields);
+        # the cast types all-NULL VALUES columns on Postgres
+        new = {
+            field: func.coalesce(
+                cast(patch.c[field], qty_type),
+                getattr(InventoryBatch, field) + patch.c[f"{field}_delta"],
+            )
+            for field in QUANTITY_PATCH_FIELDS
+        }
+        qty_args = {
+            "qty_added": InventoryBatch.quantity_added,
+            "qty_used": new["quantity_used"],
+            "qty_spoiled": new["quantity_spoiled"],
+            "qty_disposed": new["quantity_disposed"],
+        }
+        stmt = (
+            update(InventoryBatch)
+            .where(
+                InventoryBatch.id == patch.c.id,
+                InventoryBatch.grocery_run_id == GroceryRun.id,
+                GroceryRun.user_id == user_id,
+                *quantity_rules_sql(**qty_args),
+            )
+            .values(**new, completed_at=completed_at_sql(**qty_args))
+            .returning(InventoryBatch)
+        )
+        updated = self.db.scalars(
+            stmt,
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        ).all()
+
+        ProductStockDAL(self.db).refresh((batch.product_id, batch.storage_location) for batch in updated)
+        WasteRollupDAL(self.db).refresh(rollup_key(batch.product_id, batch.added_at) for batch in updated)
+        if updated:
+            CollectionVersionDAL(self.db).bump(user_id=user_id, collections=BATCH_COLLECTIONS)
+
+        updated_ids = {batch.id for batch in updated}
+        rejected_ids = [row[0] for row in rows if row[0] not in updated_ids]
+        if rejected_ids:
+            owned_ids = set(self.db.scalars(
+                select(InventoryBatch.id)
+                .join(InventoryBatch.grocery_run)
+                .where(GroceryRun.user_id == user_id, InventoryBatch.id.in_(rejected_ids))
+            ))
+            for batch_id in rejected_ids:
+                errors[batch_id] = (
+                    "Quantities must be >= 0 and "
+                    "quantity_used + quantity_spoiled + quantity_disposed must be <= quantity_added"
+                    if batch_id in owned_ids
+                    else "Inventory batch not found"
+                )
+
+        order = {row[0]: position for position, row in enumerate(rows)}
+        return sorted(updated, key=lambda batch: order[batch.id]), errors
 
     def delete_by_object(self, inventory_batch: InventoryBatch) -> None:
         self.db.delete(inventory_batch)
         self.db.flush()
+        ProductStockDAL(self.db).refresh([(inventory_batch.product_id, inventory_batch.storage_location)])
+        WasteRollupDAL(self.db).refresh([rollup_key(inventory_batch.product_id, inventory_batch.added_at)])
+        # batches don't carry user_id; the grocery run they belonged to (which remains) does
+        owner_id = select(GroceryRun.user_id).where(GroceryRun.id == inventory_batch.grocery_run_id).scalar_subquery()
+        CollectionVersionDAL(self.db).bump(user_id=owner_id, collections=BATCH_COLLECTIONS)
+        SyncDAL(self.db).record_deletions(
+            user_id=owner_id, collection="inventory_batches", row_ids=[inventory_batch.id]
+        )
 
     def delete_by_id(self, *, user_id: int, inventory_batch_id: int) -> bool:
         inventory_batch = self.get_by_id(user_id=user_id, inventory_batch_id=inventory_batch_id)
@@ -154,3 +507,75 @@ class InventoryBatchDAL:
             return False
         self.delete_by_object(inventory_batch)
         return True
+
+
+class AsyncInventoryBatchDAL:
+    """
+    Awaitable `InventoryBatchDAL`. Every call runs the sync implementation through a
+    `SessionRunner` (AsyncSession.run_sync on the async stack, the threadpool on the sync stack).
+    """
+    def __init__(self, run: SessionRunner):
+        self.run = run
+
+    async def create(self, *, user_id: int, data: InventoryBatchCreate) -> InventoryBatch | None:
+        return await self.run(lambda db: InventoryBatchDAL(db).create(user_id=user_id, data=data))
+
+    async def create_many(
+        self, *, user_id: int, items: list[InventoryBatchCreate]
+    ) -> tuple[list[InventoryBatch], dict[int, str]]:
+        return await self.run(lambda db: InventoryBatchDAL(db).create_many(user_id=user_id, items=items))
+
+    async def get_by_id(self, *, user_id: int, inventory_batch_id: int) -> InventoryBatch | None:
+        return await self.run(lambda db: InventoryBatchDAL(db).get_by_id(
+            user_id=user_id, inventory_batch_id=inventory_batch_id
+        ))
+
+    async def get_all_by_user_id(
+        self,
+        *,
+        user_id: int,
+        offset: int = 0,
+        limit: int = 100,
+        storage_location: str | None = None,
+        grocery_run_id: int | None = None,
+        cursor: str | None = None,
+        as_rows: bool = False,
+    ) -> list[InventoryBatch] | list[Row]:
+        return await self.run(lambda db: InventoryBatchDAL(db).get_all_by_user_id(
+            user_id=user_id,
+            offset=offset,
+            limit=limit,
+            storage_location=storage_location,
+            grocery_run_id=grocery_run_id,
+            cursor=cursor,
+            as_rows=as_rows,
+        ))
+
+    async def get_expiring(
+        self, *, user_id: int, days: int, include_expired: bool = False, limit: int = 100
+    ) -> list[InventoryBatch]:
+        return await self.run(lambda db: InventoryBatchDAL(db).get_expiring(
+            user_id=user_id, days=days, include_expired=include_expired, limit=limit
+        ))
+
+    cursor_for = staticmethod(InventoryBatchDAL.cursor_for)
+
+    async def update(
+        self, *, user_id: int, inventory_batch_id: int, data: InventoryBatchUpdate
+    ) -> InventoryBatch | None:
+        return await self.run(lambda db: InventoryBatchDAL(db).update(
+            user_id=user_id, inventory_batch_id=inventory_batch_id, data=data
+        ))
+
+    async def update_many(
+        self, *, user_id: int, items: list[InventoryBatchBulkUpdateItem]
+    ) -> tuple[list[InventoryBatch], dict[int, str]]:
+        return await self.run(lambda db: InventoryBatchDAL(db).update_many(user_id=user_id, items=items))
+
+    async def delete_by_object(self, inventory_batch: InventoryBatch) -> None:
+        return await self.run(lambda db: InventoryBatchDAL(db).delete_by_object(inventory_batch))
+
+    async def delete_by_id(self, *, user_id: int, inventory_batch_id: int) -> bool:
+        return await self.run(lambda db: InventoryBatchDAL(db).delete_by_id(
+            user_id=user_id, inventory_batch_id=inventory_batch_id
+        ))
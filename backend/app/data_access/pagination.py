@@ -0,0 +1,37 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Callable
+
+from app.core.exceptions import InvalidCursorError
+
+# list endpoints return the cursor for the next page in this header (body stays a plain list)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row of a page (plus its id tiebreaker) as an opaque token."""
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[Any], Any]) -> tuple:
+    """
+    Decode a token produced by `encode_cursor`, converting each position with
+    the matching parser (e.g. `date.fromisoformat`, `int`).
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("wrong number of cursor fields")
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def optional(parse: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Wrap a parser so JSON null decodes to None (for nullable sort columns)."""
+    return lambda value: None if value is None else parse(value)
@@ -1,21 +1,47 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import case, func, insert, literal, not_, or_, select, tuple_, union_all, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, aliased
 from sqlalchemy.exc import IntegrityError
-from app.models.product import Product
-from app.schemas.product import ProductCreate, ProductUpdate
+from app.data_access.collection_version_dal import CollectionVersionDAL
+from app.data_access.sync_dal import SyncDAL
+from app.db.deps import SessionRunner
+from app.db.functions import days_since, greatest, word_match
+from app.models.inventory_batch import InventoryBatch
+from app.models.product import Product, search_text
+from app.schemas.product import ProductCreate, ProductRead, ProductUpdate
 from app.core.exceptions import UniqueBarcodeError
+from app.core.metrics import instrument_dal
+from app.data_access.pagination import decode_cursor, encode_cursor
 
+# queries shorter than a trigram only match name/brand prefixes
+MIN_FUZZY_QUERY_LENGTH = 3
+# ranking: matches that contain the query score by where it occurs; typo (fuzzy-only) matches
+# come after them, by trigram word similarity with a brand match counting for less than a name
+# match. Both add a recency term that decays with RECENCY_HALF_LIFE_DAYS
+NAME_PREFIX_SCORE = 1.0
+NAME_WORD_SCORE = 0.8
+BRAND_WORD_SCORE = 0.6
+INFIX_SCORE = 0.4
+BRAND_WEIGHT = 0.8
+RECENCY_WEIGHT = 0.25
+RECENCY_HALF_LIFE_DAYS = 30
+
+# the ProductRead fields as columns, in schema order, for plain-row reads
+READ_COLUMNS = [getattr(Product, name) for name in ProductRead.model_fields]
+
+
+@instrument_dal
 class ProductDAL:
     """SQLAlchemy-backed data access helpers for `Product` records."""
     def __init__(self, db: Session):
         self.db = db
 
     def create(self, *, user_id: int, data: ProductCreate) -> Product:
-        """Create and persist a new product."""
-        product = Product(user_id=user_id, **data.model_dump())
-        self.db.add(product)
-        
+        """Create and persist a new product (one INSERT ... RETURNING)."""
         try:
-            self.db.flush()
+            product = self.db.scalars(
+                insert(Product).values(user_id=user_id, **data.model_dump()).returning(Product)
+            ).one()
         except IntegrityError as e:
             self.db.rollback()
             # TODO: replace with generic handler
@@ -23,8 +49,7 @@ class ProductDAL:
             if "ux_products_user_barcode_not_null" in str(getattr(e, "orig", e)):
                 raise UniqueBarcodeError("A product with this barcode already exists")
             raise
-
-        self.db.refresh(product)
+        CollectionVersionDAL(self.db).bump(user_id=user_id, collections=["products"])
         return product
     
     def get_by_id(self, *, user_id: int, product_id: int) -> Product | None:
@@ -43,22 +68,108 @@ class ProductDAL:
             .first()
         )
     
+    def get_by_any_barcode(self, *, user_id: int, barcodes: list[str]) -> Product | None:
+        """Return the user's product with any of `barcodes` (the oldest, if several match)."""
+        return (
+            self.db.query(Product)
+            .filter(Product.user_id == user_id, Product.barcode.in_(barcodes))
+            .order_by(Product.id.asc())
+            .first()
+        )
+
     def get_all_by_user_id(
         self,
         *,
         user_id: int,
         offset: int = 0,
-        limit: int = 100
-    ) -> list[Product]:
-        """Return a paginated list of products for a user."""
+        limit: int = 100,
+        cursor: str | None = None,
+        as_rows: bool = False,
+    ) -> list[Product] | list[Row]:
+        """
+        Return a paginated list of products for a user.
+
+        Ordered by name ascending with id as a unique tiebreaker; `cursor`
+        (from `cursor_for`) continues after the last row of the previous page.
+        `as_rows` selects just the ProductRead columns as plain rows (no ORM hydration).
+        """
+        query = (self.db.query(*READ_COLUMNS) if as_rows else self.db.query(Product)).filter(Product.user_id == user_id)
+        if cursor:
+            name, product_id = decode_cursor(cursor, str, int)
+            query = query.filter(tuple_(Product.name, Product.id) > (name, product_id))
         return (
-            self.db.query(Product)
-            .filter(Product.user_id == user_id)
-            .order_by(Product.name.asc())
+            query.order_by(Product.name.asc(), Product.id.asc())
             .offset(offset)
             .limit(limit)
             .all()
         )
+
+    def search(self, *, user_id: int, query: str, limit: int = 10) -> list[Product]:
+        """
+        Type-ahead search over a user's products by name and brand, in one statement.
+
+        Products whose "name brand" contains the query rank first, by where it occurs (name
+        prefix, start of a later name word, start of a brand word, anywhere); queries under
+        three characters only match name or brand prefixes. Only when those can't fill
+        `limit` are typos looked for: fuzzy word matches (pg_trgm `<%`) ranked by trigram word
+        similarity, which is too slow to compute for every match of a common word. Both lookups
+        are served by ix_products_user_search_trgm on Postgres, and both tiers favour products
+        stocked recently.
+        """
+        query = " ".join(query.split())
+        if not query:
+            return []
+        text = search_text(Product.name, Product.brand)
+        name_prefix = Product.name.istartswith(query, autoescape=True)
+        brand_prefix = Product.brand.istartswith(query, autoescape=True)
+        if len(query) < MIN_FUZZY_QUERY_LENGTH:
+            contains = or_(name_prefix, brand_prefix)
+        else:
+            contains = text.icontains(query, autoescape=True)
+
+        # latest batch of the product (ix_batches_product_added_at)
+        last_used = (
+            select(func.max(InventoryBatch.added_at))
+            .where(InventoryBatch.product_id == Product.id)
+            .correlate(Product)
+            .scalar_subquery()
+        )
+        recency = func.coalesce(RECENCY_WEIGHT / (1 + days_since(last_used) / RECENCY_HALF_LIFE_DAYS), literal(0.0))
+        placement = case(
+            (name_prefix, NAME_PREFIX_SCORE),
+            (Product.name.icontains(" " + query, autoescape=True), NAME_WORD_SCORE),
+            (or_(brand_prefix, Product.brand.icontains(" " + query, autoescape=True)), BRAND_WORD_SCORE),
+            else_=INFIX_SCORE,
+        )
+        ranked = select(
+            *Product.__table__.c, literal(0).label("tier"), (placement + recency).label("score")
+        ).where(Product.user_id == user_id, contains)
+
+        if len(query) >= MIN_FUZZY_QUERY_LENGTH:
+            # uncorrelated, so Postgres runs it once as a gate and skips the fuzzy scan when it's false
+            page_filled = select(func.count()).select_from(
+                select(Product.id).where(Product.user_id == user_id, contains).limit(limit).subquery()
+            ).scalar_subquery() >= limit
+            similarity = greatest(
+                func.word_similarity(query, Product.name),
+                BRAND_WEIGHT * func.word_similarity(query, func.coalesce(Product.brand, "")),
+            )
+            ranked = union_all(ranked, select(
+                *Product.__table__.c, literal(1).label("tier"), (similarity + recency).label("score")
+            ).where(Product.user_id == user_id, word_match(query, text), not_(contains), not_(page_filled)))
+
+        ranked = ranked.subquery()
+        product = aliased(Product, ranked)
+        return self.db.scalars(
+            select(product)
+            .order_by(ranked.c.tier, ranked.c.score.desc(), ranked.c.name.asc(), ranked.c.id.asc())
+            .limit(limit)
+        ).all()
+
+    @staticmethod
+    def cursor_for(product: Product) -> str:
+        """Return the cursor that continues a page ending with `product`."""
+        return encode_cursor(product.name, product.id)
     
     def update(
             self,
@@ -67,19 +178,21 @@ class ProductDAL:
             product_id: int,
             data: ProductUpdate
         ) -> Product | None:
-        product = self.get_by_id(user_id=user_id, product_id=product_id)
-        if not product:
-            return None
-        
+        """Patch a product with one UPDATE ... WHERE id AND user_id RETURNING."""
         # we get the patch object
         # excluse_unset=True so we don't overwrite with Pydantic model defaults, only actual passed through patch values
-        # then overwrite the patched fields in the actual object
         patch_product = data.model_dump(exclude_unset=True)
-        for field, val in patch_product.items():
-            setattr(product, field, val)
+        if not patch_product:
+            return self.get_by_id(user_id=user_id, product_id=product_id)
 
         try:
-            self.db.flush()
+            product = self.db.scalars(
+                update(Product)
+                .where(Product.id == product_id, Product.user_id == user_id)
+                .values(**patch_product)
+                .returning(Product),
+                execution_options={"synchronize_session": False, "populate_existing": True},
+            ).one_or_none()
         except IntegrityError as e:
             self.db.rollback()
             # TODO: replace with generic handler
@@ -87,13 +200,15 @@ class ProductDAL:
             if "ux_products_user_barcode_not_null" in str(getattr(e, "orig", e)):
                 raise UniqueBarcodeError("A product with this barcode already exists")
             raise
-
-        self.db.refresh(product)
+        if product:
+            CollectionVersionDAL(self.db).bump(user_id=user_id, collections=["products"])
         return product
 
     def delete_by_object(self, product: Product) -> None:
         self.db.delete(product)
         self.db.flush()
+        CollectionVersionDAL(self.db).bump(user_id=product.user_id, collections=["products"])
+        SyncDAL(self.db).record_deletions(user_id=product.user_id, collection="products", row_ids=[product.id])
 
     def delete_by_id(self, *, user_id: int, product_id: int) -> bool:
         product = self.get_by_id(user_id=user_id, product_id=product_id)
@@ -101,3 +216,45 @@ class ProductDAL:
             return False
         self.delete_by_object(product)
         return True
+
+
+class AsyncProductDAL:
+    """
+    Awaitable `ProductDAL`. Every call runs the sync implementation through a
+    `SessionRunner` (AsyncSession.run_sync on the async stack, the threadpool on the sync stack).
+    """
+    def __init__(self, run: SessionRunner):
+        self.run = run
+
+    async def create(self, *, user_id: int, data: ProductCreate) -> Product:
+        return await self.run(lambda db: ProductDAL(db).create(user_id=user_id, data=data))
+
+    async def get_by_id(self, *, user_id: int, product_id: int) -> Product | None:
+        return await self.run(lambda db: ProductDAL(db).get_by_id(user_id=user_id, product_id=product_id))
+
+    async def get_by_barcode(self, *, user_id: int, barcode: str) -> Product | None:
+        return await self.run(lambda db: ProductDAL(db).get_by_barcode(user_id=user_id, barcode=barcode))
+
+    async def get_by_any_barcode(self, *, user_id: int, barcodes: list[str]) -> Product | None:
+        return await self.run(lambda db: ProductDAL(db).get_by_any_barcode(user_id=user_id, barcodes=barcodes))
+
+    async def get_all_by_user_id(
+        self, *, user_id: int, offset: int = 0, limit: int = 100, cursor: str | None = None, as_rows: bool = False
+    ) -> list[Product] | list[Row]:
+        return await self.run(lambda db: ProductDAL(db).get_all_by_user_id(
+            user_id=user_id, offset=offset, limit=limit, cursor=cursor, as_rows=as_rows
+        ))
+
+    async def search(self, *, user_id: int, query: str, limit: int = 10) -> list[Product]:
+        return await self.run(lambda db: ProductDAL(db).search(user_id=user_id, query=query, limit=limit))
+
+    cursor_for = staticmethod(ProductDAL.cursor_for)
+
+    async def update(self, *, user_id: int, product_id: int, data: ProductUpdate) -> Product | None:
+        return await self.run(lambda db: ProductDAL(db).update(user_id=user_id, product_id=product_id, data=data))
+
+    async def delete_by_object(self, product: Product) -> None:
+        return await self.run(lambda db: ProductDAL(db).delete_by_object(product))
+
+    async def delete_by_id(self, *, user_id: int, product_id: int) -> bool:
+        return await self.run(lambda db: ProductDAL(db).delete_by_id(user_id=user_id, product_id=product_id))
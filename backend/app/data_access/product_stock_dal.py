@@ -0,0 +1,155 @@
+from collections.abc import Iterable
+from sqlalchemy import Select, and_, delete, func, insert, or_, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from app.core.metrics import instrument_dal
+from app.db.deps import SessionRunner
+from app.db.locks import lock_products
+from app.models.enums import StorageLocation
+from app.models.inventory_batch import InventoryBatch
+from app.models.product import Product
+from app.models.product_stock import ProductStock
+
+# (product_id, storage_location) -- product ids are per user, so this identifies a stock row
+StockKey = tuple[int, StorageLocation | None]
+
+STOCK_COLUMNS = [
+    "user_id", "product_id", "storage_location", "quantity_current", "open_batch_count", "next_expiry_at",
+]
+
+
+def open_stock_query(*where) -> Select:
+    """Aggregate the open batches into product_stock rows (columns in STOCK_COLUMNS order)."""
+    return (
+        select(
+            Product.user_id,
+            InventoryBatch.product_id,
+            InventoryBatch.storage_location,
+            func.sum(InventoryBatch.quantity_current),
+            func.count(),
+            func.min(InventoryBatch.expired_at),
+        )
+        .select_from(InventoryBatch)
+        .join(Product, Product.id == InventoryBatch.product_id)
+        .where(InventoryBatch.completed_at.is_(None), *where)
+        .group_by(Product.user_id, InventoryBatch.product_id, InventoryBatch.storage_location)
+    )
+
+
+def key_filter(product_id_column, storage_location_column, keys: Iterable[StockKey]):
+    # IS NOT DISTINCT FROM so batches without a storage_location match their NULL bucket
+    return or_(*(
+        and_(product_id_column == product_id, storage_location_column.is_not_distinct_from(storage_location))
+        for product_id, storage_location in keys
+    ))
+
+
+@instrument_dal
+class ProductStockDAL:
+    """SQLAlchemy-backed data access helpers for the `ProductStock` summary."""
+    def __init__(self, db: Session):
+        self.db = db
+
+    def refresh(self, keys: Iterable[StockKey]) -> None:
+        """
+        Recompute the stock rows for `keys` from their open batches, in the caller's
+        transaction: one DELETE and one INSERT ... SELECT however many keys changed.
+        Recomputing (rather than applying deltas) keeps next_expiry_at exact when a batch closes.
+        On Postgres the products are locked first (see `lock_products`) so concurrent refreshes
+        of the same key run one after the other.
+        """
+        keys = set(keys)
+        if not keys:
+            return
+        lock_products(self.db, (product_id for product_id, _ in keys))
+        self.db.execute(
+            delete(ProductStock).where(key_filter(ProductStock.product_id, ProductStock.storage_location, keys)),
+            execution_options={"synchronize_session": False},
+        )
+        self.db.execute(
+            insert(ProductStock).from_select(
+                STOCK_COLUMNS,
+                open_stock_query(key_filter(InventoryBatch.product_id, InventoryBatch.storage_location, keys)),
+            )
+        )
+
+    def rebuild(self, *, user_id: int | None = None) -> int:
+        """Recompute every stock row (for one user, or everyone) with set-based SQL; returns the row count."""
+        stale = delete(ProductStock)
+        where = []
+        if user_id is not None:
+            stale = stale.where(ProductStock.user_id == user_id)
+            where.append(Product.user_id == user_id)
+        self.db.execute(stale, execution_options={"synchronize_session": False})
+        result = self.db.execute(insert(ProductStock).from_select(STOCK_COLUMNS, open_stock_query(*where)))
+        return result.rowcount
+
+    def check(self, *, user_id: int | None = None) -> list[Row]:
+        """
+        Compare the summary with a fresh aggregate of inventory_batches.
+
+        Returns one row per (user_id, product_id, storage_location) that is missing,
+        extra or different, with `expected_*` and `actual_*` columns; empty means consistent.
+        """
+        expected = open_stock_query(*([Product.user_id == user_id] if user_id is not None else [])).subquery()
+        e = dict(zip(STOCK_COLUMNS, expected.c))
+        actual = select(ProductStock)
+        if user_id is not None:
+            actual = actual.where(ProductStock.user_id == user_id)
+        actual = actual.subquery()
+
+        return self.db.execute(
+            select(
+                func.coalesce(e["user_id"], actual.c.user_id).label("user_id"),
+                func.coalesce(e["product_id"], actual.c.product_id).label("product_id"),
+                func.coalesce(e["storage_location"], actual.c.storage_location).label("storage_location"),
+                *(e[name].label(f"expected_{name}") for name in STOCK_COLUMNS[3:]),
+                *(actual.c[name].label(f"actual_{name}") for name in STOCK_COLUMNS[3:]),
+            )
+            .select_from(expected)
+            .join(
+                actual,
+                and_(
+                    actual.c.user_id == e["user_id"],
+                    actual.c.product_id == e["product_id"],
+                    actual.c.storage_location.is_not_distinct_from(e["storage_location"]),
+                ),
+                full=True,
+            )
+            .where(or_(*(e[name].is_distinct_from(actual.c[name]) for name in STOCK_COLUMNS[3:])))
+        ).all()
+
+    def get_all_by_user_id(
+        self,
+        *,
+        user_id: int,
+        product_id: int | None = None,
+        storage_location: StorageLocation | None = None,
+    ) -> list[ProductStock]:
+        """Return the user's stock rows, optionally for one product and/or location."""
+        query = self.db.query(ProductStock).filter(ProductStock.user_id == user_id)
+        if product_id:
+            query = query.filter(ProductStock.product_id == product_id)
+        if storage_location:
+            query = query.filter(ProductStock.storage_location == storage_location)
+        return query.order_by(ProductStock.product_id, ProductStock.storage_location).all()
+
+
+class AsyncProductStockDAL:
+    """
+    Awaitable `ProductStockDAL`. Every call runs the sync implementation through a
+    `SessionRunner` (AsyncSession.run_sync on the async stack, the threadpool on the sync stack).
+    """
+    def __init__(self, run: SessionRunner):
+        self.run = run
+
+    async def get_all_by_user_id(
+        self,
+        *,
+        user_id: int,
+        product_id: int | None = None,
+        storage_location: StorageLocation | None = None,
+    ) -> list[ProductStock]:
+        return await self.run(lambda db: ProductStockDAL(db).get_all_by_user_id(
+            user_id=user_id, product_id=product_id, storage_location=storage_location
+        ))
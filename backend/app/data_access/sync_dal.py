@@ -0,0 +1,182 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import ColumnElement, delete, insert, literal, tuple_
+from sqlalchemy.orm import Query, Session
+from app.core.config import SYNC_CURSOR_OVERLAP_SECONDS, SYNC_TOMBSTONE_RETENTION_DAYS
+from app.core.exceptions import SyncHistoryExpiredError
+from app.core.metrics import instrument_dal
+from app.data_access.collection_version_dal import Collection
+from app.data_access.pagination import decode_cursor, encode_cursor, optional
+from app.db.deps import SessionRunner
+from app.db.functions import comparable_timestamp
+from app.models.grocery_run import GroceryRun
+from app.models.inventory_batch import InventoryBatch
+from app.models.product import Product
+from app.models.sync_tombstone import SyncTombstone
+
+# the change streams merged by the feed, in tie-break order
+SYNC_STREAMS = ("grocery_runs", "products", "inventory_batches", "deleted")
+
+# (timestamp, id) of the last row delivered from a stream; a None timestamp means "from the start"
+Position = tuple[datetime | None, int]
+
+
+@dataclass
+class SyncChanges:
+    grocery_runs: list[GroceryRun] = field(default_factory=list)
+    products: list[Product] = field(default_factory=list)
+    inventory_batches: list[InventoryBatch] = field(default_factory=list)
+    deleted: list[SyncTombstone] = field(default_factory=list)
+    # resume token for the next call
+    cursor: str = ""
+    # more changes are ready right now; call again with `cursor` before waiting
+    has_more: bool = False
+
+
+def encode_positions(positions: dict[str, Position]) -> str:
+    return encode_cursor(*(value for stream in SYNC_STREAMS for value in positions[stream]))
+
+
+def decode_positions(cursor: str) -> dict[str, Position]:
+    values = decode_cursor(cursor, *((optional(datetime.fromisoformat), int) * len(SYNC_STREAMS)))
+    return {stream: (values[2 * i], values[2 * i + 1]) for i, stream in enumerate(SYNC_STREAMS)}
+
+
+def utc_now_like(value: datetime | None) -> datetime:
+    # SQLite hands back naive UTC timestamps, Postgres aware ones; compare like with like
+    now = datetime.now(timezone.utc)
+    return now.replace(tzinfo=None) if value is not None and value.tzinfo is None else now
+
+
+@instrument_dal
+class SyncDAL:
+    """SQLAlchemy-backed helpers for the /sync/changes feed and its deletion tombstones."""
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record_deletions(
+        self, *, user_id: int | ColumnElement[int], collection: Collection, row_ids: Iterable[int]
+    ) -> None:
+        """
+        Write one tombstone per deleted row in the caller's transaction (one multi-row INSERT).
+
+        `user_id` may be a scalar subquery for writes that only know a related row.
+        """
+        rows = [{"user_id": user_id, "collection": collection, "row_id": row_id} for row_id in sorted(set(row_ids))]
+        if rows:
+            self.db.execute(insert(SyncTombstone).values(rows))
+
+    def prune_tombstones(self, *, older_than: datetime) -> int:
+        """Delete tombstones recorded before `older_than`; returns how many were removed."""
+        result = self.db.execute(
+            delete(SyncTombstone).where(SyncTombstone.deleted_at < older_than),
+            execution_options={"synchronize_session": False},
+        )
+        return result.rowcount
+
+    def get_changes(
+        self,
+        *,
+        user_id: int,
+        since: datetime | None = None,
+        cursor: str | None = None,
+        limit: int = 200,
+    ) -> SyncChanges:
+        """
+        Return up to `limit` changed rows and tombstones, oldest first.
+
+        Each stream (runs, products, batches, tombstones) is read with a keyset range
+        on (updated_at, id) or (deleted_at, id) from its own position, at most limit + 1
+        rows each. The streams are merged by time and cut at `limit`, and each stream's
+        position moves to the last row it contributed. `cursor` (from a previous call)
+        takes precedence over `since`; neither means a full download.
+
+        Once caught up, every position restarts SYNC_CURSOR_OVERLAP_SECONDS back, so
+        rows committed late with an earlier timestamp are still delivered; clients
+        apply changes idempotently. Raises SyncHistoryExpiredError when tombstones
+        that the caller still needs may already have been pruned.
+        """
+        if cursor:
+            positions = decode_positions(cursor)
+        else:
+            positions = {stream: (since, 0) for stream in SYNC_STREAMS}
+
+        deleted_since = positions["deleted"][0]
+        if deleted_since is not None:
+            if deleted_since < utc_now_like(deleted_since) - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS):
+                raise SyncHistoryExpiredError(
+                    "Changes are only kept for the last "
+                    f"{SYNC_TOMBSTONE_RETENTION_DAYS} days; download the full collections again"
+                )
+
+        def after(query: Query, timestamp, id_column, stream: str) -> Query:
+            position_at, position_id = positions[stream]
+            if position_at is not None:
+                query = query.filter(
+                    tuple_(comparable_timestamp(timestamp), id_column)
+                    > tuple_(comparable_timestamp(literal(position_at, timestamp.type)), position_id)
+                )
+            return query.order_by(timestamp, id_column).limit(limit + 1)
+
+        streams = {
+            "grocery_runs": after(
+                self.db.query(GroceryRun).filter(GroceryRun.user_id == user_id),
+                GroceryRun.updated_at, GroceryRun.id, "grocery_runs",
+            ),
+            "products": after(
+                self.db.query(Product).filter(Product.user_id == user_id),
+                Product.updated_at, Product.id, "products",
+            ),
+            "inventory_batches": after(
+                self.db.query(InventoryBatch).join(InventoryBatch.grocery_run).filter(GroceryRun.user_id == user_id),
+                InventoryBatch.updated_at, InventoryBatch.id, "inventory_batches",
+            ),
+            "deleted": after(
+                self.db.query(SyncTombstone).filter(SyncTombstone.user_id == user_id),
+                SyncTombstone.deleted_at, SyncTombstone.id, "deleted",
+            ),
+        }
+
+        # sorting by (time, stream, id) keeps every stream's own (time, id) order, so the
+        # page takes a prefix of each stream and its last row there is a safe position
+        merged = sorted(
+            (
+                (row.deleted_at if stream == "deleted" else row.updated_at, order, row.id, stream, row)
+                for order, (stream, query) in enumerate(streams.items())
+                for row in query.all()
+            ),
+            key=lambda entry: entry[:3],
+        )
+        page = merged[:limit]
+        changes = SyncChanges(has_more=len(merged) > limit)
+        for timestamp, _, row_id, stream, row in page:
+            getattr(changes, stream).append(row)
+            positions[stream] = (timestamp, row_id)
+
+        if not changes.has_more:
+            horizon = utc_now_like(page[-1][0] if page else since) - timedelta(seconds=SYNC_CURSOR_OVERLAP_SECONDS)
+            positions = {stream: (horizon, 0) for stream in SYNC_STREAMS}
+        changes.cursor = encode_positions(positions)
+        return changes
+
+
+class AsyncSyncDAL:
+    """
+    Awaitable `SyncDAL`. Every call runs the sync implementation through a
+    `SessionRunner` (AsyncSession.run_sync on the async stack, the threadpool on the sync stack).
+    """
+    def __init__(self, run: SessionRunner):
+        self.run = run
+
+    async def get_changes(
+        self,
+        *,
+        user_id: int,
+        since: datetime | None = None,
+        cursor: str | None = None,
+        limit: int = 200,
+    ) -> SyncChanges:
+        return await self.run(lambda db: SyncDAL(db).get_changes(
+            user_id=user_id, since=since, cursor=cursor, limit=limit
+        ))
@@ -1,21 +1,60 @@
+from collections.abc import Callable
+from sqlalchemy import delete, event, insert, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.db.deps import SessionRunner
+from app.core.cache import TTLCache
+from app.core.config import USER_IDENTITY_CACHE_MAX_SIZE, USER_IDENTITY_CACHE_TTL_SECONDS
+from app.core.metrics import instrument_dal
+from app.models.grocery_run import GroceryRun
+from app.models.inventory_batch import InventoryBatch
 from app.models.user import User
+from app.schemas.user import UserIdentity
 
+# per-process firebase_uid -> identity cache, kept in sync by the UserDAL write paths
+user_identity_cache: TTLCache[str, UserIdentity] = TTLCache(
+    max_size=USER_IDENTITY_CACHE_MAX_SIZE,
+    ttl_seconds=USER_IDENTITY_CACHE_TTL_SECONDS,
+)
 
+# Session.info key: identity cache writes waiting for the session's transaction to commit
+_PENDING_CACHE_UPDATES = "user_identity_cache_updates"
+
+
+def _on_commit(db: Session, update: Callable[[], None]) -> None:
+    """
+    Run `update` once `db` commits; a rollback drops it. Cache writes that follow a DB
+    write wait for the commit, so other requests never cache (or re-cache) a row that
+    isn't committed yet.
+    """
+    db.info.setdefault(_PENDING_CACHE_UPDATES, []).append(update)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_cache_updates(session):
+    for update in session.info.pop(_PENDING_CACHE_UPDATES, ()):
+        update()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_cache_updates(session, previous_transaction):
+    session.info.pop(_PENDING_CACHE_UPDATES, None)
+
+
+@instrument_dal
 class UserDAL:
     """SQLAlchemy-backed data access helpers for `User` records."""
     def __init__(self, db: Session):
         self.db = db
 
     def create_user(self, *, firebase_uid: str, email: str, display_name: str | None) -> User:
-        """Create and persist a new user."""
-        user = User(firebase_uid=firebase_uid, email=email, display_name=display_name)
-        self.db.add(user)
-        self.db.flush()
-        self.db.refresh(user)
-        return user
-    
+        """Create and persist a new user (one INSERT ... RETURNING)."""
+        return self.db.scalars(
+            insert(User)
+            .values(firebase_uid=firebase_uid, email=email, display_name=display_name)
+            .returning(User)
+        ).one()
+
     def create_user_or_get_existing(
         self, *, firebase_uid: str, email: str, display_name: str | None
     ) -> tuple[User, bool]:
@@ -32,6 +71,8 @@ class UserDAL:
                 email=email,
                 display_name=display_name,
             )
+            identity = UserIdentity.model_validate(user)
+            _on_commit(self.db, lambda: user_identity_cache.set(firebase_uid, identity))
             return user, True
         except IntegrityError:
             self.db.rollback()
@@ -42,13 +83,76 @@ class UserDAL:
 
     def get_user_by_firebase_uid(self, firebase_uid: str) -> User | None:
         """Return the user matching `firebase_uid`, or None if not found."""
-        return self.db.query(User).filter(User.firebase_uid == firebase_uid).first()
+        user = self.db.query(User).filter(User.firebase_uid == firebase_uid).first()
+        if user:
+            user_identity_cache.set(firebase_uid, UserIdentity.model_validate(user))
+        return user
+
+    def get_identity_by_firebase_uid(self, firebase_uid: str) -> UserIdentity | None:
+        """
+        Return the identity columns for `firebase_uid` (or None) and
+        populate the identity cache with them.
+        """
+        row = (
+            self.db.query(User.user_id, User.email, User.display_name)
+            .filter(User.firebase_uid == firebase_uid)
+            .first()
+        )
+        if not row:
+            return None
+        identity = UserIdentity.model_validate(row)
+        user_identity_cache.set(firebase_uid, identity)
+        return identity
 
     def get_user_by_pk(self, user_id: int) -> User | None:
         """Return the user by primary key, or None if not found."""
         return self.db.query(User).filter(User.user_id == user_id).first()
 
     def delete_user(self, user: User) -> None:
-        """Delete the given user."""
+        """
+        Delete the given user. Products and grocery runs go with it via ON DELETE CASCADE;
+        the batches are removed first because products.id is referenced with RESTRICT.
+        The cached identity is dropped when the transaction commits.
+        """
+        firebase_uid = user.firebase_uid
+        self.db.execute(
+            delete(InventoryBatch).where(
+                InventoryBatch.grocery_run_id.in_(select(GroceryRun.id).where(GroceryRun.user_id == user.user_id))
+            )
+        )
         self.db.delete(user)
         self.db.flush()
+        _on_commit(self.db, lambda: user_identity_cache.pop(firebase_uid))
+
+
+class AsyncUserDAL:
+    """
+    Awaitable `UserDAL`. Every call runs the sync implementation through a
+    `SessionRunner` (AsyncSession.run_sync on the async stack, the threadpool on the sync stack).
+    """
+    def __init__(self, run: SessionRunner):
+        self.run = run
+
+    async def create_user(self, *, firebase_uid: str, email: str, display_name: str | None) -> User:
+        return await self.run(lambda db: UserDAL(db).create_user(
+            firebase_uid=firebase_uid, email=email, display_name=display_name
+        ))
+
+    async def create_user_or_get_existing(
+        self, *, firebase_uid: str, email: str, display_name: str | None
+    ) -> tuple[User, bool]:
+        return await self.run(lambda db: UserDAL(db).create_user_or_get_existing(
+            firebase_uid=firebase_uid, email=email, display_name=display_name
+        ))
+
+    async def get_user_by_firebase_uid(self, firebase_uid: str) -> User | None:
+        return await self.run(lambda db: UserDAL(db).get_user_by_firebase_uid(firebase_uid))
+
+    async def get_identity_by_firebase_uid(self, firebase_uid: str) -> UserIdentity | None:
+        return await self.run(lambda db: UserDAL(db).get_identity_by_firebase_uid(firebase_uid))
+
+    async def get_user_by_pk(self, user_id: int) -> User | None:
+        return await self.run(lambda db: UserDAL(db).get_user_by_pk(user_id))
+
+    async def delete_user(self, user: User) -> None:
+        return await self.run(lambda db: UserDAL(db).delete_user(user))
@@ -0,0 +1,169 @@
+from collections.abc import Iterable
+from datetime import date, datetime
+from typing import Literal
+from sqlalchemy import Select, and_, delete, func, insert, or_, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from app.core.metrics import instrument_dal
+from app.db.deps import SessionRunner
+from app.db.functions import month_start
+from app.db.locks import lock_products
+from app.models.category import Category
+from app.models.inventory_batch import InventoryBatch
+from app.models.product import Product
+from app.models.waste_rollup import WasteRollup
+
+# (product_id, first day of the month the batch was added) -- identifies a rollup row
+RollupKey = tuple[int, date]
+
+WasteGroupBy = Literal["month", "product", "category"]
+
+ROLLUP_COLUMNS = [
+    "user_id", "product_id", "month",
+    "batch_count", "quantity_added", "quantity_used", "quantity_spoiled", "quantity_disposed",
+]
+SUM_COLUMNS = ROLLUP_COLUMNS[3:]
+
+
+def rollup_key(product_id: int, added_at: datetime) -> RollupKey:
+    return product_id, added_at.date().replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def batch_rollup_query(*where) -> Select:
+    """Aggregate inventory_batches into waste_rollups rows (columns in ROLLUP_COLUMNS order)."""
+    month = month_start(InventoryBatch.added_at)
+    return (
+        select(
+            Product.user_id,
+            InventoryBatch.product_id,
+            month,
+            func.count(),
+            func.sum(InventoryBatch.quantity_added),
+            func.sum(InventoryBatch.quantity_used),
+            func.sum(InventoryBatch.quantity_spoiled),
+            func.sum(InventoryBatch.quantity_disposed),
+        )
+        .select_from(InventoryBatch)
+        .join(Product, Product.id == InventoryBatch.product_id)
+        .where(*where)
+        .group_by(Product.user_id, InventoryBatch.product_id, month)
+    )
+
+
+@instrument_dal
+class WasteRollupDAL:
+    """SQLAlchemy-backed data access helpers for the monthly `WasteRollup` table."""
+    def __init__(self, db: Session):
+        self.db = db
+
+    def refresh(self, keys: Iterable[RollupKey]) -> None:
+        """
+        Recompute the rollup rows for `keys` in the caller's transaction: one DELETE and
+        one INSERT ... SELECT reading only those products' batches added in those months
+        (a range scan on ix_batches_product_added_at). Concurrent refreshes of a product
+        are serialized by `lock_products`, which the stock refresh has usually taken already.
+        """
+        keys = set(keys)
+        if not keys:
+            return
+        lock_products(self.db, (product_id for product_id, _ in keys))
+        self.db.execute(
+            delete(WasteRollup).where(or_(*(
+                and_(WasteRollup.product_id == product_id, WasteRollup.month == month)
+                for product_id, month in keys
+            ))),
+            execution_options={"synchronize_session": False},
+        )
+        # month ranges rather than month_start(added_at) = ? so the index can be used
+        self.db.execute(
+            insert(WasteRollup).from_select(
+                ROLLUP_COLUMNS,
+                batch_rollup_query(or_(*(
+                    and_(
+                        InventoryBatch.product_id == product_id,
+                        InventoryBatch.added_at >= datetime(month.year, month.month, 1),
+                        InventoryBatch.added_at < datetime.combine(next_month(month), datetime.min.time()),
+                    )
+                    for product_id, month in keys
+                ))),
+            )
+        )
+
+    def rebuild(self, *, user_id: int | None = None) -> int:
+        """Rebuild every rollup row (for one user, or everyone) from batch history; returns the row count."""
+        stale = delete(WasteRollup)
+        where = []
+        if user_id is not None:
+            stale = stale.where(WasteRollup.user_id == user_id)
+            where.append(Product.user_id == user_id)
+        self.db.execute(stale, execution_options={"synchronize_session": False})
+        result = self.db.execute(insert(WasteRollup).from_select(ROLLUP_COLUMNS, batch_rollup_query(*where)))
+        return result.rowcount
+
+    def report(
+        self,
+        *,
+        user_id: int,
+        group_by: Iterable[WasteGroupBy] = (),
+        start: date | None = None,
+        end: date | None = None,
+    ) -> list[Row]:
+        """
+        Sum the user's rollups between the months of `start` and `end` (inclusive),
+        grouped by any of month / product / category; no grouping gives one totals row.
+
+        Reads one row per (product, month), never the batches themselves.
+        """
+        group_by = set(group_by)
+        dimensions = []
+        if "month" in group_by:
+            dimensions.append(WasteRollup.month)
+        if "product" in group_by:
+            dimensions += [WasteRollup.product_id, Product.name.label("product_name")]
+        if "category" in group_by:
+            dimensions += [Product.category_id, Category.category_name]
+
+        query = (
+            select(
+                *dimensions,
+                *(func.coalesce(func.sum(getattr(WasteRollup, name)), 0).label(name) for name in SUM_COLUMNS),
+            )
+            .select_from(WasteRollup)
+            .where(WasteRollup.user_id == user_id)
+        )
+        if group_by & {"product", "category"}:
+            query = query.join(Product, Product.id == WasteRollup.product_id)
+        if "category" in group_by:
+            query = query.outerjoin(Category, Category.category_id == Product.category_id)
+        if start is not None:
+            query = query.where(WasteRollup.month >= start.replace(day=1))
+        if end is not None:
+            query = query.where(WasteRollup.month <= end.replace(day=1))
+        if dimensions:
+            query = query.group_by(*dimensions).order_by(*dimensions)
+        return self.db.execute(query).all()
+
+
+class AsyncWasteRollupDAL:
+    """
+    Awaitable `WasteRollupDAL`. Every call runs the sync implementation through a
+    `SessionRunner` (AsyncSession.run_sync on the async stack, the threadpool on the sync stack).
+    """
+    def __init__(self, run: SessionRunner):
+        self.run = run
+
+    async def report(
+        self,
+        *,
+        user_id: int,
+        group_by: Iterable[WasteGroupBy] = (),
+        start: date | None = None,
+        end: date | None = None,
+    ) -> list[Row]:
+        return await self.run(lambda db: WasteRollupDAL(db).report(
+            user_id=user_id, group_by=group_by, start=start, end=end
+        ))
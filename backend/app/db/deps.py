@@ -1,8 +1,20 @@
-from typing import Generator
+from typing import AsyncGenerator, Awaitable, Callable, Generator, TypeVar
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.db import session as db_session
 from app.db.session import SessionLocal
 
+T = TypeVar("T")
+
+# Runs a function taking a sync Session and awaits its result.
+# The DALs are written once against Session; a runner decides where that code executes.
+SessionRunner = Callable[[Callable[[Session], T]], Awaitable[T]]
+
+
 def get_db() -> Generator[Session, None, None]:
     """This is the default approach, global commit and rollback."""
     db = SessionLocal()
@@ -14,3 +26,28 @@ def get_db() -> Generator[Session, None, None]:
         raise
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of `get_db`: same global commit and rollback, on the async engine."""
+    if db_session.AsyncSessionLocal is None:
+        raise RuntimeError("Async database stack is not configured; set DB_MODE=async.")
+    async with db_session.AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+def get_threadpool_session_runner(db: Session = Depends(get_db)) -> SessionRunner:
+    """Sync stack: DAL calls run in Starlette's threadpool, like the old sync `def` routes did."""
+    async def run(fn: Callable[[Session], T]) -> T:
+        return await run_in_threadpool(fn, db)
+    return run
+
+
+async def get_async_session_runner(db: AsyncSession = Depends(get_async_db)) -> SessionRunner:
+    """Async stack: DAL calls run via `AsyncSession.run_sync`, so all IO is awaited on the event loop."""
+    return db.run_sync
@@ -0,0 +1,168 @@
+# Portable SQL functions the dialects spell differently.
+
+import re
+
+from sqlalchemy import Boolean, Date, DateTime, Float, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# pg_trgm's default pg_trgm.word_similarity_threshold, used by the <% operator
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+
+class month_start(FunctionElement):
+    """First day of the month of a timestamp, as a DATE."""
+    type = Date()
+    name = "month_start"
+    inherit_cache = True
+
+
+@compiles(month_start)
+def _month_start_default(element, compiler, **kw):
+    return f"CAST(date_trunc('month', {compiler.process(element.clauses, **kw)}) AS DATE)"
+
+
+@compiles(month_start, "sqlite")
+def _month_start_sqlite(element, compiler, **kw):
+    return f"date({compiler.process(element.clauses, **kw)}, 'start of month')"
+
+
+class comparable_timestamp(FunctionElement):
+    """
+    A timestamp in a form that compares correctly with bound datetimes. SQLite keeps
+    timestamps as text and server-generated CURRENT_TIMESTAMP has no fractional part,
+    so '12:00:00' sorts before a bound '12:00:00.000000'; compare julian days there.
+    """
+    type = DateTime()
+    name = "comparable_timestamp"
+    inherit_cache = True
+
+
+@compiles(comparable_timestamp)
+def _comparable_timestamp_default(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(comparable_timestamp, "sqlite")
+def _comparable_timestamp_sqlite(element, compiler, **kw):
+    return f"julianday({compiler.process(element.clauses, **kw)})"
+
+
+class greatest(FunctionElement):
+    """Largest of its arguments (SQLite spells the scalar form max())."""
+    type = Float()
+    name = "greatest"
+    inherit_cache = True
+
+
+@compiles(greatest)
+def _greatest_default(element, compiler, **kw):
+    return f"greatest({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(greatest, "sqlite")
+def _greatest_sqlite(element, compiler, **kw):
+    return f"max({compiler.process(element.clauses, **kw)})"
+
+
+class days_since(FunctionElement):
+    """Fractional days between a timestamp and now."""
+    type = Float()
+    name = "days_since"
+    inherit_cache = True
+
+
+@compiles(days_since)
+def _days_since_default(element, compiler, **kw):
+    return f"(EXTRACT(EPOCH FROM (now() - {compiler.process(element.clauses, **kw)})) / 86400)"
+
+
+@compiles(days_since, "sqlite")
+def _days_since_sqlite(element, compiler, **kw):
+    return f"(julianday('now') - julianday({compiler.process(element.clauses, **kw)}))"
+
+
+class word_match(FunctionElement):
+    """
+    `word_match(query, text)`: pg_trgm's `query <% text`, true when the word similarity of
+    `query` to some part of `text` reaches the threshold. Index-assisted by gin_trgm_ops.
+    """
+    type = Boolean()
+    name = "word_match"
+    inherit_cache = True
+
+
+@compiles(word_match)
+def _word_match_default(element, compiler, **kw):
+    query, text = (compiler.process(clause, **kw) for clause in element.clauses)
+    # a literal % must be doubled for drivers with format/pyformat parameters (psycopg2), not for asyncpg
+    operator = "<%%" if compiler.dialect.paramstyle in ("format", "pyformat") else "<%"
+    # <% binds like ||: parenthesize the text so a concatenation stays one operand
+    return f"({query} {operator} ({text}))"
+
+
+@compiles(word_match, "sqlite")
+def _word_match_sqlite(element, compiler, **kw):
+    query, text = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"(word_similarity({query}, {text}) >= {WORD_SIMILARITY_THRESHOLD})"
+
+
+# pg_trgm's similarity functions, for SQLite (dev and tests), registered on every new connection
+
+def _word_trigrams(text: str) -> list[str]:
+    """pg_trgm trigrams in text order: per lowercased alphanumeric word, padded '  word '."""
+    trigrams = []
+    for word in re.findall(r"[^\W_]+", text.lower()):
+        padded = f"  {word} "
+        trigrams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+def trigram_similarity(a: str | None, b: str | None) -> float:
+    """pg_trgm similarity(): shared trigrams over all trigrams of both strings."""
+    if a is None or b is None:
+        return None
+    left, right = set(_word_trigrams(a)), set(_word_trigrams(b))
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def trigram_word_similarity(query: str | None, text: str | None) -> float:
+    """
+    pg_trgm word_similarity(): the best similarity between the trigrams of `query` and any
+    continuous extent of the ordered trigrams of `text`.
+    """
+    if query is None or text is None:
+        return None
+    wanted = set(_word_trigrams(query))
+    ordered = _word_trigrams(text)
+    if not wanted or not ordered:
+        return 0.0
+    best = 0.0
+    for start, trigram in enumerate(ordered):
+        # an extent that starts (or ends) on a trigram the query lacks only scores lower
+        if trigram not in wanted:
+            continue
+        seen, shared, extra = set(), 0, 0
+        for trigram in ordered[start:]:
+            if trigram not in seen:
+                seen.add(trigram)
+                if trigram in wanted:
+                    shared += 1
+                    best = max(best, shared / (len(wanted) + extra))
+                else:
+                    extra += 1
+        if best == 1.0:
+            break
+    return best
+
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_functions(dbapi_connection, connection_record):
+    # sqlite3 and aiosqlite connections; Postgres drivers have no create_function
+    create_function = getattr(dbapi_connection, "create_function", None)
+    if create_function is not None:
+        create_function("similarity", 2, trigram_similarity, deterministic=True)
+        create_function("word_similarity", 2, trigram_word_similarity, deterministic=True)
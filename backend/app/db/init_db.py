@@ -1,6 +0,0 @@
-import app.models as _models
-from app.db.base import Base
-from app.db.session import engine
-
-def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
@@ -0,0 +1,50 @@
+# Transaction-scoped advisory locks that serialize the summary-table refreshes per product.
+
+from collections.abc import Iterable
+
+from sqlalchemy import bindparam, event, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from sqlalchemy.types import Integer
+
+# first key of the two-key pg_advisory_xact_lock(int, int) form, so these locks can't collide
+# with single-bigint advisory locks taken elsewhere
+SUMMARY_LOCK_NAMESPACE = 1
+
+# sorted ids, locked in array order: two transactions locking overlapping sets can't deadlock
+_LOCK_PRODUCTS = text(
+    "SELECT pg_advisory_xact_lock(:namespace, product_id) FROM unnest(:product_ids) AS product_id"
+).bindparams(bindparam("product_ids", type_=ARRAY(Integer)))
+
+# Session.info key: product ids already locked in the session's current transaction
+_HELD = "locked_product_ids"
+
+
+def lock_products(db: Session, product_ids: Iterable[int]) -> None:
+    """
+    Hold a lock on each of `product_ids` until the session's transaction ends.
+
+    product_stock and waste_rollups are rebuilt from a product's batches with DELETE then
+    INSERT ... SELECT. Without the lock, two READ COMMITTED transactions refreshing the same
+    product both insert (unique_violation on the second) or the later one writes aggregates
+    computed without the other's batch. Waiting here means the refresh's next statement sees
+    everything the previous holder committed.
+
+    One statement for the ids not already held in this transaction, none for the rest.
+    A no-op off Postgres: SQLite lets one writer in at a time anyway.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    held: set[int] = db.info.setdefault(_HELD, set())
+    product_ids = sorted(set(product_ids) - held)
+    if not product_ids:
+        return
+    db.execute(_LOCK_PRODUCTS, {"namespace": SUMMARY_LOCK_NAMESPACE, "product_ids": product_ids})
+    held.update(product_ids)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_locks(session, transaction):
+    # Postgres releases them at commit/rollback; after a savepoint ends locking again is
+    # harmless (the lock is re-entrant), so forget on every transaction end
+    session.info.pop(_HELD, None)
@@ -0,0 +1,238 @@
+# Connection pool configuration + instrumentation shared by the sync and async engines.
+
+import threading
+import time
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DisconnectionError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.config import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_PRE_PING_IDLE_SECONDS,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_STATEMENT_TIMEOUT_MS,
+)
+from app.core.metrics import histogram_lines, registry, sample_lines
+
+# upper bounds (seconds) for the checkout wait histogram
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+
+class PoolMetrics:
+    """Counters for one engine's pool; updated from pool events and the checkout path."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.pings = 0
+        self.ping_failures = 0
+        self.peak_in_use = 0
+        self.peak_overflow = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_bucket_counts = [0] * len(WAIT_BUCKETS)
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_bucket_counts[i] += 1
+                    break
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def observe_usage(self, in_use: int, overflow: int) -> None:
+        with self._lock:
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        with self._lock:
+            waits = sum(self.wait_bucket_counts)
+            stats = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "pings": self.pings,
+                "ping_failures": self.ping_failures,
+                "peak_in_use": self.peak_in_use,
+                "peak_overflow": self.peak_overflow,
+                "checkout_wait_seconds": {
+                    "count": waits,
+                    "total": round(self.wait_seconds_total, 6),
+                    "avg": round(self.wait_seconds_total / waits, 6) if waits else 0.0,
+                    "max": round(self.wait_seconds_max, 6),
+                    "buckets": {
+                        ("+Inf" if bound == float("inf") else str(bound)): count
+                        for bound, count in zip(WAIT_BUCKETS, self.wait_bucket_counts)
+                    },
+                },
+            }
+        # live values straight from the pool (QueuePool only)
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "pool_size": pool.size(),
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": DB_MAX_OVERFLOW,
+            })
+        return stats
+
+
+class _InstrumentedPoolMixin:
+    """Times `_do_get` (the wait for a free connection, or for a new one to connect) and counts timeouts."""
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.incr("timeouts")
+            raise
+        finally:
+            self.metrics.observe_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting into the same metrics
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# engine name -> (engine, metrics)
+_registry: dict[str, tuple[Engine, PoolMetrics]] = {}
+
+
+def engine_options(url: str, *, is_async: bool = False) -> dict[str, Any]:
+    """Return `create_engine` / `create_async_engine` kwargs for the pool configured via env."""
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        # local dev/tests: keep SQLAlchemy's sqlite defaults (single-connection pools)
+        return {"pool_pre_ping": DB_POOL_PRE_PING == "always"}
+
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": DB_POOL_PRE_PING == "always",
+    }
+    if DB_STATEMENT_TIMEOUT_MS > 0 and backend == "postgresql":
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def _ping(dbapi_connection) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    finally:
+        cursor.close()
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """Attach pool event hooks to `engine` (a sync Engine, or `AsyncEngine.sync_engine`)."""
+    pool = engine.pool
+    metrics = getattr(pool, "metrics", None) or PoolMetrics()
+    pool.metrics = metrics
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        last_checkin = connection_record.info.get("last_checkin")
+        if (
+            DB_POOL_PRE_PING == "idle"
+            and last_checkin is not None
+            and time.monotonic() - last_checkin > DB_POOL_PRE_PING_IDLE_SECONDS
+        ):
+            metrics.incr("pings")
+            try:
+                _ping(dbapi_connection)
+            except Exception as e:
+                metrics.incr("ping_failures")
+                # the pool discards this connection and retries the checkout with a fresh one
+                raise DisconnectionError("Idle connection failed pre-ping") from e
+
+        metrics.incr("checkouts")
+        # engine.pool rather than a captured pool: dispose() swaps the pool but keeps these listeners
+        if isinstance(engine.pool, QueuePool):
+            metrics.observe_usage(engine.pool.checkedout(), engine.pool.overflow())
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.incr("checkins")
+        connection_record.info["last_checkin"] = time.monotonic()
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+    _registry[name] = (engine, metrics)
+    return metrics
+
+
+def pool_stats() -> dict[str, dict[str, Any]]:
+    """Point-in-time stats for every instrumented engine, keyed by engine name."""
+    return {name: metrics.snapshot(engine.pool) for name, (engine, metrics) in _registry.items()}
+
+
+# stats key -> (metric name, type, help) for the per-engine values /metrics exports
+_EXPORTED = {
+    "connects": ("db_pool_connects_total", "counter", "New DBAPI connections opened."),
+    "checkouts": ("db_pool_checkouts_total", "counter", "Connections checked out of the pool."),
+    "invalidations": ("db_pool_invalidations_total", "counter", "Connections discarded as broken."),
+    "timeouts": ("db_pool_timeouts_total", "counter", "Checkouts that gave up after DB_POOL_TIMEOUT_SECONDS."),
+    "ping_failures": ("db_pool_ping_failures_total", "counter", "Idle connections that failed their pre-ping."),
+    "pool_size": ("db_pool_size", "gauge", "Persistent connections the pool keeps."),
+    "in_use": ("db_pool_in_use", "gauge", "Connections currently checked out."),
+    "idle": ("db_pool_idle", "gauge", "Connections idle in the pool."),
+    "overflow": ("db_pool_overflow", "gauge", "Connections open above the pool size."),
+}
+
+
+def collect_metrics() -> Iterator[str]:
+    """/metrics collector for every instrumented engine, labelled by engine name."""
+    stats = pool_stats()
+    for key, (name, kind, documentation) in _EXPORTED.items():
+        yield from sample_lines(name, documentation, kind, (
+            ({"engine": engine}, engine_stats[key]) for engine, engine_stats in stats.items() if key in engine_stats
+        ))
+    waits = {engine: engine_stats["checkout_wait_seconds"] for engine, engine_stats in stats.items()}
+    yield from histogram_lines("db_pool_checkout_wait_seconds", "Time waiting for a connection from the pool.", (
+        ({"engine": engine}, WAIT_BUCKETS, wait["buckets"].values(), wait["total"]) for engine, wait in waits.items()
+    ))
+
+
+registry.add_collector(collect_metrics)
@@ -0,0 +1,98 @@
+# Per-request SQL accounting: statement count, DB time and repeated statement shapes (N+1s).
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# a parenthesized list of bound parameters in any driver's paramstyle: (?, ?), (%(id_1)s, ...), ($1, $2)
+_PARAM = r"\s*(?:\?|%\(\w+\)s|%s|\$\d+)\s*"
+_PARAM_LIST = re.compile(rf"\({_PARAM}(?:,{_PARAM})*\)")
+_REPEATED_LISTS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    `statement` with whitespace normalized and every bound parameter list collapsed to `(?)`,
+    so the same query with a different number of IN values or VALUES rows has one shape.
+    """
+    shape = _PARAM_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+    return _REPEATED_LISTS.sub("(?), ...", shape)
+
+
+class QueryStats:
+    """
+    Statements run while this is the current tracker (see `track_queries`).
+
+    A request's statements run one at a time (its session holds one connection),
+    so the counters are updated without a lock.
+
+    `record` only counts the raw statement text (a repeated query's text comes from the
+    engine's compiled cache, so this is one dict update); shapes are worked out in `repeated`.
+    """
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Shapes that ran more than `threshold` times, most frequent first.
+
+        Nothing is normalized for a request within `threshold` statements in total (most of
+        them); otherwise each distinct statement is, once.
+        """
+        if self.count <= threshold:
+            return []
+        shapes: Counter[str] = Counter()
+        for statement, count in self.statements.items():
+            shapes[statement_shape(statement)] += count
+        return [(shape, count) for shape, count in shapes.most_common() if count > threshold]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Record every statement run in this context into a fresh QueryStats.
+
+    The tracker is a ContextVar, so it follows the request into threadpool DAL calls
+    (which copy the context) and `AsyncSession.run_sync`; statements of other requests
+    running at the same time are not counted.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+# registered on the Engine class, so every engine (sync, the async engine's sync_engine,
+# test engines) reports; outside track_queries() each statement costs one ContextVar lookup
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info["query_started_at"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    started_at = conn.info.pop("query_started_at", None)
+    stats.record(statement, time.perf_counter() - started_at if started_at is not None else 0.0)
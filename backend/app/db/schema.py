@@ -0,0 +1,48 @@
+# Startup schema check. The schema is created and changed only by the Alembic migrations in
+# backend/migrations (`python -m app.commands.migrate upgrade`, run as a deploy step); at boot the app just
+# confirms the database is at the revision this build expects - one primary-key read, where
+# create_all reflected every table on every container start.
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.core.exceptions import SchemaRevisionError
+
+logger = logging.getLogger(__name__)
+
+# head of migrations/versions; tests/test_migrations.py fails until a new migration updates it
+SCHEMA_REVISION = "0002"
+# the schema the old startup create_all built; such databases are stamped here before upgrading
+INITIAL_REVISION = "0001"
+
+
+def current_revision(engine: Engine) -> str | None:
+    """The revision recorded in alembic_version, or None for a database never migrated."""
+    with engine.connect() as connection:
+        try:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except DBAPIError:
+            # no alembic_version table (connection failures raise from connect() above)
+            return None
+
+
+def check_schema_revision(engine: Engine, mode: str) -> str | None:
+    """
+    Compare the database's revision with SCHEMA_REVISION according to DB_SCHEMA_CHECK `mode`:
+    raise SchemaRevisionError ("require"), log a warning ("warn") or skip the query ("off").
+    """
+    if mode == "off":
+        return None
+    revision = current_revision(engine)
+    if revision != SCHEMA_REVISION:
+        message = (
+            f"Database schema is at revision {revision or '(none)'} but this build expects "
+            f"{SCHEMA_REVISION}; run `python -m app.commands.migrate upgrade`"
+        )
+        if mode == "require":
+            raise SchemaRevisionError(message)
+        logger.warning(message)
+    return revision
@@ -1,10 +1,43 @@
 # This creates the SQLAlchemy engine + DB sessions.
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.core.config import DATABASE_URL
+from app.core.config import ASYNC_DATABASE_URL, DATABASE_URL, DB_MODE
+from app.db.pool import engine_options, instrument_engine
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True) #Manages DB connections & pooling
+# sync driver -> async driver for the same backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Return `url` with its driver swapped for the async equivalent (e.g. psycopg2 -> asyncpg)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver configured for database backend '{backend}'. Set ASYNC_DATABASE_URL.")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# Manages DB connections & pooling; sizing/pre-ping/statement_timeout come from env (see app.db.pool)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+instrument_engine(engine, "sync")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) #Manages transactions & ORM state per request
+
+# the async stack is only built when selected so the sync deployment doesn't need asyncpg
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+if DB_MODE == "async":
+    _async_url = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+    async_engine = create_async_engine(_async_url, **engine_options(_async_url, is_async=True))
+    instrument_engine(async_engine.sync_engine, "async")
+    # expire_on_commit=False: attribute access after commit would need implicit (sync) IO
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
@@ -0,0 +1,70 @@
+# Startup warm-up, run before the app reports ready (GET /health/ready): opens the pool's
+# connections and runs each hot read path once, so the first requests after a deploy don't pay
+# for TCP/TLS/auth handshakes, mapper configuration and SQL compilation.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import get_args
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session, configure_mappers
+
+from app.core.config import LIST_READ_MODE
+from app.data_access.category_dal import CategoryDAL
+from app.data_access.collection_version_dal import Collection, CollectionVersionDAL
+from app.data_access.grocery_run_dal import GroceryRunDAL
+from app.data_access.inventory_batch_dal import InventoryBatchDAL
+from app.data_access.product_dal import ProductDAL
+from app.data_access.product_stock_dal import ProductStockDAL
+from app.data_access.user_dal import UserDAL
+
+# the hot queries run for a user that cannot exist: same SQL, no rows
+NO_USER_ID = 0
+
+
+def _warm_count(pool, connections: int) -> int:
+    # never ask for more than the pool keeps; extra checkouts would only be discarded as overflow
+    size = pool.size() if hasattr(pool, "size") else 1
+    return max(0, min(connections, size))
+
+
+def warm_pool(engine: Engine, connections: int) -> int:
+    """Open up to `connections` pooled connections concurrently and check them back in."""
+    count = _warm_count(engine.pool, connections)
+    if not count:
+        return 0
+    with ThreadPoolExecutor(max_workers=count, thread_name_prefix="pool-warmup") as executor:
+        opened = list(executor.map(lambda _: engine.connect(), range(count)))
+    for connection in opened:
+        connection.close()
+    return count
+
+
+async def warm_async_pool(engine: AsyncEngine, connections: int) -> int:
+    """`warm_pool` for the async engine."""
+    count = _warm_count(engine.sync_engine.pool, connections)
+    if not count:
+        return 0
+    opened = await asyncio.gather(*(engine.connect().start() for _ in range(count)))
+    for connection in opened:
+        await connection.close()
+    return count
+
+
+def warm_statements(db: Session) -> None:
+    """
+    Configure the mappers and run the auth, conditional-GET and list queries once, filling the
+    engine's compiled-statement cache. Loads the categories snapshot as well. Read-only.
+    """
+    configure_mappers()
+    as_rows = LIST_READ_MODE == "rows"
+    UserDAL(db).get_identity_by_firebase_uid("")
+    for collection in get_args(Collection):
+        CollectionVersionDAL(db).get(user_id=NO_USER_ID, collection=collection)
+    ProductDAL(db).get_all_by_user_id(user_id=NO_USER_ID, as_rows=as_rows)
+    GroceryRunDAL(db).get_all_by_user_id(user_id=NO_USER_ID, as_rows=as_rows)
+    InventoryBatchDAL(db).get_all_by_user_id(user_id=NO_USER_ID, as_rows=as_rows)
+    ProductStockDAL(db).get_all_by_user_id(user_id=NO_USER_ID)
+    CategoryDAL(db).get_snapshot()
+    db.rollback()
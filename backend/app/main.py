@@ -1,23 +1,34 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 
+from app.api.middleware import QueryStatsMiddleware, RequestMetricsMiddleware
 from app.api.public_router import public_api_router
 from app.api.protected_router import private_api_router
-from app.db.init_db import init_db
-
-from app.auth.firebase import init_firebase
-from google.auth.exceptions import DefaultCredentialsError
+from app.auth.firebase import get_firebase_app
+from app.core.config import (
+    DB_MODE,
+    DB_POOL_WARM_CONNECTIONS,
+    DB_SCHEMA_CHECK,
+    FIREBASE_INIT_ON_STARTUP,
+    SQL_QUERY_STATS,
+)
+from app.core.readiness import readiness
+from app.db import session
+from app.db.schema import check_schema_revision
+from app.db.warmup import warm_async_pool, warm_pool, warm_statements
 
 logger = logging.getLogger(__name__)
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # --- app startup ---
+
+def start_firebase() -> None:
+    from google.auth.exceptions import DefaultCredentialsError
+
     try:
-        init_firebase()
+        get_firebase_app()
     except DefaultCredentialsError as e:
         logger.exception(
             "Firebase init failed: Application Default Credentials not found. "
@@ -28,12 +39,51 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.exception("Firebase init failed during startup.")
         raise RuntimeError("Firebase initialization failed; see logs for details.") from e
-    # TEMP for learning (later use Alembic)
-    init_db()
+
+
+async def warm_up() -> None:
+    """Fill the connection pool and the compiled-statement cache, then report ready."""
+    try:
+        with readiness.step("pool") as details:
+            if DB_MODE == "async":
+                details["connections"] = await warm_async_pool(session.async_engine, DB_POOL_WARM_CONNECTIONS)
+            else:
+                details["connections"] = await asyncio.to_thread(warm_pool, session.engine, DB_POOL_WARM_CONNECTIONS)
+        with readiness.step("statements"):
+            if DB_MODE == "async":
+                async with session.AsyncSessionLocal() as db:
+                    await db.run_sync(warm_statements)
+            else:
+                def run_statements():
+                    with session.SessionLocal() as db:
+                        warm_statements(db)
+                await asyncio.to_thread(run_statements)
+    except Exception:
+        # warm-up only saves the first requests some work; serve without it
+        logger.exception("Startup warm-up failed; continuing cold")
+    readiness.mark_ready()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # --- app startup ---
+    readiness.reset()
+    # constant-time check that migrations ran; the app never creates or alters tables itself
+    with readiness.step("schema") as details:
+        details["revision"] = await asyncio.to_thread(check_schema_revision, session.engine, DB_SCHEMA_CHECK)
+    if FIREBASE_INIT_ON_STARTUP:
+        with readiness.step("firebase"):
+            await asyncio.to_thread(start_firebase)
+    # liveness (GET /health/) is served from here on; readiness once warm-up is done
+    warm_up_task = asyncio.create_task(warm_up())
     yield
     # --- app teardown ---
+    warm_up_task.cancel()
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(RequestMetricsMiddleware)
+if SQL_QUERY_STATS != "off":
+    app.add_middleware(QueryStatsMiddleware)
 
 
 # TODO: add env variable to turn on if PRODUCTION?
@@ -1,5 +1,11 @@
+from .catalog_product import CatalogProduct
 from .category import Category
+from .category_version import CategoryVersion
+from .collection_version import CollectionVersion
 from .grocery_run import GroceryRun
 from .inventory_batch import InventoryBatch
 from .product import Product
-from .user import User
\ No newline at end of file
+from .product_stock import ProductStock
+from .sync_tombstone import SyncTombstone
+from .user import User
+from .waste_rollup import WasteRollup
\ No newline at end of file
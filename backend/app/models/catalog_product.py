@@ -0,0 +1,35 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+)
+
+from app.db.base import Base
+
+
+class CatalogProduct(Base):
+    """
+    One product from the OpenFoodFacts dump, reduced to the fields the add-item form uses.
+
+    Shared by all users and read-only to the API; filled by
+    `python -m app.commands.barcode_catalog import DUMP`.
+    """
+    __tablename__ = "catalog_products"
+
+    # normalized with app.services.barcode_catalog.normalize_barcode
+    barcode = Column(String, primary_key=True)
+    name = Column(String, nullable=False)
+    # first of OFF's comma-separated brands
+    brand = Column(String, nullable=True)
+    quantity = Column(String, nullable=True)
+    serving_size = Column(String, nullable=True)
+    pnns_groups_1 = Column(String, nullable=True)
+    pnns_groups_2 = Column(String, nullable=True)
+    # OFF tag lists stored comma-joined (tags are slugs and never contain commas)
+    categories_tags = Column(Text, nullable=True)
+    packaging = Column(String, nullable=True)
+    packaging_tags = Column(Text, nullable=True)
+    image_url = Column(String, nullable=True)
+    # OFF's last_modified_t; re-imports never overwrite a row with older data
+    last_modified_t = Column(Integer, nullable=True)
@@ -12,4 +12,5 @@ class Category(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
-    products = relationship("Product", back_populates="category")
+    # passive_deletes: products.category_id is ON DELETE SET NULL in the database
+    products = relationship("Product", back_populates="category", lazy="raise", passive_deletes=True)
@@ -0,0 +1,59 @@
+from sqlalchemy import DDL, BigInteger, Column, Integer, event
+
+from app.db.base import Base
+
+
+class CategoryVersion(Base):
+    """
+    Change counter for the global categories table: one row, bumped by a database trigger on
+    every INSERT, UPDATE or DELETE of categories (they are maintained outside this API).
+
+    The bump is an UPDATE of this row in the writing transaction, so concurrent writers queue
+    on its row lock and every commit leaves a new version, visible together with the change.
+    """
+    __tablename__ = "category_versions"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+
+
+# the single row, then the triggers; categories sorts (and so is created) before this table
+event.listen(
+    CategoryVersion.__table__,
+    "after_create",
+    DDL("INSERT INTO category_versions (id, version) VALUES (1, 0)"),
+)
+event.listen(
+    CategoryVersion.__table__,
+    "after_create",
+    DDL(
+        "CREATE OR REPLACE FUNCTION bump_category_version() RETURNS trigger LANGUAGE plpgsql AS $$ "
+        "BEGIN UPDATE category_versions SET version = version + 1; RETURN NULL; END $$"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    CategoryVersion.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER bump_category_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON categories "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_category_version()"
+    ).execute_if(dialect="postgresql"),
+)
+# SQLite has row-level triggers only, one per event
+for _operation in ("insert", "update", "delete"):
+    event.listen(
+        CategoryVersion.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER bump_category_version_{_operation} AFTER {_operation.upper()} ON categories "
+            "BEGIN UPDATE category_versions SET version = version + 1; END"
+        ).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    CategoryVersion.__table__,
+    "after_drop",
+    DDL(
+        "DROP TRIGGER IF EXISTS bump_category_version ON categories; "
+        "DROP FUNCTION IF EXISTS bump_category_version()"
+    ).execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,26 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    BigInteger,
+    String,
+    ForeignKey,
+    DateTime,
+    func,
+)
+
+from app.db.base import Base
+
+
+class CollectionVersion(Base):
+    """
+    Per-user change counter for one API collection ("products", "grocery_runs", "inventory_batches").
+
+    Bumped by the DAL write paths in the same transaction as the write, so a conditional GET
+    can compare versions (see `app.api.deps.conditional_get`) without running the list query.
+    """
+    __tablename__ = "collection_versions"
+
+    user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    collection = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
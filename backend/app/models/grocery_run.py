@@ -11,7 +11,7 @@ from sqlalchemy import (
     Numeric,
     Index,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import query_expression, relationship
 
 from app.db.base import Base
 
@@ -30,17 +30,29 @@ class GroceryRun(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
-    user = relationship("User", back_populates="grocery_runs")
+    # every relationship is lazy="raise": anything serialized must be loaded explicitly by the DAL
+    # (an implicit lazy load is an N+1, and impossible on the async stack outside the DAL call)
+    user = relationship("User", back_populates="grocery_runs", lazy="raise")
     # should this delete-orphan? I guess so? and we rely on user to archive if they
     # want to keep around for stats, otherwise they hard delete?
+    # passive_deletes: the ON DELETE CASCADE foreign key removes the batches
     inventory_batches = relationship(
         "InventoryBatch",
         back_populates="grocery_run",
         cascade="all, delete-orphan", 
+        lazy="raise",
+        passive_deletes=True,
     )
 
+    # batch summary, only populated by queries that ask for it (see GroceryRunDAL)
+    batch_count = query_expression()
+    open_batch_count = query_expression()
+    next_expiry_at = query_expression()
+
     __table_args__ = (
         Index("ix_grocery_runs_user_id", "user_id"),
         Index("ix_grocery_runs_user_trip_date", "user_id", "trip_date"),
         Index("ix_grocery_runs_user_archived", "user_id", "archived"),
+        # /sync/changes reads a user's rows in (updated_at, id) order
+        Index("ix_grocery_runs_user_updated", "user_id", "updated_at", "id"),
     )
@@ -46,8 +46,8 @@ class InventoryBatch(Base):
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    grocery_run = relationship("GroceryRun", back_populates="inventory_batches")
-    product = relationship("Product", back_populates="inventory_batches")
+    grocery_run = relationship("GroceryRun", back_populates="inventory_batches", lazy="raise")
+    product = relationship("Product", back_populates="inventory_batches", lazy="raise")
 
     # TODO: need to add generic error handling for these constraint violations
     # before adding them at the DB level like this
@@ -63,5 +63,26 @@ class InventoryBatch(Base):
 
         Index("ix_batches_run_completed", "grocery_run_id", "completed_at"),
         Index("ix_batches_expired_at", "expired_at"),
+        # expiring-soon lookups (per grocery run of the user) only ever touch open batches,
+        # so completed history stays out of this index however large it grows
+        Index(
+            "ix_batches_open_run_expiry",
+            "grocery_run_id",
+            "expired_at",
+            postgresql_where=(completed_at.is_(None)),
+            sqlite_where=(completed_at.is_(None)),
+        ),
+        # recomputing one product_stock row reads the open batches of one (product, location)
+        Index(
+            "ix_batches_open_product_location",
+            "product_id",
+            "storage_location",
+            postgresql_where=(completed_at.is_(None)),
+            sqlite_where=(completed_at.is_(None)),
+        ),
         Index("ix_batches_product_id", "product_id"),
+        # recomputing one waste_rollups row reads one product's batches added in one month
+        Index("ix_batches_product_added_at", "product_id", "added_at"),
+        # /sync/changes: batches have no user_id, so changes are found per grocery run of the user
+        Index("ix_batches_run_updated", "grocery_run_id", "updated_at", "id"),
     )
@@ -1,4 +1,5 @@
 from sqlalchemy import (
+    DDL,
     Column,
     Integer,
     String,
@@ -8,6 +9,8 @@ from sqlalchemy import (
     Enum,
     Numeric,
     Index,
+    event,
+    literal_column,
 )
 from sqlalchemy.orm import relationship
 
@@ -41,13 +44,21 @@ class Product(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
-    user = relationship("User", back_populates="products")
-    category = relationship("Category", back_populates="products")
-    inventory_batches = relationship("InventoryBatch", back_populates="product")
+    user = relationship("User", back_populates="products", lazy="raise")
+    category = relationship("Category", back_populates="products", lazy="raise")
+    # passive_deletes="all": leave batches alone and let the RESTRICT foreign key reject the delete
+    inventory_batches = relationship(
+        "InventoryBatch", back_populates="product", lazy="raise", passive_deletes="all"
+    )
 
     __table_args__ = (
         Index("ix_products_user_id", "user_id"),
+        # keyset pagination of the product list (name asc, id asc)
+        Index("ix_products_user_name", "user_id", "name"),
         Index("ix_products_user_category", "user_id", "category_id"),
+        # ix_products_user_search_trgm (Postgres only) is defined below the class
+        # /sync/changes reads a user's rows in (updated_at, id) order
+        Index("ix_products_user_updated", "user_id", "updated_at", "id"),
         # barcode should be unique per user
         # only enforced when the barcode is present
         # TODO: need to add handler for unique constraint violation
@@ -60,3 +71,28 @@ class Product(Base):
             postgresql_where=(barcode.isnot(None)),
         ),
     )
+
+
+def search_text(name, brand):
+    """What /products/search matches against; the trigram index is built on this exact expression."""
+    # literal SQL rather than bound parameters, so queries repeat the indexed expression verbatim
+    return name.op("||")(literal_column("' '")).op("||")(func.coalesce(brand, literal_column("''")))
+
+
+# /products/search: ILIKE '%q%' and word-similarity (<%) lookups within one user's products.
+# GIN over (user_id, trigrams); btree_gin provides the integer operator class
+Index(
+    "ix_products_user_search_trgm",
+    Product.user_id,
+    search_text(Product.name, Product.brand).label("search_text"),
+    postgresql_using="gin",
+    postgresql_ops={"search_text": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+# the trigram index needs both extensions before the table is created
+for _extension in ("pg_trgm", "btree_gin"):
+    event.listen(
+        Product.__table__,
+        "before_create",
+        DDL(f"CREATE EXTENSION IF NOT EXISTS {_extension}").execute_if(dialect="postgresql"),
+    )
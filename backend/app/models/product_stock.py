@@ -0,0 +1,47 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    ForeignKey,
+    DateTime,
+    func,
+    Numeric,
+    Enum,
+    Index,
+)
+
+from app.db.base import Base
+from app.models.enums import StorageLocation
+
+
+class ProductStock(Base):
+    """
+    Per-user stock summary: one row per (product, storage_location) with open batches.
+
+    Derived from inventory_batches and kept current by the InventoryBatchDAL write
+    paths (see ProductStockDAL); `python -m app.commands.product_stock` rebuilds/checks it.
+    """
+    __tablename__ = "product_stock"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    storage_location = Column(Enum(StorageLocation, name="storage_location"), nullable=True)
+
+    # sum of quantity_current over the open batches
+    quantity_current = Column(Numeric(12, 2), nullable=False)
+    open_batch_count = Column(Integer, nullable=False)
+    next_expiry_at = Column(DateTime(timezone=True), nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        # batches without a storage_location are one bucket, hence NULLS NOT DISTINCT
+        Index(
+            "ux_product_stock_key",
+            "user_id",
+            "product_id",
+            "storage_location",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
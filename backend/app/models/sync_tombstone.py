@@ -0,0 +1,36 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    ForeignKey,
+    DateTime,
+    func,
+    Index,
+)
+
+from app.db.base import Base
+
+
+class SyncTombstone(Base):
+    """
+    Record of a deleted row, so /sync/changes can tell devices to drop it.
+
+    Written by the DAL delete paths (including batches removed with their grocery run);
+    pruned after SYNC_TOMBSTONE_RETENTION_DAYS by `python -m app.commands.sync_tombstones prune`.
+    """
+    __tablename__ = "sync_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
+    # "products", "grocery_runs" or "inventory_batches"
+    collection = Column(String, nullable=False)
+    # id of the deleted row in that collection
+    row_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # /sync/changes reads a user's tombstones in (deleted_at, id) order
+        Index("ix_sync_tombstones_user_deleted", "user_id", "deleted_at", "id"),
+        # pruning by age
+        Index("ix_sync_tombstones_deleted_at", "deleted_at"),
+    )
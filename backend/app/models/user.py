@@ -15,5 +15,10 @@ class User(Base):
     updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    products = relationship("Product", back_populates="user", cascade="all, delete-orphan")
-    grocery_runs = relationship("GroceryRun", back_populates="user", cascade="all, delete-orphan")
+    # passive_deletes: both foreign keys are ON DELETE CASCADE (see UserDAL.delete_user for ordering)
+    products = relationship(
+        "Product", back_populates="user", cascade="all, delete-orphan", lazy="raise", passive_deletes=True
+    )
+    grocery_runs = relationship(
+        "GroceryRun", back_populates="user", cascade="all, delete-orphan", lazy="raise", passive_deletes=True
+    )
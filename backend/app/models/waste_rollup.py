@@ -0,0 +1,42 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    ForeignKey,
+    Date,
+    DateTime,
+    func,
+    Numeric,
+    Index,
+)
+
+from app.db.base import Base
+
+
+class WasteRollup(Base):
+    """
+    Monthly consumption/waste totals per product, attributed to the month a batch was added.
+
+    Derived from inventory_batches and kept current by the InventoryBatchDAL write paths
+    (see WasteRollupDAL); `python -m app.commands.waste_rollups backfill` builds it from history.
+    """
+    __tablename__ = "waste_rollups"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    # first day of the month
+    month = Column(Date, nullable=False)
+
+    batch_count = Column(Integer, nullable=False)
+    quantity_added = Column(Numeric(12, 2), nullable=False)
+    quantity_used = Column(Numeric(12, 2), nullable=False)
+    quantity_spoiled = Column(Numeric(12, 2), nullable=False)
+    quantity_disposed = Column(Numeric(12, 2), nullable=False)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ux_waste_rollups_product_month", "product_id", "month", unique=True),
+        # reports scan one user's months
+        Index("ix_waste_rollups_user_month", "user_id", "month"),
+    )
@@ -0,0 +1,32 @@
+from typing import Literal
+from pydantic import BaseModel, ConfigDict, field_validator
+
+
+class CatalogEntryRead(BaseModel):
+    # "catalog": the shared OpenFoodFacts catalog; "product": the caller's own product with this barcode
+    source: Literal["catalog", "product"] = "catalog"
+    # set when source == "product"
+    product_id: int | None = None
+
+    barcode: str
+    name: str
+    brand: str | None = None
+    quantity: str | None = None
+    serving_size: str | None = None
+    # OpenFoodFacts fields, as the add-item form maps them to a category, storage and unit
+    pnns_groups_1: str | None = None
+    pnns_groups_2: str | None = None
+    categories_tags: list[str] = []
+    packaging: str | None = None
+    packaging_tags: list[str] = []
+    image_url: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("categories_tags", "packaging_tags", mode="before")
+    @classmethod
+    def split_tags(cls, value: str | list[str] | None) -> list[str]:
+        # stored comma-joined in catalog_products
+        if value is None:
+            return []
+        return value.split(",") if isinstance(value, str) else value
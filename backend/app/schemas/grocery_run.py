@@ -1,8 +1,14 @@
 from datetime import date, datetime
 from decimal import Decimal
-from pydantic import BaseModel, ConfigDict
+from typing import Any, Literal
+from pydantic import BaseModel, ConfigDict, model_validator
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import InstanceState
 from app.schemas.inventory_batch import InventoryBatchRead
 
+# related data a client can ask to embed via ?include=
+GroceryRunInclude = Literal["inventory_batches"]
+
 
 class GroceryRunCreate(BaseModel):
     # user_id will come from auth context
@@ -22,6 +28,14 @@ class GroceryRunUpdate(BaseModel):
     archived: bool | None = None
 
 
+class GroceryRunBatchSummary(BaseModel):
+    batch_count: int
+    # batches not yet fully used/spoiled/disposed
+    open_batch_count: int
+    # earliest expiry among the open batches
+    next_expiry_at: datetime | None = None
+
+
 class GroceryRunRead(BaseModel):
     id: int
     user_id: int
@@ -32,6 +46,33 @@ class GroceryRunRead(BaseModel):
     archived: bool
     created_at: datetime
     updated_at: datetime
-    inventory_batches: list[InventoryBatchRead] = []
+    # only present when requested with include=inventory_batches
+    inventory_batches: list[InventoryBatchRead] | None = None
+    batch_summary: GroceryRunBatchSummary | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def read_loaded_attributes(cls, data: Any) -> Any:
+        """
+        Relationships are lazy="raise", so from an ORM object only read what the
+        DAL actually loaded, and fold the summary expressions into `batch_summary`.
+        """
+        state = sa_inspect(data, raiseerr=False)
+        if not isinstance(state, InstanceState):
+            return data
+        unloaded = {rel.key for rel in state.mapper.relationships if rel.key in state.unloaded}
+        values = {
+            field: getattr(data, field)
+            for field in cls.model_fields
+            if field not in unloaded and hasattr(data, field)
+        }
+        loaded = state.dict
+        if loaded.get("batch_count") is not None:
+            values["batch_summary"] = GroceryRunBatchSummary(
+                batch_count=loaded["batch_count"],
+                open_batch_count=loaded["open_batch_count"],
+                next_expiry_at=loaded["next_expiry_at"],
+            )
+        return values
@@ -1,5 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
+from typing import Literal
 from pydantic import BaseModel, ConfigDict
 from app.models.enums import StorageLocation
 
@@ -47,4 +48,37 @@ class InventoryBatchRead(BaseModel):
     updated_at: datetime
     completed_at: datetime | None = None
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BulkItemError(BaseModel):
+    # position of the failed item in the request list
+    index: int
+    detail: str
+
+
+class InventoryBatchBulkCreateResult(BaseModel):
+    # successfully created batches, in request order (failed items are skipped)
+    created: list[InventoryBatchRead]
+    errors: list[BulkItemError]
+
+
+class InventoryBatchBulkUpdateItem(BaseModel):
+    id: int
+    # "delta" adds to the current quantities (e.g. used +1), "absolute" overwrites them
+    mode: Literal["delta", "absolute"] = "delta"
+    quantity_used: Decimal | None = None
+    quantity_spoiled: Decimal | None = None
+    quantity_disposed: Decimal | None = None
+
+
+class BulkIdError(BaseModel):
+    # id of the batch that was rejected
+    id: int
+    detail: str
+
+
+class InventoryBatchBulkUpdateResult(BaseModel):
+    # updated batches, in request order (rejected ids are skipped)
+    updated: list[InventoryBatchRead]
+    errors: list[BulkIdError]
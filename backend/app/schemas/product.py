@@ -50,4 +50,8 @@ class ProductRead(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class ProductWithCategoryRead(ProductRead):
+    """A product list item; `category_name` is only present with `include_category_name=true`."""
+    category_name: str | None = None
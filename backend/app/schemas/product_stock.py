@@ -0,0 +1,17 @@
+from datetime import datetime
+from decimal import Decimal
+from pydantic import BaseModel, ConfigDict
+from app.models.enums import StorageLocation
+
+
+class ProductStockRead(BaseModel):
+    product_id: int
+    storage_location: StorageLocation | None = None
+
+    quantity_current: Decimal
+    open_batch_count: int
+    next_expiry_at: datetime | None = None
+
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
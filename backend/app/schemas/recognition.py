@@ -0,0 +1,18 @@
+from typing import Any
+from pydantic import BaseModel
+
+
+class RecognitionBatchItem(BaseModel):
+    # position of the image in the request's `images` field
+    index: int
+    filename: str | None = None
+    # per-image HTTP status: 200, or the status the single-image endpoint would have answered
+    status_code: int
+    # {"item", "confidence", "alternatives"} as returned by POST /recognize-item/
+    result: dict[str, Any] | None = None
+    error: str | None = None
+
+
+class RecognitionBatchRead(BaseModel):
+    # one entry per uploaded image, in input order
+    results: list[RecognitionBatchItem]
@@ -0,0 +1,28 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+from app.schemas.grocery_run import GroceryRunRead
+from app.schemas.inventory_batch import InventoryBatchRead
+from app.schemas.product import ProductRead
+
+
+class SyncTombstoneRead(BaseModel):
+    # "products", "grocery_runs" or "inventory_batches"
+    collection: str
+    id: int = Field(validation_alias="row_id")
+    deleted_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SyncChangesRead(BaseModel):
+    # upserts, oldest change first; grocery runs come without batch_summary (derive it from the batches)
+    grocery_runs: list[GroceryRunRead]
+    products: list[ProductRead]
+    inventory_batches: list[InventoryBatchRead]
+    deleted: list[SyncTombstoneRead]
+    # pass back as ?cursor= on the next call
+    cursor: str
+    # more changes are ready right now; call again before waiting
+    has_more: bool
+
+    model_config = ConfigDict(from_attributes=True)
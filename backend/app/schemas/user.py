@@ -15,6 +15,15 @@ class UserUpdate(BaseModel):
     display_name: str | None = None
 
 
+class UserIdentity(BaseModel):
+    """Lightweight identity record cached per firebase_uid; enough to scope DAL queries."""
+    user_id: int
+    email: EmailStr
+    display_name: str | None = None
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
 class UserReadPublic(BaseModel):
     user_id: int
     display_name: str | None = None
@@ -0,0 +1,28 @@
+from datetime import date
+from decimal import Decimal
+from pydantic import BaseModel, ConfigDict, computed_field
+
+
+class WasteReportRow(BaseModel):
+    # grouping columns; only the ones requested via group_by are set
+    month: date | None = None
+    product_id: int | None = None
+    product_name: str | None = None
+    category_id: int | None = None
+    category_name: str | None = None
+
+    batch_count: int
+    quantity_added: Decimal
+    quantity_used: Decimal
+    quantity_spoiled: Decimal
+    quantity_disposed: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @computed_field
+    @property
+    def waste_ratio(self) -> float | None:
+        """(spoiled + disposed) / (used + spoiled + disposed); None until anything was consumed or wasted."""
+        wasted = self.quantity_spoiled + self.quantity_disposed
+        total = self.quantity_used + wasted
+        return float(wasted / total) if total else None
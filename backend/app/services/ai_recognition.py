@@ -1,39 +1,236 @@
-import os
-from openai import OpenAI
+import asyncio
 import json
+import logging
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Iterator
 
-client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
-
-async def recognize_item_with_ai(image: str):
-    try:
-        prompt = (
-            "Identify the grocery item in the image. "
-            "Return JSON ONLY in this format:\n"
-            "{"
-            "\"item\": string, "
-            "\"confidence\": number between 0 and 1, "
-            "\"alternatives\": [{\"item\": string, \"confidence\": number}]"
-            "}\n"
-            "Examples: banana, apple, tomato, milk carton, cereal box."
-        )
-
-        response = client.responses.create(
-            model="gpt-4.1-mini",
-            input=[{
-                "role": "user",
-                "content": [
-                    {"type": "input_text", "text": prompt},
-                    {"type": "input_image", "image_url": image},
-                ],
-            }],
-        )
-
-        return json.loads(response.output_text)
-
-    except Exception as e:
-        return {
-            "item": "unknown",
-            "confidence": 0,
-            "alternatives": [],
-            "error": str(e)
-        }
+from app.core.config import (
+    AI_RECOGNITION_BACKOFF_SECONDS,
+    AI_RECOGNITION_MAX_CONCURRENCY,
+    AI_RECOGNITION_MAX_RETRIES,
+    AI_RECOGNITION_MODEL,
+    AI_RECOGNITION_TIMEOUT_SECONDS,
+)
+from app.core.metrics import histogram_lines, registry, sample_lines
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+PROMPT = (
+    "Identify the grocery item in the image. "
+    "Return JSON ONLY in this format:\n"
+    "{"
+    "\"item\": string, "
+    "\"confidence\": number between 0 and 1, "
+    "\"alternatives\": [{\"item\": string, \"confidence\": number}]"
+    "}\n"
+    "Examples: banana, apple, tomato, milk carton, cereal box."
+)
+
+
+def retryable_errors() -> tuple[type[Exception], ...]:
+    """Transient upstream failures worth another attempt; anything else (4xx, bad JSON) fails fast."""
+    # the openai package takes ~0.6 s to import; it is only loaded once a recognition runs
+    import openai
+    return (
+        openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError,
+        # an attempt's wall-clock deadline (see _create_response)
+        TimeoutError,
+    )
+
+# upper bounds (seconds) for the recognition latency histogram
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, float("inf"))
+
+OUTCOMES = ("success", "timeout", "rate_limited", "upstream_error", "invalid_response")
+
+
+class RecognitionMetrics:
+    """Counters for model calls; one recognition is one observation, however many attempts it took."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.attempts = 0
+        self.retries = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.queue_wait_seconds_total = 0.0
+        self.queue_wait_seconds_max = 0.0
+        self.latency_seconds_total = 0.0
+        self.latency_seconds_max = 0.0
+        self.latency_bucket_counts = [0] * len(LATENCY_BUCKETS)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def started(self, queue_wait: float) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            self.queue_wait_seconds_total += queue_wait
+            self.queue_wait_seconds_max = max(self.queue_wait_seconds_max, queue_wait)
+
+    def finished(self, outcome: str, seconds: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.outcomes[outcome] += 1
+            self.latency_seconds_total += seconds
+            self.latency_seconds_max = max(self.latency_seconds_max, seconds)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    self.latency_bucket_counts[i] += 1
+                    break
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            calls = sum(self.outcomes.values())
+            return {
+                "outcomes": dict(self.outcomes),
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "max_concurrency": AI_RECOGNITION_MAX_CONCURRENCY,
+                "queue_wait_seconds": {
+                    "total": round(self.queue_wait_seconds_total, 6),
+                    "max": round(self.queue_wait_seconds_max, 6),
+                },
+                "latency_seconds": {
+                    "count": calls,
+                    "total": round(self.latency_seconds_total, 6),
+                    "avg": round(self.latency_seconds_total / calls, 6) if calls else 0.0,
+                    "max": round(self.latency_seconds_max, 6),
+                    "buckets": {
+                        ("+Inf" if bound == float("inf") else str(bound)): count
+                        for bound, count in zip(LATENCY_BUCKETS, self.latency_bucket_counts)
+                    },
+                },
+            }
+
+
+metrics = RecognitionMetrics()
+
+
+def collect_metrics() -> Iterator[str]:
+    """/metrics collector for `metrics`; reads one snapshot per scrape."""
+    stats = metrics.snapshot()
+    latency = stats["latency_seconds"]
+    yield from sample_lines(
+        "ai_recognition_calls_total", "Recognitions by final outcome (one per image, however many attempts).",
+        "counter", [({"outcome": outcome}, count) for outcome, count in stats["outcomes"].items()],
+    )
+    yield from sample_lines("ai_recognition_attempts_total", "Model call attempts, retries included.",
+                            "counter", [({}, stats["attempts"])])
+    yield from sample_lines("ai_recognition_retries_total", "Model call attempts that were retries.",
+                            "counter", [({}, stats["retries"])])
+    yield from sample_lines("ai_recognition_in_flight", "Recognitions holding a model call slot.",
+                            "gauge", [({}, stats["in_flight"])])
+    yield from sample_lines("ai_recognition_queue_wait_seconds_total", "Time recognitions waited for a model call slot.",
+                            "counter", [({}, stats["queue_wait_seconds"]["total"])])
+    yield from histogram_lines(
+        "ai_recognition_duration_seconds", "Time per recognition, from getting a slot to the final outcome.",
+        [({}, LATENCY_BUCKETS, latency["buckets"].values(), latency["total"])],
+    )
+
+
+registry.add_collector(collect_metrics)
+
+# caps in-flight model calls per process; excess recognitions queue here instead of piling onto the API
+_model_calls = asyncio.Semaphore(AI_RECOGNITION_MAX_CONCURRENCY)
+
+_client: "AsyncOpenAI | None" = None
+
+
+def get_client() -> "AsyncOpenAI":
+    """
+    The shared AsyncOpenAI client, created on first use (reads OPENAI_API_KEY / OPENAI_BASE_URL).
+
+    SDK retries are off; `recognize_item_with_ai` retries itself so attempts are counted.
+    """
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+        _client = AsyncOpenAI(max_retries=0, timeout=AI_RECOGNITION_TIMEOUT_SECONDS)
+    return _client
+
+
+def recognition_stats() -> dict[str, Any]:
+    return metrics.snapshot()
+
+
+def _outcome_for(error: Exception) -> str:
+    import openai
+    if isinstance(error, (openai.APITimeoutError, TimeoutError)):
+        return "timeout"
+    if isinstance(error, openai.RateLimitError):
+        return "rate_limited"
+    if isinstance(error, ValueError):  # includes json.JSONDecodeError
+        return "invalid_response"
+    return "upstream_error"
+
+
+def _backoff(attempt: int) -> float:
+    # full jitter: uniform over [0, base * 2^attempt] so retrying clients don't move in lockstep
+    return random.uniform(0, AI_RECOGNITION_BACKOFF_SECONDS * 2 ** attempt)
+
+
+async def _create_response(image: str):
+    # the client's timeout applies to each connect/read/write, so a reply trickling in can run
+    # well past it; wait_for makes it a deadline for the whole attempt
+    request = get_client().responses.create(
+        model=AI_RECOGNITION_MODEL,
+        input=[{
+            "role": "user",
+            "content": [
+                {"type": "input_text", "text": PROMPT},
+                {"type": "input_image", "image_url": image},
+            ],
+        }],
+        timeout=AI_RECOGNITION_TIMEOUT_SECONDS,
+    )
+    return await asyncio.wait_for(request, AI_RECOGNITION_TIMEOUT_SECONDS)
+
+
+async def recognize_item_with_ai(image: str) -> dict[str, Any]:
+    """
+    Ask the model to identify the grocery item in `image` (a data URL).
+
+    Waits for one of AI_RECOGNITION_MAX_CONCURRENCY slots, then makes up to
+    1 + AI_RECOGNITION_MAX_RETRIES attempts, each bounded by AI_RECOGNITION_TIMEOUT_SECONDS,
+    backing off with jitter between retryable failures (timeouts, connection errors, 429, 5xx).
+    Failures are returned as an "unknown" payload carrying the error, never raised.
+    """
+    queued_at = time.perf_counter()
+    async with _model_calls:
+        started_at = time.perf_counter()
+        metrics.started(started_at - queued_at)
+        outcome = "success"
+        try:
+            retryable = retryable_errors()
+            for attempt in range(AI_RECOGNITION_MAX_RETRIES + 1):
+                metrics.incr("attempts")
+                try:
+                    response = await _create_response(image)
+                    break
+                except retryable as e:
+                    if attempt == AI_RECOGNITION_MAX_RETRIES:
+                        raise
+                    metrics.incr("retries")
+                    logger.info("Model call failed (%s); retrying", type(e).__name__)
+                    await asyncio.sleep(_backoff(attempt))
+            return json.loads(response.output_text)
+
+        except Exception as e:
+            outcome = _outcome_for(e)
+            return {
+                "item": "unknown",
+                "confidence": 0,
+                "alternatives": [],
+                "error": str(e)
+            }
+        finally:
+            metrics.finished(outcome, time.perf_counter() - started_at)
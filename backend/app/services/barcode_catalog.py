@@ -0,0 +1,116 @@
+"""Reading OpenFoodFacts dumps into `catalog_products` rows."""
+import csv
+import gzip
+import io
+import json
+import logging
+import sys
+from collections.abc import Iterator
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# catalog_products columns filled from a dump record
+CATALOG_COLUMNS = (
+    "barcode", "name", "brand", "quantity", "serving_size", "pnns_groups_1", "pnns_groups_2",
+    "categories_tags", "packaging", "packaging_tags", "image_url", "last_modified_t",
+)
+
+# product name fields in the order the add-item form tries them
+NAME_FIELDS = ("product_name", "product_name_en", "generic_name_en", "generic_name")
+
+
+def normalize_barcode(code: str) -> str | None:
+    """
+    Canonical form of an EAN/UPC barcode, or None if `code` is not one.
+
+    Scanners and OFF disagree on leading zeros (UPC-A "049000028911" is EAN-13
+    "0049000028911"), so they are stripped and the code re-padded to 8 or 13 digits.
+    """
+    code = code.strip()
+    if not code.isdigit() or len(code) > 14:
+        return None
+    stripped = code.lstrip("0")
+    if not stripped:
+        return None
+    return stripped.zfill(8 if len(stripped) <= 8 else 13 if len(stripped) <= 13 else 14)
+
+
+def barcode_forms(barcode: str) -> list[str]:
+    """
+    The ways the normalized `barcode` may have been typed or scanned: without leading zeros,
+    and zero-padded to each EAN/UPC length (8, 12, 13, 14) it fits in.
+
+    Catalog rows are stored normalized; user products keep the barcode as entered.
+    """
+    stripped = barcode.lstrip("0")
+    return [stripped] + [stripped.zfill(length) for length in (8, 12, 13, 14) if length > len(stripped)]
+
+
+def _text(value: Any) -> str | None:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _tags(value: Any) -> str | None:
+    # JSONL dumps carry lists, the CSV export comma-separated strings
+    if isinstance(value, list):
+        value = ",".join(str(tag).strip() for tag in value if str(tag).strip())
+    return _text(value)
+
+
+def catalog_row(record: dict[str, Any]) -> dict[str, Any] | None:
+    """Map one dump record to a catalog_products row; None for records without a usable code or name."""
+    barcode = normalize_barcode(str(record.get("code") or ""))
+    name = next((text for field in NAME_FIELDS if (text := _text(record.get(field)))), None)
+    if barcode is None or name is None:
+        return None
+    brands = _text(record.get("brands"))
+    try:
+        last_modified_t = int(record.get("last_modified_t") or 0) or None
+    except (TypeError, ValueError):
+        last_modified_t = None
+    return {
+        "barcode": barcode,
+        "name": name,
+        "brand": _text(brands.split(",")[0]) if brands else None,
+        "quantity": _text(record.get("quantity")),
+        "serving_size": _text(record.get("serving_size")),
+        "pnns_groups_1": _text(record.get("pnns_groups_1")),
+        "pnns_groups_2": _text(record.get("pnns_groups_2")),
+        "categories_tags": _tags(record.get("categories_tags")),
+        "packaging": _text(record.get("packaging")),
+        "packaging_tags": _tags(record.get("packaging_tags")),
+        "image_url": _text(record.get("image_url")),
+        "last_modified_t": last_modified_t,
+    }
+
+
+def _open_text(path: str) -> io.TextIOBase:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace", newline="")
+    return open(path, encoding="utf-8", errors="replace", newline="")
+
+
+def iter_dump_records(path: str) -> Iterator[dict[str, Any]]:
+    """
+    Yield the product records of an OpenFoodFacts dump one at a time, never the whole file.
+
+    Accepts the JSONL export (openfoodfacts-products.jsonl[.gz]) and the tab-separated
+    CSV export (en.openfoodfacts.org.products.csv[.gz]); gzip is decompressed on the fly.
+    """
+    with _open_text(path) as f:
+        if ".jsonl" in path:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning("Skipping malformed JSON on line %d of %s", line_number, path)
+        else:
+            # OFF's CSV is unquoted TSV with some very long fields (ingredients, nutriments)
+            csv.field_size_limit(sys.maxsize)
+            yield from csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
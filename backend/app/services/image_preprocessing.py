@@ -0,0 +1,76 @@
+import base64
+import io
+from dataclasses import dataclass
+
+from PIL import ExifTags, Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import (
+    AI_RECOGNITION_IMAGE_JPEG_QUALITY,
+    AI_RECOGNITION_IMAGE_MAX_LONG_SIDE,
+    AI_RECOGNITION_IMAGE_MAX_SHORT_SIDE,
+)
+from app.core.exceptions import ImageProcessingError
+
+# decoded formats accepted for recognition, whatever the client claimed in Content-Type
+SUPPORTED_FORMATS = {"JPEG", "PNG"}
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    data: bytes
+    content_type: str
+    width: int
+    height: int
+
+    def data_url(self) -> str:
+        return f"data:{self.content_type};base64,{base64.b64encode(self.data).decode('ascii')}"
+
+
+def target_size(width: int, height: int) -> tuple[int, int]:
+    """Largest size within both the long-side and short-side limits, never upscaling."""
+    scale = min(
+        1.0,
+        AI_RECOGNITION_IMAGE_MAX_LONG_SIDE / max(width, height),
+        AI_RECOGNITION_IMAGE_MAX_SHORT_SIDE / min(width, height),
+    )
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def prepare_image(raw: bytes) -> PreparedImage:
+    """
+    Decode an uploaded JPEG/PNG and re-encode it as the JPEG the model is sent.
+
+    The EXIF orientation is applied to the pixels, then all metadata (EXIF, GPS, ICC, text
+    chunks) is dropped. JPEGs are decoded at a reduced DCT scale close to the target size, so
+    a large photo is never held at full resolution. Transparent PNGs are flattened onto white.
+    CPU-bound; call it from a worker thread.
+    """
+    try:
+        with Image.open(io.BytesIO(raw)) as image:
+            if image.format not in SUPPORTED_FORMATS:
+                raise ImageProcessingError(f"Unsupported image format: {image.format}")
+            # orientation swaps width and height for rotated shots; size the target after transposing
+            orientation = image.getexif().get(ExifTags.Base.Orientation, 1)
+            width, height = image.size if orientation < 5 else image.size[::-1]
+            size = target_size(width, height)
+            image.draft("RGB", size if orientation < 5 else size[::-1])
+            # in place: only rotated shots pay for a transposed copy
+            ImageOps.exif_transpose(image, in_place=True)
+
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGBA")
+                flattened = Image.new("RGB", image.size, "white")
+                flattened.paste(image, mask=image.getchannel("A"))
+                image = flattened
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+            if image.size != size:
+                # reducing_gap box-reduces by an integer factor first, then resamples the small image
+                image = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+            out = io.BytesIO()
+            # no exif=/icc_profile= arguments: the re-encoded file carries no metadata
+            image.save(out, format="JPEG", quality=AI_RECOGNITION_IMAGE_JPEG_QUALITY, optimize=True)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError) as e:
+        raise ImageProcessingError("Could not decode image") from e
+    return PreparedImage(data=out.getvalue(), content_type="image/jpeg", width=size[0], height=size[1])
@@ -0,0 +1,363 @@
+import asyncio
+import copy
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from PIL import Image, UnidentifiedImageError
+
+from app.core.config import (
+    AI_RECOGNITION_CACHE_MAX_DISTANCE,
+    AI_RECOGNITION_CACHE_MAX_SIZE,
+    AI_RECOGNITION_CACHE_MIN_CONFIDENCE,
+    AI_RECOGNITION_CACHE_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+# the part of a recognition result that is cached and replayed
+PAYLOAD_KEYS = ("item", "confidence", "alternatives")
+
+# the persistence file is rewritten with just the live entries once it holds this many times max_size lines
+COMPACT_AT = 2
+
+# dHash grid: HASH_SIZE x HASH_SIZE bits from a (HASH_SIZE + 1) x HASH_SIZE grayscale thumbnail
+HASH_SIZE = 8
+
+
+def content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def perceptual_hash(raw: bytes) -> int | None:
+    """
+    64-bit difference hash of the decoded image, or None if it cannot be decoded.
+
+    Each bit says whether a pixel of a 9x8 grayscale thumbnail is brighter than its right-hand
+    neighbour, so re-encodes, resizes and small exposure changes of the same shot hash alike.
+    """
+    try:
+        with Image.open(io.BytesIO(raw)) as image:
+            # JPEGs decode straight at a reduced scale; other formats ignore the hint
+            image.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))
+            pixels = image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS).tobytes()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        return None
+    bits = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + col]
+            bits = (bits << 1) | (left > pixels[row * (HASH_SIZE + 1) + col + 1])
+    return bits
+
+
+def hash_bands(max_distance: int) -> list[tuple[int, int]]:
+    """
+    (shift, mask) of `max_distance + 1` disjoint bit ranges covering a perceptual hash.
+
+    Two hashes at most `max_distance` bits apart are equal on at least one of the bands
+    (pigeonhole), so only entries sharing a band value with the query need comparing.
+    """
+    bits = HASH_SIZE * HASH_SIZE
+    count = min(max(max_distance, 0) + 1, bits)
+    bands, shift = [], 0
+    for band in range(count):
+        width = bits // count + (band < bits % count)
+        bands.append((shift, (1 << width) - 1))
+        shift += width
+    return bands
+
+
+def is_cacheable(result: dict[str, Any], min_confidence: float) -> bool:
+    """Only confident, error-free answers are worth replaying."""
+    if "error" in result or any(key not in result for key in PAYLOAD_KEYS):
+        return False
+    try:
+        return float(result["confidence"]) >= min_confidence
+    except (TypeError, ValueError):
+        return False
+
+
+class LeaderCancelled(Exception):
+    """The recognition a coalesced request was waiting on was cancelled; the request carries on alone."""
+
+
+@dataclass(frozen=True)
+class CachedRecognition:
+    phash: int | None
+    payload: dict[str, Any]
+
+
+class RecognitionCache:
+    """
+    Recognition results keyed by image content, kept in memory with LRU eviction.
+
+    A lookup first tries the exact sha256 of the upload, then the nearest stored perceptual
+    hash within `max_distance` bits, among the entries `hash_bands` indexes alongside it. Identical uploads that arrive while the first one is
+    still being recognized wait for its result instead of calling the model again.
+    With `path` set, stored entries are appended to a JSON-lines file and reloaded on startup.
+    The file is written by one background thread, in store order, so `store` never waits on
+    disk; it is compacted at startup and whenever it reaches COMPACT_AT x max_size lines.
+    """
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        max_distance: int,
+        min_confidence: float,
+        path: str | None = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.max_size = max_size
+        self.max_distance = max_distance
+        self.min_confidence = min_confidence
+        self.path = path
+        self._lock = threading.Lock()
+        # content hash -> entry; ordered from least to most recently used
+        self._entries: OrderedDict[str, CachedRecognition] = OrderedDict()
+        # per band of the perceptual hash: band value -> content hashes of the entries with it
+        self._bands = hash_bands(max_distance)
+        self._index: list[dict[int, set[str]]] = [{} for _ in self._bands]
+        # content hash -> the in-progress recognition of that exact upload
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self.exact_hits = 0
+        self.perceptual_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped = 0
+        self.evictions = 0
+        # lines in the file since it was last compacted, and the thread that writes it
+        self._lines = 0
+        self._writer: ThreadPoolExecutor | None = None
+        if path:
+            self._load()
+
+    def _load(self) -> None:
+        """Replay the file (later lines win), keep the newest `max_size` entries and rewrite it compacted."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    record = json.loads(line)
+                    entry = CachedRecognition(phash=record["phash"], payload=record["payload"])
+                    self._entries[record["digest"]] = entry
+                    self._entries.move_to_end(record["digest"])
+                except (ValueError, KeyError, TypeError):
+                    logger.warning("Skipping malformed recognition cache line %d in %s", line_number, self.path)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        for digest, entry in self._entries.items():
+            self._index_add(digest, entry.phash)
+        self._compact(list(self._entries.items()))
+        self._lines = len(self._entries)
+
+    def _index_add(self, digest: str, phash: int | None) -> None:
+        if phash is None:
+            return
+        for buckets, (shift, mask) in zip(self._index, self._bands):
+            buckets.setdefault((phash >> shift) & mask, set()).add(digest)
+
+    def _index_remove(self, digest: str, phash: int | None) -> None:
+        if phash is None:
+            return
+        for buckets, (shift, mask) in zip(self._index, self._bands):
+            key = (phash >> shift) & mask
+            bucket = buckets[key]
+            bucket.discard(digest)
+            if not bucket:
+                del buckets[key]
+
+    def _candidates(self, phash: int) -> set[str]:
+        """Content hashes of the entries that may be within `max_distance` bits of `phash`."""
+        candidates: set[str] = set()
+        for buckets, (shift, mask) in zip(self._index, self._bands):
+            candidates.update(buckets.get((phash >> shift) & mask, ()))
+        return candidates
+
+    @staticmethod
+    def _record(digest: str, entry: CachedRecognition) -> str:
+        return json.dumps({"digest": digest, "phash": entry.phash, "payload": entry.payload}) + "\n"
+
+    def _append(self, digest: str, entry: CachedRecognition) -> None:
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(self._record(digest, entry))
+        except OSError:
+            logger.exception("Could not persist recognition cache entry to %s", self.path)
+
+    def _compact(self, entries: Iterable[tuple[str, CachedRecognition]]) -> None:
+        """Replace the file with `entries`, least recently used first."""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for digest, entry in entries:
+                    f.write(self._record(digest, entry))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.exception("Could not compact recognition cache file %s", self.path)
+
+    def get_exact(self, digest: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            self._entries.move_to_end(digest)
+            self.exact_hits += 1
+            return copy.deepcopy(entry.payload)
+
+    def get_similar(self, phash: int | None) -> dict[str, Any] | None:
+        """Payload of the stored image whose perceptual hash is closest to `phash`, if within range."""
+        if phash is None or self.max_distance < 0:
+            return None
+        with self._lock:
+            best_digest, best_distance = None, self.max_distance + 1
+            for digest in self._candidates(phash):
+                distance = (self._entries[digest].phash ^ phash).bit_count()
+                if distance < best_distance:
+                    best_digest, best_distance = digest, distance
+                    if distance == 0:
+                        break
+            if best_digest is None:
+                return None
+            self._entries.move_to_end(best_digest)
+            self.perceptual_hits += 1
+            return copy.deepcopy(self._entries[best_digest].payload)
+
+    def store(self, digest: str, phash: int | None, result: dict[str, Any]) -> bool:
+        """Cache the payload of `result` if it clears the confidence floor; returns whether it did."""
+        if not is_cacheable(result, self.min_confidence):
+            with self._lock:
+                self.skipped += 1
+            return False
+        entry = CachedRecognition(phash=phash, payload=copy.deepcopy({key: result[key] for key in PAYLOAD_KEYS}))
+        with self._lock:
+            replaced = self._entries.get(digest)
+            if replaced is not None:
+                self._index_remove(digest, replaced.phash)
+            self._entries[digest] = entry
+            self._entries.move_to_end(digest)
+            self._index_add(digest, phash)
+            self.stores += 1
+            while len(self._entries) > self.max_size:
+                evicted_digest, evicted = self._entries.popitem(last=False)
+                self._index_remove(evicted_digest, evicted.phash)
+                self.evictions += 1
+            if self.path:
+                # submitted under the lock, so the one writer thread sees stores in order
+                if self._writer is None:
+                    self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recognition-cache")
+                self._lines += 1
+                if self._lines >= COMPACT_AT * self.max_size:
+                    # entries are immutable: the thread can serialize this shallow copy later
+                    snapshot = list(self._entries.items())
+                    self._lines = len(snapshot)
+                    self._writer.submit(self._compact, snapshot)
+                else:
+                    self._writer.submit(self._append, digest, entry)
+        return True
+
+    def flush(self) -> None:
+        """Wait until every entry stored so far is written to the file."""
+        with self._lock:
+            writer = self._writer
+        if writer is not None:
+            writer.submit(lambda: None).result()
+
+    async def get_or_recognize(
+        self, raw: bytes, recognize: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        """
+        Return the cached payload for the image `raw`, or await `recognize()` once and cache its result.
+
+        Concurrent calls for the same bytes share the one in-flight recognition. If its caller
+        is cancelled (client went away), the waiting calls are not: the first to resume starts
+        a new recognition and the others wait on that one.
+        """
+        digest = content_hash(raw)
+        cached = self.get_exact(digest)
+        if cached is not None:
+            return cached
+
+        while (pending := self._in_flight.get(digest)) is not None:
+            with self._lock:
+                self.coalesced += 1
+            try:
+                return copy.deepcopy(await asyncio.shield(pending))
+            except LeaderCancelled:
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[digest] = future
+        try:
+            # decoding is CPU work; keep it off the event loop
+            phash = await asyncio.to_thread(perceptual_hash, raw)
+            result = self.get_similar(phash)
+            if result is not None:
+                # remember the new bytes too, so the next identical upload is an exact hit
+                self.store(digest, phash, result)
+            else:
+                with self._lock:
+                    self.misses += 1
+                result = await recognize()
+                self.store(digest, phash, result)
+            future.set_result(result)
+            return copy.deepcopy(result)
+        except Exception as e:
+            future.set_exception(e)
+            # nobody may be waiting; don't let asyncio log "exception was never retrieved"
+            future.exception()
+            raise
+        except BaseException:
+            # the leader was cancelled (client went away); wake the waiters to retry, but
+            # don't cancel them: their clients are still there
+            future.set_exception(LeaderCancelled())
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[digest]
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset counters (the file, if any, is left alone)."""
+        with self._lock:
+            self._entries.clear()
+            self._index = [{} for _ in self._bands]
+            self.exact_hits = self.perceptual_hits = self.coalesced = self.misses = 0
+            self.stores = self.skipped = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "exact_hits": self.exact_hits,
+                "perceptual_hits": self.perceptual_hits,
+                "coalesced": self.coalesced,
+                "misses": self.misses,
+                "stores": self.stores,
+                "skipped_low_confidence": self.skipped,
+                "evictions": self.evictions,
+                "in_flight": len(self._in_flight),
+                "persistent": bool(self.path),
+            }
+
+
+recognition_cache = RecognitionCache(
+    max_size=AI_RECOGNITION_CACHE_MAX_SIZE,
+    max_distance=AI_RECOGNITION_CACHE_MAX_DISTANCE,
+    min_confidence=AI_RECOGNITION_CACHE_MIN_CONFIDENCE,
+    path=AI_RECOGNITION_CACHE_PATH,
+)
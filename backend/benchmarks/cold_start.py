@@ -0,0 +1,135 @@
+"""
+Cold start of the API process: import time, time to first response and to ready.
+
+    python -m benchmarks.cold_start [--repeat 5] [--database-url URL]
+
+Three measurements, each in fresh subprocesses:
+
+- import: `import app.main`, median wall time, and whether the heavy SDKs (openai,
+  firebase_admin, google.auth) were loaded by it - they should only load on first use;
+- startup: uvicorn on a free port, time until `GET /health/` answers and until
+  `GET /health/ready` turns 200 (background pool and statement warm-up done);
+- schema: statements startup sends to check the schema, the old `create_all` (reflects
+  every table) against the new `alembic_version` read.
+
+The default database is a migrated SQLite file in a temp dir with FIREBASE_INIT_ON_STARTUP
+off, so no credentials are needed; pass a scratch Postgres database (already at
+`alembic upgrade head`) as --database-url to measure the production path.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("openai", "firebase_admin", "google.auth")
+
+IMPORT_PROBE = f"""
+import sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(elapsed, *[m for m in {HEAVY_MODULES!r} if m in sys.modules])
+"""
+
+SCHEMA_PROBE = """
+from sqlalchemy import create_engine, event
+import app.models
+from app.db.base import Base
+from app.db.schema import check_schema_revision
+from app.core.config import DATABASE_URL
+
+engine = create_engine(DATABASE_URL)
+sent = []
+event.listen(engine, "before_cursor_execute", lambda *args: sent.append(args[2]))
+Base.metadata.create_all(engine, checkfirst=True)
+create_all = len(sent)
+sent.clear()
+check_schema_revision(engine, "require")
+print(create_all, len(sent))
+"""
+
+
+def run_probe(code: str, env: dict[str, str]) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND, env=env, check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url: str, server: subprocess.Popen, deadline: float) -> float:
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with {server.returncode} before {url} answered")
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.monotonic()
+        except OSError:  # refused while starting, or HTTPError 503 until ready
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(url)
+
+
+def time_startup(env: dict[str, str]) -> tuple[float, float]:
+    port = free_port()
+    start = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND, env=env,
+    )
+    try:
+        deadline = start + 60
+        first = wait_for(f"http://127.0.0.1:{port}/health/", server, deadline)
+        ready = wait_for(f"http://127.0.0.1:{port}/health/ready", server, deadline)
+        return first - start, ready - start
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.cold_start", description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=5, help="subprocesses per measurement")
+    parser.add_argument("--database-url", help="scratch database at the migration head (default: temp SQLite file)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        if args.database_url:
+            env["DATABASE_URL"] = args.database_url
+        else:
+            env["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'cold_start.db'}"
+            env["FIREBASE_INIT_ON_STARTUP"] = "false"
+            subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=BACKEND, env=env, check=True)
+
+        run_probe("import app.main", env)  # compile bytecode once, so every run below is comparable
+        imports, loaded = [], set()
+        for _ in range(args.repeat):
+            elapsed, *heavy = run_probe(IMPORT_PROBE, env).split()
+            imports.append(float(elapsed))
+            loaded.update(heavy)
+        print(f"import app.main   median {statistics.median(imports) * 1000:8.1f} ms"
+              f"   heavy modules loaded: {', '.join(sorted(loaded)) or 'none'}")
+
+        startups = [time_startup(env) for _ in range(args.repeat)]
+        print(f"first response    median {statistics.median(s[0] for s in startups) * 1000:8.1f} ms")
+        print(f"ready             median {statistics.median(s[1] for s in startups) * 1000:8.1f} ms")
+
+        create_all, revision_check = run_probe(SCHEMA_PROBE, env).split()
+        print(f"schema statements create_all {create_all}, revision check {revision_check}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Per-request CPU of the list endpoints with LIST_READ_MODE=orm vs rows.
+
+    python -m benchmarks.list_read_mode [--rows 200] [--requests 300]
+
+Seeds an in-memory SQLite database with one user owning `--rows` products, grocery runs
+and inventory batches, then requests a full page (limit=--rows) of each list endpoint
+through the ASGI app and reports the median process CPU time per request for each mode.
+Requests go through httpx's in-process ASGI transport (no portal thread as with
+TestClient), so both modes pay the same routing overhead and the difference is the read
+path itself: ORM hydration + response_model validation vs plain rows + direct encoding.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.api.deps import get_current_user_id, get_firebase_claims  # noqa: E402
+from app.api.routes import grocery_run, inventory_batch, product  # noqa: E402
+from app.data_access.deps import get_session_runner  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.grocery_run import GroceryRun  # noqa: E402
+from app.models.inventory_batch import InventoryBatch  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.firebase import FirebaseClaims  # noqa: E402
+
+ENDPOINTS = ("/inventory-batches/", "/products/", "/grocery-runs/")
+
+
+def seed(db: Session, rows: int) -> int:
+    user = User(firebase_uid="bench", email="bench@example.com")
+    db.add(user)
+    db.flush()
+    runs = [GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1) + timedelta(days=i)) for i in range(rows)]
+    products = [
+        Product(user_id=user.user_id, name=f"product {i:04}", type="packaged", brand="acme",
+                default_storage_location="pantry")
+        for i in range(rows)
+    ]
+    db.add_all([*runs, *products])
+    db.flush()
+    db.add_all([
+        InventoryBatch(
+            grocery_run_id=runs[i].id,
+            product_id=products[i].id,
+            quantity_added=Decimal("3"),
+            quantity_used=Decimal("1"),
+            storage_location="pantry",
+            expired_at=datetime(2026, 2, 1) + timedelta(hours=i),
+        )
+        for i in range(rows)
+    ])
+    db.commit()
+    return user.user_id
+
+
+async def cpu_per_request(client: httpx.AsyncClient, url: str, limit: int, requests: int) -> float:
+    samples = []
+    for _ in range(requests):
+        start = time.process_time()
+        response = await client.get(url, params={"limit": limit})
+        samples.append(time.process_time() - start)
+        response.raise_for_status()
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.list_read_mode", description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=200, help="rows per collection and page size (max 200)")
+    parser.add_argument("--requests", type=int, default=300, help="requests per endpoint and mode")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        user_id = seed(db, args.rows)
+
+    # a fresh session per DAL call, as in production, so no identity map carries over between requests
+    async def run(fn):
+        with Session(engine) as db:
+            return fn(db)
+
+    app.dependency_overrides[get_session_runner] = lambda: run
+    app.dependency_overrides[get_current_user_id] = lambda: user_id
+    app.dependency_overrides[get_firebase_claims] = lambda: FirebaseClaims(uid="bench", email="bench@example.com")
+
+    async def measure() -> None:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"{'endpoint':<22}{'orm ms':>10}{'rows ms':>10}{'speedup':>10}")
+            for url in ENDPOINTS:
+                results = {}
+                for mode in ("orm", "rows"):
+                    for module in (grocery_run, inventory_batch, product):
+                        module.LIST_READ_MODE = mode
+                    await cpu_per_request(client, url, args.rows, 20)  # warm up
+                    results[mode] = await cpu_per_request(client, url, args.rows, args.requests)
+                print(
+                    f"{url:<22}{results['orm'] * 1000:>10.2f}{results['rows'] * 1000:>10.2f}"
+                    f"{results['orm'] / results['rows']:>9.1f}x"
+                )
+
+    try:
+        asyncio.run(measure())
+    finally:
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Per-request cost of the /metrics instrumentation, checked against BUDGET_US.
+
+    python -m benchmarks.metrics_overhead [--requests 20000]
+
+Measures, in-process and without network noise:
+
+- middleware: RequestMetricsMiddleware (in-flight gauge, route template lookup, latency
+  histogram) around a minimal ASGI app that matches `GET /health/` and responds, against
+  that app alone;
+- DAL: an `instrument_dal` method against the same method unwrapped, on a no-op body so
+  only the wrapper is timed;
+- auth: the timing `decode_token` adds around a cached token (two clock reads and one
+  histogram observation);
+- scrape: rendering /metrics with realistic cardinality (40 routes x 3 statuses, 60
+  DAL methods).
+
+The per-request estimate is middleware + auth + DAL_CALLS_PER_REQUEST x DAL; the script
+exits 1 if it is over BUDGET_US.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.api.middleware import RequestMetricsMiddleware  # noqa: E402
+from app.api.routes import health  # noqa: E402
+from app.core.metrics import (  # noqa: E402
+    auth_verify_duration,
+    dal_call_duration,
+    http_request_duration,
+    instrument_dal,
+    registry,
+)
+
+# instrumentation budget per request, in microseconds
+BUDGET_US = 25.0
+# DAL methods a typical authenticated request calls (user lookup, version check, the read itself, ...)
+DAL_CALLS_PER_REQUEST = 4
+
+
+def compare_asgi(bare, instrumented, requests: int, runs: int) -> tuple[float, float]:
+    """Best seconds per request for each app; runs alternate so both see the same machine state."""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    async def seconds_per_request(asgi_app, count: int) -> float:
+        start = time.perf_counter()
+        for _ in range(count):
+            await asgi_app({"type": "http", "method": "GET", "path": "/health/"}, receive, send)
+        return (time.perf_counter() - start) / count
+
+    async def drive() -> tuple[float, float]:
+        best = {bare: float("inf"), instrumented: float("inf")}
+        for asgi_app in best:
+            await seconds_per_request(asgi_app, 500)  # warm up, including the route template cache
+        for _ in range(runs):
+            for asgi_app in best:
+                best[asgi_app] = min(best[asgi_app], await seconds_per_request(asgi_app, requests))
+        return best[bare], best[instrumented]
+
+    return asyncio.run(drive())
+
+
+def best_of(runs: int, measure) -> float:
+    # minimum over runs: the least disturbed by the rest of the machine
+    return min(measure() for _ in range(runs))
+
+
+class NoopDAL:
+    def get(self, *, user_id: int) -> int:
+        return user_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.metrics_overhead", description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=20_000, help="iterations per measurement")
+    parser.add_argument("--runs", type=int, default=5, help="measurements per variant (the best is kept)")
+    args = parser.parse_args()
+    n = args.requests
+
+    route = next(r for r in health.router.routes if r.path == "/")
+
+    async def bare(scope, receive, send):
+        # what the router leaves behind for the middleware: the matched route, then a response
+        scope["route"] = route
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    bare_seconds, instrumented_seconds = compare_asgi(bare, RequestMetricsMiddleware(bare), n, args.runs)
+    middleware = instrumented_seconds - bare_seconds
+
+    raw_get = NoopDAL.get
+    dal = instrument_dal(type("NoopDAL", (NoopDAL,), {"get": raw_get}))()
+    plain = NoopDAL()
+
+    def time_calls(target) -> float:
+        start = time.perf_counter()
+        for i in range(n):
+            target.get(user_id=i)
+        return (time.perf_counter() - start) / n
+
+    dal_cost = best_of(args.runs, lambda: time_calls(dal)) - best_of(args.runs, lambda: time_calls(plain))
+
+    def time_auth() -> float:
+        start = time.perf_counter()
+        for _ in range(n):
+            t = time.perf_counter()
+            auth_verify_duration.observe(time.perf_counter() - t, "cached")
+        return (time.perf_counter() - start) / n
+
+    auth = best_of(args.runs, time_auth)
+
+    for i in range(40):
+        for status in ("200", "304", "404"):
+            http_request_duration.observe(0.01, "GET", f"/collection-{i}/{{item_id}}", status)
+    for i in range(60):
+        dal_call_duration.observe(0.001, "SomeDAL", f"method_{i}")
+    start = time.perf_counter()
+    body = registry.render()
+    scrape = time.perf_counter() - start
+    registry.clear()
+
+    total = middleware + auth + DAL_CALLS_PER_REQUEST * dal_cost
+    print(f"middleware        {middleware * 1e6:7.2f} us/request")
+    print(f"DAL wrapper       {dal_cost * 1e6:7.2f} us/call  (x{DAL_CALLS_PER_REQUEST} per request)")
+    print(f"auth timing       {auth * 1e6:7.2f} us/request")
+    print(f"total             {total * 1e6:7.2f} us/request  (budget {BUDGET_US:.0f} us)")
+    print(f"scrape            {scrape * 1e3:7.2f} ms for {len(body) // 1024} KiB")
+    if total * 1e6 > BUDGET_US:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
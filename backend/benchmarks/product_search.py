@@ -0,0 +1,158 @@
+"""
+Latency of ProductDAL.search (/products/search) for a user with a large catalog.
+
+    python -m benchmarks.product_search [--products 20000] [--repeat 20] [--database-url URL]
+
+Seeds one user with `--products` products (random grocery names and brands, a tenth of them
+with a recent inventory batch) plus a second user with as many again, then times the
+search for a set of type-ahead queries: 1-2 character prefixes, partial words, whole words,
+brand names and misspellings. Reports median and p95 wall time per query.
+
+The default database is in-memory SQLite, where the trigram functions run as Python UDFs
+over every row of the user (there is no trigram index) - useful to compare changes, not as
+a production figure. Pass a scratch Postgres database as --database-url (its tables are
+dropped and recreated; pg_trgm and btree_gin must be available) to measure the ix_products_user_search_trgm path; the plan of
+one fuzzy query is printed so the index use can be checked.
+
+On Postgres every query's p95 must stay under TARGET_P95_MS (type-ahead fires on every
+keystroke); the script exits 1 if one does not.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event, insert, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.data_access.product_dal import ProductDAL  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.models.grocery_run import GroceryRun  # noqa: E402
+from app.models.inventory_batch import InventoryBatch  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+WORDS = (
+    "organic", "whole", "milk", "dark", "chocolate", "cheddar", "cheese", "greek", "yogurt",
+    "almond", "butter", "peanut", "sourdough", "bread", "bagels", "basmati", "rice", "olive",
+    "oil", "tomato", "sauce", "spaghetti", "penne", "chicken", "breast", "ground", "beef",
+    "salmon", "fillet", "frozen", "peas", "spinach", "baby", "carrots", "apple", "juice",
+    "orange", "granola", "oats", "honey", "maple", "syrup", "coffee", "beans", "green", "tea",
+    "sparkling", "water", "vanilla", "ice", "cream", "garlic", "onion", "potato", "chips",
+)
+BRANDS = (
+    "Trader Joe's", "Kirkland", "Organic Valley", "Tillamook", "Lindt", "Barilla", "Chobani",
+    "Kerrygold", "Bob's Red Mill", "Nature's Path", "Great Value", "365", None, None,
+)
+# per-query p95 budget on Postgres, in milliseconds
+TARGET_P95_MS = 50.0
+
+QUERIES = ("c", "ch", "cho", "choc", "chocolate", "milk", "greek yog", "tillamook", "tilamook", "chedar chese")
+
+
+def seed_user(db: Session, rng: random.Random, email: str, products: int) -> int:
+    user = User(firebase_uid=email, email=email)
+    db.add(user)
+    db.flush()
+    db.execute(insert(Product), [
+        {
+            "user_id": user.user_id,
+            "name": " ".join(rng.sample(WORDS, rng.randint(2, 3))).title() + f" {i}",
+            "brand": rng.choice(BRANDS),
+            "type": "packaged",
+        }
+        for i in range(products)
+    ])
+    run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+    db.add(run)
+    db.flush()
+    product_ids = db.scalars(text("SELECT id FROM products WHERE user_id = :u"), {"u": user.user_id}).all()
+    now = datetime.now(timezone.utc)
+    db.execute(insert(InventoryBatch), [
+        {
+            "grocery_run_id": run.id,
+            "product_id": product_id,
+            "quantity_added": Decimal("1"),
+            "added_at": now - timedelta(days=rng.randint(0, 365)),
+        }
+        for product_id in rng.sample(product_ids, len(product_ids) // 10)
+    ])
+    db.commit()
+    return user.user_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.product_search", description=__doc__.split("\n")[1])
+    parser.add_argument("--products", type=int, default=20_000, help="products per seeded user")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per query")
+    parser.add_argument("--database-url", default="sqlite://", help="scratch database (default: in-memory SQLite)")
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite"):
+        engine = create_engine(args.database_url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(args.database_url)
+    # a scratch database: start from empty tables on every run
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    rng = random.Random(2026)
+    with Session(engine) as db:
+        start = time.perf_counter()
+        user_id = seed_user(db, rng, "search-bench@example.com", args.products)
+        seed_user(db, rng, "search-bench-other@example.com", args.products)
+        if engine.dialect.name == "postgresql":
+            # as autovacuum would after a bulk load: merge the GIN pending list and refresh statistics
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                connection.execute(text("VACUUM ANALYZE products"))
+                connection.execute(text("VACUUM ANALYZE inventory_batches"))
+        print(f"seeded 2 x {args.products} products in {time.perf_counter() - start:.1f}s ({engine.dialect.name})")
+
+        dal = ProductDAL(db)
+        slow = []
+        print(f"{'query':<16}{'hits':>6}{'median ms':>12}{'p95 ms':>10}  top result")
+        for query in QUERIES:
+            results = dal.search(user_id=user_id, query=query)  # warm up
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                dal.search(user_id=user_id, query=query)
+                samples.append(time.perf_counter() - start)
+            samples.sort()
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            top = f"{results[0].name} ({results[0].brand})" if results else "-"
+            print(f"{query:<16}{len(results):>6}{statistics.median(samples) * 1000:>12.1f}{p95 * 1000:>10.1f}  {top}")
+            if p95 * 1000 > TARGET_P95_MS:
+                slow.append(query)
+
+        if engine.dialect.name == "postgresql":
+            # EXPLAIN the exact statement the DAL sends for a misspelt query
+            sent = []
+
+            def record(conn, cursor, statement, parameters, context, executemany):
+                sent.append((statement, parameters))
+
+            event.listen(engine, "before_cursor_execute", record)
+            dal.search(user_id=user_id, query="chedar chese")
+            event.remove(engine, "before_cursor_execute", record)
+            statement, parameters = sent[-1]
+            plan = db.connection().exec_driver_sql("EXPLAIN " + statement, parameters).scalars().all()
+            print("\n".join(plan))
+
+            print(f"p95 target {TARGET_P95_MS:.0f} ms: " + (f"missed by {', '.join(map(repr, slow))}" if slow else "met"))
+            if slow:
+                sys.exit(1)
+        else:
+            print(f"p95 target {TARGET_P95_MS:.0f} ms: not checked on {engine.dialect.name} (no trigram index)")
+
+
+if __name__ == "__main__":
+    main()
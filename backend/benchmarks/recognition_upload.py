@@ -0,0 +1,133 @@
+"""
+Upstream payload, peak memory and CPU of preparing a /recognize-item upload for the model.
+
+    python -m benchmarks.recognition_upload [--photos DIR] [--repeat 5]
+
+For every sample photo (the JPEG/PNG files in --photos, or a synthetic set of phone-sized
+shots if omitted) both request-building paths run:
+
+  original   the whole upload base64-encoded into the data URL, as before
+  prepared   decoded at a reduced scale, downscaled, EXIF stripped and re-encoded (prepare_image)
+
+and the JSON request body that carries the image is built, as the OpenAI client would.
+Reported per photo: the body size; the peak RSS growth while building it; the RSS still held
+once it is built, i.e. what each request keeps alive for the seconds its model call takes;
+and the median CPU time over --repeat runs.
+
+RSS figures are Linux only (the high-water mark is reset through /proc/self/clear_refs, so
+Pillow's pixel buffers count too). Run with MALLOC_MMAP_THRESHOLD_=65536 so freed buffers
+go back to the OS instead of being reused silently by later runs:
+
+    MALLOC_MMAP_THRESHOLD_=65536 python -m benchmarks.recognition_upload
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from PIL import Image  # noqa: E402
+
+from app.services.image_preprocessing import prepare_image  # noqa: E402
+
+# (width, height, format): typical phone uploads that fit the 2 MB limit
+SYNTHETIC_PHOTOS = (
+    (1600, 1200, "JPEG"),
+    (2048, 1536, "JPEG"),
+    (2592, 1944, "JPEG"),
+    (1080, 1920, "JPEG"),
+    (900, 900, "PNG"),
+)
+
+
+def synthetic_photo(width: int, height: int, format: str) -> bytes:
+    """Noise over a gradient: compresses about as poorly as a real photo."""
+    noise = Image.effect_noise((width, height), 40).convert("RGB")
+    gradient = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    image = Image.blend(noise, gradient, 0.6)
+    out = io.BytesIO()
+    image.save(out, format=format, **({"quality": 80} if format == "JPEG" else {}))
+    return out.getvalue()
+
+
+def load_photos(directory: str | None) -> list[tuple[str, bytes]]:
+    if directory:
+        paths = sorted(p for p in Path(directory).iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png"})
+        return [(p.name, p.read_bytes()) for p in paths]
+    return [
+        (f"synthetic {w}x{h}.{fmt.lower()}", synthetic_photo(w, h, fmt))
+        for w, h, fmt in SYNTHETIC_PHOTOS
+    ]
+
+
+def request_body(data_url: str) -> bytes:
+    message = {"role": "user", "content": [{"type": "input_image", "image_url": data_url}]}
+    return json.dumps({"input": [message]}).encode()
+
+
+def original_body(raw: bytes, content_type: str) -> bytes:
+    return request_body(f"data:{content_type};base64,{base64.b64encode(raw).decode('utf-8')}")
+
+
+def prepared_body(raw: bytes, content_type: str) -> bytes:
+    return request_body(prepare_image(raw).data_url())
+
+
+def _rss_kib(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field):
+                return int(line.split()[1])
+    raise RuntimeError(f"{field} not found")
+
+
+def rss_growth_kib(build, raw: bytes, content_type: str) -> tuple[int, int] | None:
+    """(peak, held) RSS increase for one `build`, or None where the high-water mark cannot be reset."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return None
+    before = _rss_kib("VmRSS:")
+    body = build(raw, content_type)
+    growth = (_rss_kib("VmHWM:") - before, _rss_kib("VmRSS:") - before)
+    del body
+    return growth
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.recognition_upload", description=__doc__.split("\n")[1])
+    parser.add_argument("--photos", help="directory of sample .jpg/.png photos (default: synthetic set)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per photo and path for the CPU median")
+    args = parser.parse_args()
+
+    print(f"{'photo':<30}{'path':<10}{'body KiB':>10}{'peak KiB':>10}{'held KiB':>10}{'cpu ms':>9}")
+    totals = {"original": 0, "prepared": 0}
+    for name, raw in load_photos(args.photos):
+        content_type = "image/png" if raw.startswith(b"\x89PNG") else "image/jpeg"
+        for path, build in (("original", original_body), ("prepared", prepared_body)):
+            build(raw, content_type)  # warm up
+            growth = rss_growth_kib(build, raw, content_type)
+            samples = []
+            for _ in range(args.repeat):
+                start = time.process_time()
+                size = len(build(raw, content_type))
+                samples.append(time.process_time() - start)
+            totals[path] += size
+            print(
+                f"{name[:29]:<30}{path:<10}{size / 1024:>10.0f}"
+                + ("".join(f"{kib:>10}" for kib in growth) if growth else f"{'n/a':>10}{'n/a':>10}")
+                + f"{statistics.median(samples) * 1000:>9.1f}"
+            )
+    print(f"upstream bytes, all photos: original {totals['original'] / 1024:.0f} KiB, "
+          f"prepared {totals['prepared'] / 1024:.0f} KiB "
+          f"({totals['prepared'] / totals['original']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
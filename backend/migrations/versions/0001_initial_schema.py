@@ -0,0 +1,218 @@
+"""initial schema
+
+The schema as create_all built it before migrations existed. Databases created that way
+(by the old startup init_db) are adopted with `alembic stamp 0001` instead of upgraded.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 14:35:44.574245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# shared by several tables: created once up front rather than by each create_table
+product_type = postgresql.ENUM('vegetable', 'fruit', 'packaged', name='product_type', create_type=False)
+storage_location = postgresql.ENUM('fridge', 'pantry', 'freezer', name='storage_location', create_type=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # product search's trigram index (gin_trgm_ops, and btree_gin for its user_id key)
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+    product_type.create(bind, checkfirst=True)
+    storage_location.create(bind, checkfirst=True)
+
+    op.create_table('catalog_products',
+    sa.Column('barcode', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('brand', sa.String(), nullable=True),
+    sa.Column('quantity', sa.String(), nullable=True),
+    sa.Column('serving_size', sa.String(), nullable=True),
+    sa.Column('pnns_groups_1', sa.String(), nullable=True),
+    sa.Column('pnns_groups_2', sa.String(), nullable=True),
+    sa.Column('categories_tags', sa.Text(), nullable=True),
+    sa.Column('packaging', sa.String(), nullable=True),
+    sa.Column('packaging_tags', sa.Text(), nullable=True),
+    sa.Column('image_url', sa.String(), nullable=True),
+    sa.Column('last_modified_t', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('barcode')
+    )
+    op.create_table('categories',
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('category_name', sa.String(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('category_id'),
+    sa.UniqueConstraint('category_name')
+    )
+    op.create_table('users',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('firebase_uid', sa.String(), nullable=False),
+    sa.Column('display_name', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id'),
+    sa.UniqueConstraint('email'),
+    sa.UniqueConstraint('firebase_uid')
+    )
+    op.create_table('collection_versions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('collection', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'collection')
+    )
+    op.create_table('grocery_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('trip_date', sa.Date(), nullable=False),
+    sa.Column('store_name', sa.String(), nullable=True),
+    sa.Column('total_cost', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('archived', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_grocery_runs_user_archived', 'grocery_runs', ['user_id', 'archived'])
+    op.create_index('ix_grocery_runs_user_id', 'grocery_runs', ['user_id'])
+    op.create_index('ix_grocery_runs_user_trip_date', 'grocery_runs', ['user_id', 'trip_date'])
+    op.create_index('ix_grocery_runs_user_updated', 'grocery_runs', ['user_id', 'updated_at', 'id'])
+
+    op.create_table('products',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('brand', sa.String(), nullable=True),
+    sa.Column('size', sa.String(), nullable=True),
+    sa.Column('unit', sa.String(), nullable=True),
+    sa.Column('type', product_type, nullable=False),
+    sa.Column('barcode', sa.String(), nullable=True),
+    sa.Column('default_storage_location', storage_location, nullable=True),
+    sa.Column('shelf_life_days', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.category_id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_products_user_category', 'products', ['user_id', 'category_id'])
+    op.create_index('ix_products_user_id', 'products', ['user_id'])
+    op.create_index('ix_products_user_name', 'products', ['user_id', 'name'])
+    op.create_index('ix_products_user_updated', 'products', ['user_id', 'updated_at', 'id'])
+    op.create_index('ux_products_user_barcode_not_null', 'products', ['user_id', 'barcode'], unique=True, postgresql_where=sa.text('barcode IS NOT NULL'))
+    if bind.dialect.name == 'postgresql':
+        op.create_index(
+            'ix_products_user_search_trgm',
+            'products',
+            ['user_id', sa.text("((name || ' ') || coalesce(brand, '')) gin_trgm_ops")],
+            postgresql_using='gin',
+        )
+
+    op.create_table('sync_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('collection', sa.String(), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sync_tombstones_deleted_at', 'sync_tombstones', ['deleted_at'])
+    op.create_index('ix_sync_tombstones_user_deleted', 'sync_tombstones', ['user_id', 'deleted_at', 'id'])
+
+    op.create_table('inventory_batches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('grocery_run_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity_added', sa.Numeric(precision=6, scale=2), nullable=False),
+    sa.Column('quantity_used', sa.Numeric(precision=6, scale=2), server_default='0', nullable=False),
+    sa.Column('quantity_spoiled', sa.Numeric(precision=6, scale=2), server_default='0', nullable=False),
+    sa.Column('quantity_disposed', sa.Numeric(precision=6, scale=2), server_default='0', nullable=False),
+    sa.Column('quantity_current', sa.Numeric(precision=6, scale=2), sa.Computed('quantity_added - quantity_used - quantity_spoiled - quantity_disposed', persisted=True), nullable=False),
+    sa.Column('storage_location', storage_location, nullable=True),
+    sa.Column('added_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('expired_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['grocery_run_id'], ['grocery_runs.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_batches_expired_at', 'inventory_batches', ['expired_at'])
+    op.create_index('ix_batches_open_product_location', 'inventory_batches', ['product_id', 'storage_location'], postgresql_where=sa.text('completed_at IS NULL'), sqlite_where=sa.text('completed_at IS NULL'))
+    op.create_index('ix_batches_open_run_expiry', 'inventory_batches', ['grocery_run_id', 'expired_at'], postgresql_where=sa.text('completed_at IS NULL'), sqlite_where=sa.text('completed_at IS NULL'))
+    op.create_index('ix_batches_product_added_at', 'inventory_batches', ['product_id', 'added_at'])
+    op.create_index('ix_batches_product_id', 'inventory_batches', ['product_id'])
+    op.create_index('ix_batches_run_completed', 'inventory_batches', ['grocery_run_id', 'completed_at'])
+    op.create_index('ix_batches_run_updated', 'inventory_batches', ['grocery_run_id', 'updated_at', 'id'])
+
+    op.create_table('product_stock',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('storage_location', storage_location, nullable=True),
+    sa.Column('quantity_current', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('open_batch_count', sa.Integer(), nullable=False),
+    sa.Column('next_expiry_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ux_product_stock_key', 'product_stock', ['user_id', 'product_id', 'storage_location'], unique=True, postgresql_nulls_not_distinct=True)
+
+    op.create_table('waste_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('batch_count', sa.Integer(), nullable=False),
+    sa.Column('quantity_added', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('quantity_used', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('quantity_spoiled', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('quantity_disposed', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_waste_rollups_user_month', 'waste_rollups', ['user_id', 'month'])
+    op.create_index('ux_waste_rollups_product_month', 'waste_rollups', ['product_id', 'month'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in (
+        'waste_rollups',
+        'product_stock',
+        'inventory_batches',
+        'sync_tombstones',
+        'products',
+        'grocery_runs',
+        'collection_versions',
+        'users',
+        'categories',
+        'catalog_products',
+    ):
+        op.drop_table(table)
+    bind = op.get_bind()
+    storage_location.drop(bind, checkfirst=True)
+    product_type.drop(bind, checkfirst=True)
@@ -0,0 +1,57 @@
+"""category version counter
+
+A one-row counter that triggers on categories bump with every change, for the categories
+snapshot (app.data_access.category_dal).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 18:02:11.308415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('category_versions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute('INSERT INTO category_versions (id, version) VALUES (1, 0)')
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            'CREATE OR REPLACE FUNCTION bump_category_version() RETURNS trigger LANGUAGE plpgsql AS $$ '
+            'BEGIN UPDATE category_versions SET version = version + 1; RETURN NULL; END $$'
+        )
+        op.execute(
+            'CREATE TRIGGER bump_category_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON categories '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_category_version()'
+        )
+    else:
+        for operation in ('insert', 'update', 'delete'):
+            op.execute(
+                f'CREATE TRIGGER bump_category_version_{operation} AFTER {operation.upper()} ON categories '
+                'BEGIN UPDATE category_versions SET version = version + 1; END'
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP TRIGGER IF EXISTS bump_category_version ON categories')
+        op.execute('DROP FUNCTION IF EXISTS bump_category_version()')
+    else:
+        for operation in ('insert', 'update', 'delete'):
+            op.execute(f'DROP TRIGGER IF EXISTS bump_category_version_{operation}')
+    op.drop_table('category_versions')
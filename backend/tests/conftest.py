@@ -1,4 +1,19 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
 import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import app.models as _models
+from app.api.deps import get_current_user_id, get_firebase_claims
+from app.data_access.deps import get_session_runner
+from app.db.base import Base
+from app.models.user import User
 from app.schemas.firebase import FirebaseClaims
 
 @pytest.fixture
@@ -13,3 +28,163 @@ def firebase_claims_dict() -> dict[str, str]:
 @pytest.fixture
 def firebase_claims(firebase_claims_dict) -> FirebaseClaims:
     return FirebaseClaims.model_validate(firebase_claims_dict)
+
+
+@pytest.fixture(autouse=True)
+def firebase_app(monkeypatch):
+    """Token verification is mocked in tests; never initialize the real Firebase SDK."""
+    from app.auth import firebase
+    monkeypatch.setattr(firebase, "_app", object())
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from app.auth.firebase import claims_cache
+    from app.data_access.category_dal import category_snapshot_cache
+    from app.data_access.user_dal import user_identity_cache
+    from app.services.recognition_cache import recognition_cache
+    caches = (claims_cache, user_identity_cache, recognition_cache, category_snapshot_cache)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+@pytest.fixture
+def db_engine():
+    """In-memory SQLite engine with the full schema; one shared connection per test."""
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+
+    # enforce foreign keys (and their ON DELETE actions) like Postgres does
+    @event.listens_for(engine, "connect")
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def pg_engine():
+    """
+    Postgres engine with the full schema, for what SQLite can't show (concurrent writers).
+    Point TEST_POSTGRES_URL at a scratch database to run these tests; they are skipped otherwise.
+    """
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def blocked_session(pg_engine):
+    """
+    `start(fn)` runs `fn(session)` in a second session on a thread and returns once that
+    session is waiting on a lock; `finish()` waits for it, commits, and re-raises its error.
+    """
+    outcome: dict = {}
+
+    def work(fn):
+        try:
+            with Session(pg_engine, autoflush=False) as session:
+                outcome["pid"] = session.execute(text("SELECT pg_backend_pid()")).scalar_one()
+                fn(session)
+                session.commit()
+        except Exception as exc:
+            outcome["error"] = exc
+
+    thread: threading.Thread | None = None
+
+    def start(fn) -> None:
+        nonlocal thread
+        thread = threading.Thread(target=work, args=(fn,))
+        thread.start()
+        deadline = time.monotonic() + 10
+        with pg_engine.connect() as monitor:
+            while time.monotonic() < deadline and thread.is_alive():
+                waiting = monitor.execute(
+                    text("SELECT wait_event_type = 'Lock' FROM pg_stat_activity WHERE pid = :pid"),
+                    {"pid": outcome.get("pid", 0)},
+                ).scalar()
+                if waiting:
+                    return
+                time.sleep(0.01)
+        raise AssertionError(f"the second session never waited on a lock: {outcome.get('error')!r}")
+
+    def finish() -> None:
+        thread.join(10)
+        if "error" in outcome:
+            raise outcome["error"]
+
+    yield start, finish
+    if thread is not None:
+        thread.join(10)
+
+
+@pytest.fixture
+def db_session(db_engine):
+    with Session(db_engine, autoflush=False) as session:
+        yield session
+
+
+@pytest.fixture
+def user(db_session) -> User:
+    user = User(firebase_uid="uid123", email="user@example.com", display_name="User Name")
+    db_session.add(user)
+    db_session.flush()
+    return user
+
+
+@pytest.fixture
+def statements(db_engine) -> list[str]:
+    """Every SQL statement sent through `db_engine`; `.clear()` it right before the code under test."""
+    executed: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(db_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def assert_num_queries(statements):
+    """
+    Query budget: `with assert_num_queries(3): client.get(...)` fails unless exactly
+    three statements ran inside the block, listing them if not.
+    """
+    @contextmanager
+    def check(expected: int):
+        start = len(statements)
+        yield
+        ran = statements[start:]
+        assert len(ran) == expected, f"expected {expected} statements, ran {len(ran)}:\n" + "\n".join(ran)
+
+    return check
+
+
+@pytest.fixture
+def client(db_session, user, firebase_claims) -> TestClient:
+    """API client authenticated as `user`, with every DAL running on `db_session`."""
+    from app.main import app
+
+    async def run(fn):
+        return fn(db_session)
+
+    app.dependency_overrides[get_session_runner] = lambda: run
+    app.dependency_overrides[get_current_user_id] = lambda: user.user_id
+    app.dependency_overrides[get_firebase_claims] = lambda: firebase_claims
+    yield TestClient(app)
+    app.dependency_overrides.clear()
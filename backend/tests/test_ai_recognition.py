@@ -0,0 +1,232 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import AsyncOpenAI
+
+from app.services import ai_recognition
+
+PAYLOAD = {"item": "banana", "confidence": 0.93, "alternatives": [{"item": "plantain", "confidence": 0.05}]}
+
+
+def responses_body(text: str) -> dict:
+    return {
+        "id": "resp_1",
+        "object": "response",
+        "created_at": 0,
+        "model": "fake-model",
+        "status": "completed",
+        "output": [{
+            "type": "message",
+            "id": "msg_1",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+    }
+
+
+class FakeModelAPI(ThreadingHTTPServer):
+    """Local stand-in for POST /v1/responses; replies from `script`, then with PAYLOAD."""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeModelHandler)
+        self.lock = threading.Lock()
+        # (status, body, delay seconds) per request, consumed in order
+        self.script: list[tuple[int, dict, float]] = []
+        self.default = (200, responses_body(json.dumps(PAYLOAD)), 0.0)
+        self.requests: list[dict] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # seconds between body chunks: a reply that keeps every read short but takes long in total
+        self.trickle = 0.0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class FakeModelHandler(BaseHTTPRequestHandler):
+    server: FakeModelAPI
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            self.server.requests.append(body)
+            status, reply, delay = self.server.script.pop(0) if self.server.script else self.server.default
+            self.server.in_flight += 1
+            self.server.peak_in_flight = max(self.server.peak_in_flight, self.server.in_flight)
+        try:
+            time.sleep(delay)
+            data = json.dumps(reply).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if self.server.trickle:
+                for start in range(0, len(data), 64):
+                    self.wfile.write(data[start:start + 64])
+                    self.wfile.flush()
+                    time.sleep(self.server.trickle)
+            else:
+                self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # the client gave up (timeout)
+            pass
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    server = FakeModelAPI()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(ai_recognition, "_client", AsyncOpenAI(api_key="test", base_url=server.url, max_retries=0))
+    monkeypatch.setattr(ai_recognition, "metrics", ai_recognition.RecognitionMetrics())
+    monkeypatch.setattr(ai_recognition, "AI_RECOGNITION_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(ai_recognition, "AI_RECOGNITION_TIMEOUT_SECONDS", 5)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def error_body(message: str) -> dict:
+    return {"error": {"message": message, "type": "server_error", "code": None, "param": None}}
+
+
+@pytest.mark.asyncio
+async def test_recognition_returns_model_payload(fake_api):
+    result = await ai_recognition.recognize_item_with_ai("data:image/png;base64,AAAA")
+
+    assert result == PAYLOAD
+    [request] = fake_api.requests
+    assert request["input"][0]["content"][1] == {"type": "input_image", "image_url": "data:image/png;base64,AAAA"}
+    stats = ai_recognition.recognition_stats()
+    assert stats["outcomes"]["success"] == 1
+    assert stats["attempts"] == 1
+    assert stats["latency_seconds"]["count"] == 1
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried(fake_api):
+    fake_api.script = [(503, error_body("overloaded"), 0), (429, error_body("slow down"), 0)]
+
+    result = await ai_recognition.recognize_item_with_ai("data:image/png;base64,AAAA")
+
+    assert result == PAYLOAD
+    stats = ai_recognition.recognition_stats()
+    assert stats["attempts"] == 3
+    assert stats["retries"] == 2
+    assert stats["outcomes"]["success"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded(fake_api, monkeypatch):
+    monkeypatch.setattr(ai_recognition, "AI_RECOGNITION_MAX_RETRIES", 1)
+    fake_api.script = [(429, error_body("slow down"), 0)] * 3
+
+    result = await ai_recognition.recognize_item_with_ai("data:image/png;base64,AAAA")
+
+    assert result["item"] == "unknown"
+    assert len(fake_api.requests) == 2
+    assert ai_recognition.recognition_stats()["outcomes"]["rate_limited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(fake_api):
+    fake_api.script = [(400, error_body("bad image"), 0)]
+
+    result = await ai_recognition.recognize_item_with_ai("data:image/png;base64,AAAA")
+
+    assert result["item"] == "unknown"
+    assert "bad image" in result["error"]
+    assert len(fake_api.requests) == 1
+    assert ai_recognition.recognition_stats()["outcomes"]["upstream_error"] == 1
+
+
+@pytest.mark.asyncio
+async def test_each_attempt_is_bounded_by_the_timeout(fake_api, monkeypatch):
+    monkeypatch.setattr(ai_recognition, "AI_RECOGNITION_TIMEOUT_SECONDS", 0.1)
+    monkeypatch.setattr(ai_recognition, "AI_RECOGNITION_MAX_RETRIES", 0)
+    fake_api.default = (200, responses_body(json.dumps(PAYLOAD)), 1.0)
+
+    start = time.perf_counter()
+    result = await ai_recognition.recognize_item_with_ai("data:image/png;base64,AAAA")
+
+    assert time.perf_counter() - start < 0.9
+    assert result["item"] == "unknown"
+    assert ai_recognition.recognition_stats()["outcomes"]["timeout"] == 1
+
+
+@pytest.mark.asyncio
+async def test_a_trickling_reply_is_bounded_by_the_timeout(fake_api, monkeypatch):
+    monkeypatch.setattr(ai_recognition, "AI_RECOGNITION_TIMEOUT_SECONDS", 0.3)
+    monkeypatch.setattr(ai_recognition, "AI_RECOGNITION_MAX_RETRIES", 0)
+    # each read waits 0.1 s, well within the timeout; the whole body takes over 1 s
+    fake_api.trickle = 0.1
+
+    start = time.perf_counter()
+    result = await ai_recognition.recognize_item_with_ai("data:image/png;base64,AAAA")
+
+    assert time.perf_counter() - start < 0.9
+    assert result["item"] == "unknown"
+    assert ai_recognition.recognition_stats()["outcomes"]["timeout"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unparseable_model_output_is_reported(fake_api):
+    fake_api.script = [(200, responses_body("a banana, probably"), 0)]
+
+    result = await ai_recognition.recognize_item_with_ai("data:image/png;base64,AAAA")
+
+    assert result["item"] == "unknown"
+    assert len(fake_api.requests) == 1
+    assert ai_recognition.recognition_stats()["outcomes"]["invalid_response"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_model_calls_are_capped(fake_api, monkeypatch):
+    monkeypatch.setattr(ai_recognition, "_model_calls", asyncio.Semaphore(2))
+    fake_api.default = (200, responses_body(json.dumps(PAYLOAD)), 0.1)
+
+    results = await asyncio.gather(*(ai_recognition.recognize_item_with_ai("data:,") for _ in range(6)))
+
+    assert results == [PAYLOAD] * 6
+    assert fake_api.peak_in_flight == 2
+    stats = ai_recognition.recognition_stats()
+    assert stats["peak_in_flight"] == 2
+    assert stats["queue_wait_seconds"]["max"] > 0
+
+
+@pytest.mark.asyncio
+async def test_model_call_does_not_block_the_event_loop(fake_api):
+    fake_api.default = (200, responses_body(json.dumps(PAYLOAD)), 0.3)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        assert await ai_recognition.recognize_item_with_ai("data:,") == PAYLOAD
+    finally:
+        task.cancel()
+    # a blocking call would starve the ticker for the whole round trip
+    assert ticks >= 10
@@ -7,8 +7,9 @@ from pydantic import ValidationError
 from firebase_admin import auth
 
 from app.api import deps as api_deps
-from app.data_access.user_dal import UserDAL
+from app.data_access.user_dal import AsyncUserDAL, UserDAL, user_identity_cache
 from app.schemas.firebase import FirebaseClaims
+from app.schemas.user import UserIdentity
 
 TOKEN = "token123"
 
@@ -112,8 +113,9 @@ def test_get_firebase_claims_unexpected_failure_maps_to_500(monkeypatch):
     assert e.value.detail == "Error with authentication service"
 
 
-def test_get_current_user_found(firebase_claims):
-    user_dal = create_autospec(UserDAL, instance=True)
+@pytest.mark.asyncio
+async def test_get_current_user_found(firebase_claims):
+    user_dal = create_autospec(AsyncUserDAL, instance=True)
     expected_user = {
         "user_id": 1,
         "firebase_uid": firebase_claims.uid,
@@ -121,18 +123,74 @@ def test_get_current_user_found(firebase_claims):
     }
     user_dal.get_user_by_firebase_uid.return_value = expected_user
 
-    user = api_deps.get_current_user(claims=firebase_claims, user_dal=user_dal)
+    user = await api_deps.get_current_user(claims=firebase_claims, user_dal=user_dal)
 
-    user_dal.get_user_by_firebase_uid.assert_called_once_with(firebase_claims.uid)
+    user_dal.get_user_by_firebase_uid.assert_awaited_once_with(firebase_claims.uid)
     assert user == expected_user
 
 
-def test_get_current_user_not_found_404(firebase_claims):
-    user_dal = create_autospec(UserDAL, instance=True)
+@pytest.mark.asyncio
+async def test_get_current_user_not_found_404(firebase_claims):
+    user_dal = create_autospec(AsyncUserDAL, instance=True)
     user_dal.get_user_by_firebase_uid.return_value = None
 
     with pytest.raises(HTTPException) as e:
-        api_deps.get_current_user(claims=firebase_claims, user_dal=user_dal)
+        await api_deps.get_current_user(claims=firebase_claims, user_dal=user_dal)
 
-    user_dal.get_user_by_firebase_uid.assert_called_once_with(firebase_claims.uid)
+    user_dal.get_user_by_firebase_uid.assert_awaited_once_with(firebase_claims.uid)
     assert e.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_id_cache_hit_skips_dal(firebase_claims):
+    user_dal = create_autospec(AsyncUserDAL, instance=True)
+    user_identity_cache.set(
+        firebase_claims.uid,
+        UserIdentity(user_id=7, email="user@example.com", display_name="User Name"),
+    )
+
+    user_id = await api_deps.get_current_user_id(claims=firebase_claims, user_dal=user_dal)
+
+    assert user_id == 7
+    user_dal.get_identity_by_firebase_uid.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_id_cache_miss_uses_dal(firebase_claims):
+    user_dal = create_autospec(AsyncUserDAL, instance=True)
+    user_dal.get_identity_by_firebase_uid.return_value = UserIdentity(user_id=7, email="user@example.com")
+
+    user_id = await api_deps.get_current_user_id(claims=firebase_claims, user_dal=user_dal)
+
+    user_dal.get_identity_by_firebase_uid.assert_awaited_once_with(firebase_claims.uid)
+    assert user_id == 7
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_id_not_found_404(firebase_claims):
+    user_dal = create_autospec(AsyncUserDAL, instance=True)
+    user_dal.get_identity_by_firebase_uid.return_value = None
+
+    with pytest.raises(HTTPException) as e:
+        await api_deps.get_current_user_id(claims=firebase_claims, user_dal=user_dal)
+
+    assert e.value.status_code == 404
+
+
+def test_identity_cache_follows_the_commit(db_session):
+    dal = UserDAL(db_session)
+    dal.create_user_or_get_existing(firebase_uid="uid456", email="other@example.com", display_name=None)
+    # a rolled-back insert never reaches the cache
+    assert user_identity_cache.get("uid456") is None
+    db_session.rollback()
+    assert user_identity_cache.get("uid456") is None
+
+    created, _ = dal.create_user_or_get_existing(firebase_uid="uid456", email="other@example.com", display_name=None)
+    db_session.commit()
+    assert user_identity_cache.get("uid456").user_id == created.user_id
+
+    # the cached identity stays until the delete commits
+    dal.delete_user(created)
+    assert user_identity_cache.get("uid456") is not None
+    db_session.commit()
+    assert user_identity_cache.get("uid456") is None
@@ -1,5 +1,9 @@
+import time
 from unittest.mock import Mock
 
+import pytest
+from firebase_admin import auth
+
 from app.auth import firebase
 from app.schemas.firebase import FirebaseClaims
 
@@ -15,3 +19,91 @@ def test_decode_token_ok(monkeypatch, firebase_claims_dict):
     assert claims.uid == firebase_claims_dict["uid"]
     assert claims.email == firebase_claims_dict["email"]
     assert claims.name == firebase_claims_dict["name"]
+
+
+def make_verified_claims(firebase_claims_dict, *, expires_in: float = 3600) -> dict:
+    return {**firebase_claims_dict, "exp": time.time() + expires_in}
+
+
+def test_decode_token_caches_verified_claims(monkeypatch, firebase_claims_dict):
+    mock_verify_id_token = Mock(return_value=make_verified_claims(firebase_claims_dict))
+    monkeypatch.setattr(firebase.auth, "verify_id_token", mock_verify_id_token)
+
+    first = firebase.decode_token("token123")
+    second = firebase.decode_token("token123")
+
+    mock_verify_id_token.assert_called_once_with("token123", check_revoked=True)
+    assert first == second
+    stats = firebase.claims_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_decode_token_does_not_cache_expired_token(monkeypatch, firebase_claims_dict):
+    mock_verify_id_token = Mock(return_value=make_verified_claims(firebase_claims_dict, expires_in=-1))
+    monkeypatch.setattr(firebase.auth, "verify_id_token", mock_verify_id_token)
+
+    firebase.decode_token("token123")
+    firebase.decode_token("token123")
+
+    assert mock_verify_id_token.call_count == 2
+    assert len(firebase.claims_cache) == 0
+
+
+def test_decode_token_rechecks_revocation_after_interval(monkeypatch, firebase_claims_dict):
+    mock_verify_id_token = Mock(return_value=make_verified_claims(firebase_claims_dict))
+    monkeypatch.setattr(firebase.auth, "verify_id_token", mock_verify_id_token)
+    monkeypatch.setattr(firebase, "FIREBASE_REVOCATION_CHECK_INTERVAL_SECONDS", 0)
+
+    firebase.decode_token("token123")
+    firebase.decode_token("token123")
+
+    assert mock_verify_id_token.call_count == 2
+
+
+def test_decode_token_evicts_when_recheck_finds_revocation(monkeypatch, firebase_claims_dict):
+    revoked = auth.RevokedIdTokenError("revoked")
+    mock_verify_id_token = Mock(side_effect=[make_verified_claims(firebase_claims_dict), revoked])
+    monkeypatch.setattr(firebase.auth, "verify_id_token", mock_verify_id_token)
+    monkeypatch.setattr(firebase, "FIREBASE_REVOCATION_CHECK_INTERVAL_SECONDS", 0)
+
+    firebase.decode_token("token123")
+    with pytest.raises(auth.RevokedIdTokenError):
+        firebase.decode_token("token123")
+
+    assert len(firebase.claims_cache) == 0
+
+
+def test_background_recheck_keeps_entry_on_transport_error(monkeypatch, firebase_claims_dict):
+    unreachable = auth.CertificateFetchError("could not fetch certificates", cause=None)
+    mock_verify_id_token = Mock(side_effect=[make_verified_claims(firebase_claims_dict), unreachable])
+    monkeypatch.setattr(firebase.auth, "verify_id_token", mock_verify_id_token)
+    monkeypatch.setattr(firebase, "FIREBASE_REVOCATION_CHECK_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(firebase, "FIREBASE_REVOCATION_CHECK_MODE", "background")
+
+    firebase.decode_token("token123")
+    claims = firebase.decode_token("token123")
+    # the executor has one worker: once this runs, the re-check has finished
+    firebase._revocation_executor.submit(lambda: None).result()
+
+    assert mock_verify_id_token.call_count == 2
+    assert claims.uid == firebase_claims_dict["uid"]
+    # the failed re-check says nothing about the token; it stays cached and due for another check
+    assert firebase.claims_cache.get(firebase.token_digest("token123")) is not None
+
+
+def test_invalidate_user_tokens_drops_only_that_user(monkeypatch, firebase_claims_dict):
+    other_claims = {**firebase_claims_dict, "uid": "other-uid"}
+    mock_verify_id_token = Mock(side_effect=[
+        make_verified_claims(firebase_claims_dict),
+        make_verified_claims(other_claims),
+    ])
+    monkeypatch.setattr(firebase.auth, "verify_id_token", mock_verify_id_token)
+
+    firebase.decode_token("token123")
+    firebase.decode_token("token456")
+    removed = firebase.invalidate_user_tokens(firebase_claims_dict["uid"])
+
+    assert removed == 1
+    assert firebase.claims_cache.get(firebase.token_digest("token123")) is None
+    assert firebase.claims_cache.get(firebase.token_digest("token456")) is not None
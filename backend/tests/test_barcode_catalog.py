@@ -0,0 +1,180 @@
+import gzip
+import json
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.commands import barcode_catalog as command
+from app.data_access.catalog_dal import CatalogDAL
+from app.models.catalog_product import CatalogProduct
+from app.models.product import Product
+from app.services.barcode_catalog import barcode_forms, catalog_row, iter_dump_records, normalize_barcode
+
+CEREAL = {
+    "code": "0049000028911",
+    "product_name": "",
+    "product_name_en": "Corn Flakes",
+    "brands": "Kellogg's, Kellanova",
+    "quantity": "500 g",
+    "serving_size": "30 g",
+    "pnns_groups_1": "Cereals and potatoes",
+    "pnns_groups_2": "Breakfast cereals",
+    "categories_tags": ["en:breakfasts", "en:cereals"],
+    "packaging": "Cardboard box",
+    "packaging_tags": ["en:box"],
+    "image_url": "https://images.openfoodfacts.org/cornflakes.jpg",
+    "last_modified_t": 1700000000,
+    "ingredients_text": "corn, sugar, salt",
+}
+
+TSV_HEADER = "code\tproduct_name\tbrands\tquantity\tcategories_tags\tpackaging_tags\tlast_modified_t\n"
+
+
+@pytest.mark.parametrize("code, expected", [
+    ("049000028911", "0049000028911"),  # UPC-A -> EAN-13
+    ("0049000028911", "0049000028911"),
+    ("000049000028911", None),  # too long
+    ("96385074", "96385074"),  # EAN-8
+    (" 3017620422003 ", "3017620422003"),
+    ("30176-20422", None),
+    ("0000", None),
+])
+def test_normalize_barcode(code, expected):
+    assert normalize_barcode(code) == expected
+
+
+def test_barcode_forms():
+    assert barcode_forms("0049000028911") == [
+        "49000028911", "049000028911", "0049000028911", "00049000028911",
+    ]
+    assert barcode_forms("96385074") == ["96385074", "000096385074", "0000096385074", "00000096385074"]
+
+
+def test_catalog_row_keeps_the_form_fields():
+    assert catalog_row(CEREAL) == {
+        "barcode": "0049000028911",
+        "name": "Corn Flakes",
+        "brand": "Kellogg's",
+        "quantity": "500 g",
+        "serving_size": "30 g",
+        "pnns_groups_1": "Cereals and potatoes",
+        "pnns_groups_2": "Breakfast cereals",
+        "categories_tags": "en:breakfasts,en:cereals",
+        "packaging": "Cardboard box",
+        "packaging_tags": "en:box",
+        "image_url": "https://images.openfoodfacts.org/cornflakes.jpg",
+        "last_modified_t": 1700000000,
+    }
+    assert catalog_row({"code": "3017620422003"}) is None
+    assert catalog_row({"code": "abc", "product_name": "Nameless code"}) is None
+
+
+def test_reads_gzipped_jsonl_dumps(tmp_path):
+    path = tmp_path / "openfoodfacts-products.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps(CEREAL) + "\n{not json\n\n" + json.dumps({"code": "96385074", "product_name": "Gum"}) + "\n")
+
+    assert [record["code"] for record in iter_dump_records(str(path))] == ["0049000028911", "96385074"]
+
+
+def test_reads_the_tab_separated_csv_export(tmp_path):
+    path = tmp_path / "en.openfoodfacts.org.products.csv"
+    path.write_text(
+        TSV_HEADER + '3017620422003\tNutella "original"\tFerrero\t400 g\ten:spreads,en:sweet-spreads\ten:jar\t1690000000\n'
+    )
+
+    [record] = iter_dump_records(str(path))
+    row = catalog_row(record)
+
+    assert row["name"] == 'Nutella "original"'
+    assert row["categories_tags"] == "en:spreads,en:sweet-spreads"
+    assert row["last_modified_t"] == 1690000000
+
+
+def test_upsert_keeps_the_newest_data(db_session):
+    dal = CatalogDAL(db_session)
+    row = catalog_row(CEREAL)
+    dal.upsert_many([row])
+    dal.upsert_many([{**row, "name": "Old Corn Flakes", "last_modified_t": 1600000000}])
+    dal.upsert_many([{**row, "name": "Corn Flakes 2", "last_modified_t": 1800000000}, {**row, "name": "Dup"}])
+    db_session.expire_all()
+
+    assert dal.get_by_barcode("0049000028911").name == "Dup"
+
+
+def test_import_command_streams_the_dump_in_batches(db_engine, db_session, tmp_path, monkeypatch, capsys):
+    path = tmp_path / "dump.jsonl"
+    path.write_text("".join(
+        json.dumps({"code": f"{4000000000000 + i}", "product_name": f"product {i}", "last_modified_t": 1}) + "\n"
+        for i in range(5)
+    ) + json.dumps({"code": "", "product_name": "no code"}) + "\n")
+    monkeypatch.setattr(command, "SessionLocal", sessionmaker(bind=db_engine))
+
+    assert command.main(["import", str(path), "--batch-size", "2"]) == 0
+
+    assert db_session.query(CatalogProduct).count() == 5
+    assert "5 rows from 6 records (1 without barcode or name)" in capsys.readouterr().out
+
+
+def test_lookup_serves_catalog_entries(client, db_session):
+    CatalogDAL(db_session).upsert_many([catalog_row(CEREAL)])
+
+    # a scanner reading the UPC-A form finds the EAN-13 entry
+    response = client.get("/catalog/barcode/049000028911")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("private, max-age=")
+    body = response.json()
+    assert body["source"] == "catalog"
+    assert body["barcode"] == "0049000028911"
+    assert body["brand"] == "Kellogg's"
+    assert body["categories_tags"] == ["en:breakfasts", "en:cereals"]
+    assert body["product_id"] is None
+
+
+def test_lookup_falls_back_to_the_users_products(client, db_session, user):
+    product = Product(user_id=user.user_id, name="Farm eggs", brand="Local", size="12", type="packaged",
+                      barcode="2000000000015")
+    db_session.add(product)
+    db_session.flush()
+
+    response = client.get("/catalog/barcode/2000000000015")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "source": "product",
+        "product_id": product.id,
+        "barcode": "2000000000015",
+        "name": "Farm eggs",
+        "brand": "Local",
+        "quantity": "12",
+        "serving_size": None,
+        "pnns_groups_1": None,
+        "pnns_groups_2": None,
+        "categories_tags": [],
+        "packaging": None,
+        "packaging_tags": [],
+        "image_url": None,
+    }
+    assert "cache-control" not in response.headers
+
+
+@pytest.mark.parametrize("saved, scanned", [
+    ("049000028911", "0049000028911"),  # saved as UPC-A, scanned as EAN-13
+    ("0049000028911", "049000028911"),
+])
+def test_product_fallback_matches_leading_zero_forms(client, db_session, user, saved, scanned):
+    product = Product(user_id=user.user_id, name="Cola", type="packaged", barcode=saved)
+    db_session.add(product)
+    db_session.flush()
+
+    response = client.get(f"/catalog/barcode/{scanned}")
+
+    assert response.status_code == 200
+    assert response.json()["product_id"] == product.id
+    assert response.json()["barcode"] == saved
+
+
+def test_lookup_unknown_and_invalid_barcodes(client):
+    assert client.get("/catalog/barcode/5000000000000").status_code == 404
+    assert client.get("/catalog/barcode/not-a-code").status_code == 400
@@ -0,0 +1,141 @@
+import pytest
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+
+from app.data_access.category_dal import CategoryDAL, CategorySnapshotCache, category_snapshot_cache
+from app.models.category import Category
+from app.models.product import Product
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def categories(db_session) -> dict[str, Category]:
+    rows = {name: Category(category_name=name) for name in ("Produce", "Dairy", "Bakery")}
+    db_session.add_all(rows.values())
+    db_session.flush()
+    return rows
+
+
+@pytest.fixture
+def snapshots(monkeypatch) -> tuple[CategorySnapshotCache, FakeClock]:
+    clock = FakeClock()
+    cache = CategorySnapshotCache(check_seconds=5, clock=clock)
+    monkeypatch.setattr("app.data_access.category_dal.category_snapshot_cache", cache)
+    return cache, clock
+
+
+def test_snapshot_is_reused_until_the_version_changes(db_session, categories, snapshots, statements):
+    cache, clock = snapshots
+    dal = CategoryDAL(db_session)
+
+    first = dal.get_snapshot()
+    assert [c.category_name for c in first.categories] == ["Bakery", "Dairy", "Produce"]
+    assert first.names[categories["Dairy"].category_id] == "Dairy"
+
+    # within the check window: no queries at all
+    statements.clear()
+    assert dal.get_snapshot() is first
+    assert statements == []
+
+    # past it: one version query, same snapshot
+    clock.now = 10
+    assert dal.get_snapshot() is first
+    assert len(statements) == 1
+    assert cache.stats()["reloads"] == 1
+
+    db_session.execute(delete(Category).where(Category.category_id == categories["Bakery"].category_id))
+    clock.now = 20
+    second = dal.get_snapshot()
+    assert second is not first
+    assert second.etag != first.etag
+    assert [c.category_name for c in second.categories] == ["Dairy", "Produce"]
+    assert cache.stats()["reloads"] == 2
+
+
+def test_renames_change_the_version(db_session, categories, snapshots):
+    _, clock = snapshots
+    dal = CategoryDAL(db_session)
+    before = dal.get_version()
+
+    # updated_at is left as it was: the version must not depend on it
+    db_session.execute(
+        update(Category)
+        .where(Category.category_id == categories["Dairy"].category_id)
+        .values(category_name="Dairy & Eggs")
+    )
+    clock.now = 10
+
+    assert dal.get_version() != before
+    assert "Dairy & Eggs" in dal.get_snapshot().names.values()
+
+
+def test_version_changes_when_a_change_commits_on_postgres(pg_engine):
+    with Session(pg_engine) as writer, Session(pg_engine) as reader:
+        writer.add(Category(category_name="Dairy"))
+        writer.commit()
+        before = CategoryDAL(reader).get_version()
+        reader.commit()
+
+        # the trigger's bump is part of the writer's transaction: invisible until it commits
+        writer.execute(update(Category).values(category_name="Dairy & Eggs"))
+        assert CategoryDAL(reader).get_version() == before
+        reader.commit()
+        writer.commit()
+
+        assert CategoryDAL(reader).get_version() != before
+
+
+def test_get_categories_sends_etag_and_304(client, categories):
+    response = client.get("/categories/")
+
+    assert response.status_code == 200
+    assert [c["category_name"] for c in response.json()] == ["Bakery", "Dairy", "Produce"]
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    cached = client.get("/categories/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+
+def test_product_list_embeds_category_names(client, db_session, user, categories):
+    db_session.add_all([
+        Product(user_id=user.user_id, name="apples", type="fruit", category_id=categories["Produce"].category_id),
+        Product(user_id=user.user_id, name="mystery", type="packaged"),
+    ])
+    db_session.flush()
+
+    plain = client.get("/products/").json()
+    embedded = client.get("/products/", params={"include_category_name": True}).json()
+
+    assert all("category_name" not in p for p in plain)
+    assert [(p["name"], p["category_name"]) for p in embedded] == [("apples", "Produce"), ("mystery", None)]
+    assert [{k: v for k, v in p.items() if k != "category_name"} for p in embedded] == plain
+
+
+def test_product_list_documents_category_name(client):
+    openapi = client.get("/openapi.json").json()
+    listed = openapi["paths"]["/products/"]["get"]["responses"]["200"]["content"]["application/json"]
+
+    assert listed["schema"]["items"]["$ref"] == "#/components/schemas/ProductWithCategoryRead"
+    assert "category_name" in openapi["components"]["schemas"]["ProductWithCategoryRead"]["properties"]
+
+
+def test_product_list_etag_follows_the_categories_version(client, db_session, user, categories):
+    db_session.add(Product(user_id=user.user_id, name="apples", type="fruit"))
+    db_session.flush()
+    etag = client.get("/products/").headers["ETag"]
+
+    db_session.add(Category(category_name="Frozen"))
+    db_session.flush()
+    # a new snapshot is only picked up after the check window
+    category_snapshot_cache.clear()
+
+    assert client.get("/products/", headers={"If-None-Match": etag}).status_code == 200
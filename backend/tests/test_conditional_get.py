@@ -0,0 +1,91 @@
+from datetime import date
+
+import pytest
+
+from app.api.deps import etag_matches
+from app.models.grocery_run import GroceryRun
+from app.models.product import Product
+
+
+@pytest.fixture
+def run(db_session, user) -> GroceryRun:
+    run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+    db_session.add(run)
+    db_session.flush()
+    return run
+
+
+@pytest.fixture
+def product(db_session, user) -> Product:
+    product = Product(user_id=user.user_id, name="milk", type="packaged")
+    db_session.add(product)
+    db_session.flush()
+    return product
+
+
+def test_matching_etag_is_304_without_the_list_query(client, statements, product):
+    first = client.get("/products/")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    statements.clear()
+    cached = client.get("/products/", headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    # only the collection version lookup
+    assert len(statements) == 1
+    assert "collection_versions" in statements[0]
+
+
+def test_etag_depends_on_the_request(client, product):
+    listing = client.get("/products/").headers["ETag"]
+    page = client.get("/products/", params={"limit": 1}).headers["ETag"]
+    detail = client.get(f"/products/{product.id}").headers["ETag"]
+
+    assert len({listing, page, detail}) == 3
+    assert client.get("/products/", params={"limit": 1}, headers={"If-None-Match": listing}).status_code == 200
+
+
+def test_writes_change_the_etag(client, run, product):
+    products = client.get("/products/").headers["ETag"]
+    runs = client.get("/grocery-runs/").headers["ETag"]
+    batches = client.get("/inventory-batches/").headers["ETag"]
+
+    client.post("/products/", json={"name": "eggs", "type": "packaged"})
+    assert client.get("/products/", headers={"If-None-Match": products}).status_code == 200
+
+    # a batch write changes the batch summary embedded in grocery runs too
+    created = client.post(
+        "/inventory-batches/",
+        json={"grocery_run_id": run.id, "product_id": product.id, "quantity_added": "2"},
+    ).json()
+    assert client.get("/inventory-batches/", headers={"If-None-Match": batches}).status_code == 200
+    assert client.get("/grocery-runs/", headers={"If-None-Match": runs}).status_code == 200
+
+    batches = client.get("/inventory-batches/").headers["ETag"]
+    assert client.delete(f"/inventory-batches/{created['id']}").status_code == 204
+    assert client.get("/inventory-batches/", headers={"If-None-Match": batches}).status_code == 200
+
+
+def test_failed_writes_keep_the_etag(client, product):
+    etag = client.get("/products/").headers["ETag"]
+
+    assert client.patch("/products/9999", json={"brand": "acme"}).status_code == 404
+    assert client.get("/products/", headers={"If-None-Match": etag}).status_code == 304
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ('W/"abc"', True),
+        ('"abc"', True),
+        ('W/"other", W/"abc"', True),
+        ("*", True),
+        ('W/"other"', False),
+    ],
+)
+def test_etag_matches(header, expected):
+    assert etag_matches(header, 'W/"abc"') is expected
@@ -0,0 +1,62 @@
+from app.core.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_returns_value_until_ttl_elapses():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_per_entry_ttl_is_capped_by_cache_ttl():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1, ttl_seconds=60)
+
+    clock.now = 5.0
+    assert cache.get("a") is None
+
+
+def test_non_positive_ttl_is_not_stored():
+    cache = TTLCache(max_size=10, ttl_seconds=5)
+    cache.set("a", 1, ttl_seconds=0)
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # touch "a" so "b" becomes the least recently used
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_discard_where_removes_matching_values():
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert cache.discard_where(lambda value: value % 2 == 1) == 2
+    assert cache.get("b") == 2
+    assert len(cache) == 1
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.db import pool as db_pool
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=db_pool.InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    db_pool.instrument_engine(engine, "test")
+    yield engine
+    db_pool._registry.pop("test", None)
+    engine.dispose()
+
+
+def test_checkouts_and_waits_are_recorded(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        stats = db_pool.pool_stats()["test"]
+        assert stats["in_use"] == 1
+
+    stats = db_pool.pool_stats()["test"]
+    assert stats["connects"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["checkins"] == 1
+    assert stats["in_use"] == 0
+    assert stats["peak_in_use"] == 1
+    assert stats["checkout_wait_seconds"]["count"] == 1
+
+
+def test_pool_timeout_is_counted(engine):
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    assert db_pool.pool_stats()["test"]["timeouts"] == 1
+
+
+def test_idle_connections_are_pinged_on_checkout(engine, monkeypatch):
+    monkeypatch.setattr(db_pool, "DB_POOL_PRE_PING", "idle")
+    monkeypatch.setattr(db_pool, "DB_POOL_PRE_PING_IDLE_SECONDS", 0)
+
+    with engine.connect():
+        pass
+    with engine.connect():
+        pass
+
+    # the first checkout is a fresh connection; only the reused one is pinged
+    assert db_pool.pool_stats()["test"]["pings"] == 1
+
+
+def test_metrics_survive_dispose(engine):
+    with engine.connect():
+        pass
+    engine.dispose()
+    with engine.connect():
+        pass
+
+    assert db_pool.pool_stats()["test"]["checkouts"] == 2
+
+
+def test_engine_options_sets_statement_timeout_per_driver(monkeypatch):
+    monkeypatch.setattr(db_pool, "DB_STATEMENT_TIMEOUT_MS", 5000)
+
+    sync_options = db_pool.engine_options("postgresql+psycopg2://u:p@localhost/db")
+    async_options = db_pool.engine_options("postgresql+asyncpg://u:p@localhost/db", is_async=True)
+
+    assert sync_options["connect_args"] == {"options": "-c statement_timeout=5000"}
+    assert async_options["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+    assert async_options["poolclass"] is db_pool.InstrumentedAsyncAdaptedQueuePool
@@ -0,0 +1,73 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from app.data_access.grocery_run_dal import GroceryRunDAL
+from app.models.grocery_run import GroceryRun
+from app.models.inventory_batch import InventoryBatch
+from app.models.product import Product
+
+
+@pytest.fixture
+def runs(db_session, user) -> list[GroceryRun]:
+    product = Product(user_id=user.user_id, name="milk", type="packaged")
+    runs = [GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1 + i)) for i in range(5)]
+    db_session.add_all([product, *runs])
+    db_session.flush()
+    for run in runs:
+        db_session.add_all([
+            InventoryBatch(
+                grocery_run_id=run.id, product_id=product.id, quantity_added=Decimal("1"),
+                expired_at=datetime(2026, 2, run.trip_date.day),
+            ),
+            InventoryBatch(
+                grocery_run_id=run.id, product_id=product.id, quantity_added=Decimal("1"),
+                expired_at=datetime(2026, 1, run.trip_date.day), completed_at=datetime(2026, 1, 1),
+            ),
+        ])
+    db_session.flush()
+    db_session.expunge_all()
+    return runs
+
+
+def test_relationships_raise_instead_of_lazy_loading(db_session, user, runs):
+    run = GroceryRunDAL(db_session).get_by_id(user_id=user.user_id, grocery_run_id=runs[0].id)
+
+    with pytest.raises(InvalidRequestError):
+        run.inventory_batches
+
+
+def test_list_is_one_query_with_summaries(client, statements, runs):
+    statements.clear()
+    response = client.get("/grocery-runs/")
+
+    assert response.status_code == 200
+    # the collection version lookup for the ETag, then the list itself
+    assert len(statements) == 2
+    first = response.json()[0]
+    assert first["inventory_batches"] is None
+    assert first["batch_summary"] == {
+        "batch_count": 2,
+        "open_batch_count": 1,
+        "next_expiry_at": "2026-02-05T00:00:00",
+    }
+
+
+def test_include_inventory_batches_adds_one_query(client, statements, runs):
+    statements.clear()
+    response = client.get("/grocery-runs/", params={"include": "inventory_batches"})
+
+    assert response.status_code == 200
+    assert len(statements) == 3
+    assert all(len(run["inventory_batches"]) == 2 for run in response.json())
+
+
+def test_detail_include_inventory_batches(client, runs):
+    plain = client.get(f"/grocery-runs/{runs[0].id}").json()
+    embedded = client.get(f"/grocery-runs/{runs[0].id}", params={"include": "inventory_batches"}).json()
+
+    assert plain["inventory_batches"] is None
+    assert plain["batch_summary"]["batch_count"] == 2
+    assert [b["grocery_run_id"] for b in embedded["inventory_batches"]] == [runs[0].id] * 2
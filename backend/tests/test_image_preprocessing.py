@@ -0,0 +1,170 @@
+import io
+import os
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import ExifTags, Image
+
+from app.api import uploads
+from app.api.routes import recognizeItem
+from app.core.exceptions import ImageProcessingError
+from app.services.image_preprocessing import prepare_image
+
+
+def encode(image: Image.Image, format: str, **params) -> bytes:
+    out = io.BytesIO()
+    image.save(out, format=format, **params)
+    return out.getvalue()
+
+
+def decode(prepared_bytes: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(prepared_bytes))
+    image.load()
+    return image
+
+
+def test_large_photo_is_downscaled_to_the_model_resolution():
+    raw = encode(Image.new("RGB", (3000, 2000), (200, 180, 40)), "JPEG", quality=95)
+
+    prepared = prepare_image(raw)
+
+    assert (prepared.width, prepared.height) == (1152, 768)
+    assert prepared.content_type == "image/jpeg"
+    assert decode(prepared.data).size == (1152, 768)
+    assert prepared.data_url().startswith("data:image/jpeg;base64,")
+
+
+def test_small_images_are_not_upscaled():
+    prepared = prepare_image(encode(Image.new("RGB", (120, 90), "red"), "PNG"))
+
+    assert decode(prepared.data).size == (120, 90)
+
+
+def test_exif_orientation_is_applied_and_metadata_stripped():
+    image = Image.new("RGB", (300, 200), "blue")
+    image.paste((255, 0, 0), (0, 0, 30, 30))  # marker in the top-left corner
+    exif = Image.Exif()
+    exif[ExifTags.Base.Orientation] = 6  # rotate 90 degrees clockwise for display
+    exif[ExifTags.Base.Make] = "PhoneCo"
+    exif[ExifTags.Base.GPSInfo] = {ExifTags.GPS.GPSLatitudeRef: "N"}
+
+    prepared = prepare_image(encode(image, "JPEG", exif=exif))
+
+    result = decode(prepared.data)
+    assert result.size == (200, 300)
+    # after the clockwise turn the marker sits in the top-right corner
+    assert result.getpixel((190, 10))[0] > 200
+    assert len(result.getexif()) == 0
+    assert "exif" not in result.info and "icc_profile" not in result.info
+
+
+def test_transparent_png_is_flattened_onto_white():
+    image = Image.new("RGBA", (40, 40), (0, 0, 0, 0))
+    image.paste((0, 128, 0, 255), (0, 0, 20, 40))
+
+    result = decode(prepare_image(encode(image, "PNG")).data)
+
+    assert result.mode == "RGB"
+    assert min(result.getpixel((35, 20))) > 240
+    assert result.getpixel((5, 20))[1] > 100
+
+
+@pytest.mark.parametrize("raw", [
+    b"definitely not an image",
+    encode(Image.new("RGB", (10, 10)), "GIF"),
+])
+def test_undecodable_or_unsupported_images_are_rejected(raw):
+    with pytest.raises(ImageProcessingError):
+        prepare_image(raw)
+
+
+@pytest.mark.asyncio
+async def test_read_upload_rejects_from_the_recorded_size():
+    upload = UploadFile(io.BytesIO(b"x" * 10_000), size=10_000)
+
+    async def fail(size: int = -1) -> bytes:
+        raise AssertionError("the file must not be read")
+
+    upload.read = fail
+
+    with pytest.raises(HTTPException) as e:
+        await uploads.read_upload(upload, 3000)
+
+    assert e.value.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_read_upload_without_a_size_reads_at_most_past_the_limit():
+    with pytest.raises(HTTPException) as e:
+        await uploads.read_upload(UploadFile(io.BytesIO(b"x" * 10_000)), 3000)
+
+    assert e.value.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_read_upload_returns_the_whole_file_within_the_limit():
+    assert await uploads.read_upload(UploadFile(io.BytesIO(b"x" * 5000)), 5000) == b"x" * 5000
+
+
+def test_oversized_upload_is_rejected_from_its_content_length(client, monkeypatch):
+    async def fail(*args):
+        raise AssertionError("the body must not be read")
+
+    monkeypatch.setattr(recognizeItem, "read_upload", fail)
+    size = recognizeItem.MAX_FILE_SIZE + uploads.MULTIPART_OVERHEAD + 1
+    files = {"image": ("big.jpg", os.urandom(size), "image/jpeg")}
+
+    response = client.post("/recognize-item/", files=files)
+
+    assert response.status_code == 413
+
+
+def test_chunked_upload_is_rejected_while_receiving(client, monkeypatch):
+    async def fail(*args):
+        raise AssertionError("the endpoint must not run")
+
+    monkeypatch.setattr(recognizeItem, "recognize_upload", fail)
+    boundary = "limit"
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="image"; filename="big.jpg"\r\n'
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode() + os.urandom(recognizeItem.MAX_FILE_SIZE + uploads.MULTIPART_OVERHEAD) + f"\r\n--{boundary}--\r\n".encode()
+
+    def stream():
+        for start in range(0, len(body), 64 * 1024):
+            yield body[start:start + 64 * 1024]
+
+    # a generator body goes out chunked, without a Content-Length
+    response = client.post(
+        "/recognize-item/",
+        content=stream(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+
+    assert response.status_code == 413
+    assert response.json()["detail"] == "Upload too large. The maximum size is 2MB"
+
+
+def test_upload_just_over_the_limit_is_rejected_while_reading(client, monkeypatch):
+    async def fail(data_url):
+        raise AssertionError("model must not be called")
+
+    monkeypatch.setattr(recognizeItem, "recognize_item_with_ai", fail)
+    files = {"image": ("big.jpg", os.urandom(recognizeItem.MAX_FILE_SIZE + 1), "image/jpeg")}
+
+    response = client.post("/recognize-item/", files=files)
+
+    assert response.status_code == 413
+    assert response.json()["detail"] == "Upload too large. The maximum size is 2MB"
+
+
+def test_undecodable_upload_is_a_bad_request(client, monkeypatch):
+    async def fail(data_url):
+        raise AssertionError("model must not be called")
+
+    monkeypatch.setattr(recognizeItem, "recognize_item_with_ai", fail)
+
+    response = client.post("/recognize-item/", files={"image": ("x.png", b"not a png", "image/png")})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Could not decode image"
@@ -0,0 +1,120 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.data_access.inventory_batch_dal import InventoryBatchDAL
+from app.models.grocery_run import GroceryRun
+from app.models.product import Product
+from app.models.user import User
+from app.models.inventory_batch import InventoryBatch
+from app.schemas.inventory_batch import InventoryBatchBulkUpdateItem, InventoryBatchCreate
+
+
+def make_item(run, product, **overrides) -> InventoryBatchCreate:
+    fields = {"grocery_run_id": run.id, "product_id": product.id, "quantity_added": Decimal("2")}
+    fields.update(overrides)
+    return InventoryBatchCreate(**fields)
+
+
+def test_create_many_creates_valid_items_and_reports_the_rest(db_session, user, statements):
+    other = User(firebase_uid="other", email="other@example.com", display_name=None)
+    db_session.add(other)
+    db_session.flush()
+    run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+    product = Product(user_id=user.user_id, name="milk", type="packaged", default_storage_location="fridge")
+    foreign_run = GroceryRun(user_id=other.user_id, trip_date=date(2026, 1, 1))
+    db_session.add_all([run, product, foreign_run])
+    db_session.flush()
+
+    items = [
+        make_item(run, product),
+        make_item(foreign_run, product),
+        make_item(run, product, quantity_used=Decimal("5")),
+        make_item(run, product, quantity_used=Decimal("2"), storage_location="freezer"),
+    ]
+    statements.clear()
+
+    created, errors = InventoryBatchDAL(db_session).create_many(user_id=user.user_id, items=items)
+
+    # two ownership SELECTs + the INSERT, then the product_stock and waste_rollups refreshes
+    # (DELETE + INSERT each) and the collection version bump. Returning rows in input order
+    # needs a sentinel SQLite lacks, so SQLAlchemy sends one INSERT per row here; Postgres
+    # gets a single INSERT (see test_create_many_is_one_ordered_insert_on_postgres)
+    assert len(statements) == 7 + len(created)
+    assert sorted(errors) == [1, 2]
+    assert errors[1] == "Referenced resource not found"
+    assert [b.storage_location for b in created] == ["fridge", "freezer"]
+    assert created[0].completed_at is None
+    assert created[1].completed_at is not None
+    assert created[1].quantity_current == Decimal("0")
+
+
+
+def test_create_many_is_one_ordered_insert_on_postgres(pg_engine):
+    with Session(pg_engine, autoflush=False) as session:
+        user = User(firebase_uid="uid123", email="user@example.com")
+        session.add(user)
+        session.flush()
+        run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+        products = [Product(user_id=user.user_id, name=f"product {i}", type="packaged") for i in range(5)]
+        session.add_all([run, *products])
+        session.flush()
+        items = [make_item(run, products[i % 5], quantity_added=Decimal(i + 1)) for i in range(40)]
+        inserts = []
+        event.listen(
+            pg_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: inserts.append(statement)
+            if statement.startswith("INSERT INTO inventory_batches") else None,
+        )
+
+        created, errors = InventoryBatchDAL(session).create_many(user_id=user.user_id, items=items)
+
+        assert errors == {}
+        assert len(inserts) == 1
+        assert [batch.quantity_added for batch in created] == [item.quantity_added for item in items]
+
+def test_update_many_applies_patches_in_one_statement(db_session, user, statements):
+    other = User(firebase_uid="other", email="other@example.com", display_name=None)
+    db_session.add(other)
+    db_session.flush()
+    run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+    foreign_run = GroceryRun(user_id=other.user_id, trip_date=date(2026, 1, 1))
+    product = Product(user_id=user.user_id, name="milk", type="packaged")
+    db_session.add_all([run, foreign_run, product])
+    db_session.flush()
+    mine = [
+        InventoryBatch(grocery_run_id=run.id, product_id=product.id, quantity_added=Decimal("3"), quantity_used=Decimal("1"))
+        for _ in range(4)
+    ]
+    foreign = InventoryBatch(grocery_run_id=foreign_run.id, product_id=product.id, quantity_added=Decimal("3"))
+    db_session.add_all([*mine, foreign])
+    db_session.flush()
+
+    items = [
+        InventoryBatchBulkUpdateItem(id=mine[1].id, quantity_used=Decimal("1"), quantity_spoiled=Decimal("1")),
+        InventoryBatchBulkUpdateItem(id=mine[0].id, mode="absolute", quantity_disposed=Decimal("1")),
+        InventoryBatchBulkUpdateItem(id=mine[2].id, quantity_used=Decimal("5")),
+        InventoryBatchBulkUpdateItem(id=foreign.id, quantity_used=Decimal("1")),
+        InventoryBatchBulkUpdateItem(id=mine[3].id, quantity_used=Decimal("1")),
+        InventoryBatchBulkUpdateItem(id=mine[3].id, quantity_used=Decimal("1")),
+    ]
+    statements.clear()
+
+    updated, errors = InventoryBatchDAL(db_session).update_many(user_id=user.user_id, items=items)
+
+    # the UPDATE, the product_stock and waste_rollups refreshes (DELETE + INSERT each),
+    # the collection version bump, plus one SELECT to classify the rejected ids
+    assert len(statements) == 7
+    assert [b.id for b in updated] == [mine[1].id, mine[0].id]
+    assert (updated[0].quantity_used, updated[0].quantity_spoiled) == (Decimal("2"), Decimal("1"))
+    assert updated[0].quantity_current == Decimal("0")
+    assert updated[0].completed_at is not None
+    assert (updated[1].quantity_used, updated[1].quantity_disposed) == (Decimal("1"), Decimal("1"))
+    assert updated[1].completed_at is None
+    assert errors[foreign.id] == "Inventory batch not found"
+    assert errors[mine[3].id] == "Duplicate id in request"
+    assert errors[mine[2].id].startswith("Quantities must be >= 0")
+    assert db_session.get(InventoryBatch, mine[2].id).quantity_used == Decimal("1")
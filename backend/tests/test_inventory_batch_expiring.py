@@ -0,0 +1,54 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app.data_access.inventory_batch_dal import InventoryBatchDAL
+from app.models.grocery_run import GroceryRun
+from app.models.inventory_batch import InventoryBatch
+from app.models.product import Product
+from app.models.user import User
+
+
+def test_get_expiring_returns_open_batches_in_window(db_session, user):
+    other = User(firebase_uid="other", email="other@example.com", display_name=None)
+    product = Product(user_id=user.user_id, name="milk", type="packaged")
+    db_session.add_all([other, product])
+    db_session.flush()
+    run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+    foreign_run = GroceryRun(user_id=other.user_id, trip_date=date(2026, 1, 1))
+    db_session.add_all([run, foreign_run])
+    db_session.flush()
+
+    now = datetime.now(timezone.utc)
+    def batch(days: float, *, grocery_run=run, completed: bool = False) -> InventoryBatch:
+        return InventoryBatch(
+            grocery_run_id=grocery_run.id,
+            product_id=product.id,
+            quantity_added=Decimal("1"),
+            expired_at=now + timedelta(days=days),
+            completed_at=now if completed else None,
+        )
+    later, soon, expired, completed, beyond, foreign = batches = [
+        batch(2), batch(1), batch(-1), batch(1, completed=True), batch(10), batch(1, grocery_run=foreign_run),
+    ]
+    no_expiry = InventoryBatch(grocery_run_id=run.id, product_id=product.id, quantity_added=Decimal("1"))
+    db_session.add_all([*batches, no_expiry])
+    db_session.flush()
+    dal = InventoryBatchDAL(db_session)
+
+    assert [b.id for b in dal.get_expiring(user_id=user.user_id, days=3)] == [soon.id, later.id]
+    assert [b.id for b in dal.get_expiring(user_id=user.user_id, days=3, include_expired=True)] == [
+        expired.id, soon.id, later.id,
+    ]
+
+
+def test_get_expiring_uses_the_open_batch_index(db_engine, db_session, user):
+    executed = []
+    event.listen(db_engine, "before_cursor_execute", lambda conn, cursor, sql, params, *args: executed.append((sql, params)))
+    InventoryBatchDAL(db_session).get_expiring(user_id=user.user_id, days=7)
+    sql, params = executed[-1]
+
+    plan = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+
+    assert any("ix_batches_open_run_expiry" in row[-1] for row in plan)
@@ -0,0 +1,73 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from app.api.routes import grocery_run as grocery_run_routes
+from app.api.routes import inventory_batch as inventory_batch_routes
+from app.api.routes import product as product_routes
+from app.models.category import Category
+from app.models.grocery_run import GroceryRun
+from app.models.inventory_batch import InventoryBatch
+from app.models.product import Product
+
+
+@pytest.fixture
+def rows(db_session, user):
+    category = Category(category_name="dairy")
+    db_session.add(category)
+    db_session.flush()
+    runs = [
+        GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, day), store_name="Café", total_cost=Decimal("12.5"))
+        for day in (1, 2, 3)
+    ]
+    products = [
+        Product(user_id=user.user_id, name="milk", type="packaged", category_id=category.category_id,
+                default_storage_location="fridge", shelf_life_days=7),
+        Product(user_id=user.user_id, name="apples", type="fruit"),
+    ]
+    db_session.add_all([*runs, *products])
+    db_session.flush()
+    db_session.add_all([
+        InventoryBatch(grocery_run_id=runs[0].id, product_id=products[0].id, quantity_added=Decimal("2"),
+                       storage_location="fridge", expired_at=datetime(2026, 1, 9)),
+        InventoryBatch(grocery_run_id=runs[0].id, product_id=products[1].id, quantity_added=Decimal("3"),
+                       quantity_used=Decimal("3"), completed_at=datetime(2026, 1, 2)),
+        InventoryBatch(grocery_run_id=runs[1].id, product_id=products[1].id, quantity_added=Decimal("1.25")),
+    ])
+    db_session.flush()
+
+
+def get_in_mode(client, monkeypatch, mode: str, url: str, **params):
+    for module in (grocery_run_routes, inventory_batch_routes, product_routes):
+        monkeypatch.setattr(module, "LIST_READ_MODE", mode)
+    return client.get(url, params=params)
+
+
+@pytest.mark.parametrize(
+    ("url", "params"),
+    [
+        ("/inventory-batches/", {}),
+        ("/inventory-batches/", {"limit": 2}),
+        ("/products/", {}),
+        ("/grocery-runs/", {}),
+        ("/grocery-runs/", {"limit": 1, "archived": "false"}),
+    ],
+)
+def test_rows_mode_matches_orm_wire_format(client, monkeypatch, rows, url, params):
+    orm = get_in_mode(client, monkeypatch, "orm", url, **params)
+    fast = get_in_mode(client, monkeypatch, "rows", url, **params)
+
+    assert fast.status_code == orm.status_code == 200
+    assert fast.json() == orm.json()
+    # same keys in the same order, same number formatting
+    assert fast.content == orm.content
+    for header in ("ETag", "X-Next-Cursor", "Content-Type"):
+        assert fast.headers.get(header) == orm.headers.get(header)
+
+
+def test_rows_mode_keeps_orm_path_for_embedded_batches(client, monkeypatch, rows):
+    response = get_in_mode(client, monkeypatch, "rows", "/grocery-runs/", include="inventory_batches")
+
+    assert response.status_code == 200
+    assert sum(len(run["inventory_batches"]) for run in response.json()) == 3
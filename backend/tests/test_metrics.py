@@ -0,0 +1,126 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.auth import firebase
+from app.core.metrics import Histogram, auth_verify_duration, dal_call_duration, registry
+from app.data_access.product_dal import ProductDAL
+from app.db.pool import pool_stats
+from app.models.product import Product
+
+
+METRICS_TOKEN = "scrape-token"
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics(monkeypatch):
+    monkeypatch.setattr("app.api.deps.METRICS_TOKEN", METRICS_TOKEN)
+    registry.clear()
+    yield
+    registry.clear()
+
+
+def scrape(client) -> list[str]:
+    response = client.get("/metrics", headers={"Authorization": f"Bearer {METRICS_TOKEN}"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text.splitlines()
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", ("kind",), buckets=(0.1, 1.0, float("inf")))
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.observe(value, 'say "hi"\n')
+
+    assert list(histogram.collect()) == [
+        "# HELP demo_seconds Demo.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{kind="say \\"hi\\"\\n",le="0.1"} 2',
+        'demo_seconds_bucket{kind="say \\"hi\\"\\n",le="1"} 3',
+        'demo_seconds_bucket{kind="say \\"hi\\"\\n",le="+Inf"} 4',
+        'demo_seconds_sum{kind="say \\"hi\\"\\n"} 5.65',
+        'demo_seconds_count{kind="say \\"hi\\"\\n"} 4',
+    ]
+
+
+def test_requests_are_labelled_by_route_template(client, db_session, user):
+    product = Product(user_id=user.user_id, name="apples", type="fruit")
+    db_session.add(product)
+    db_session.flush()
+
+    assert client.get(f"/products/{product.id}").status_code == 200
+    assert client.get("/products/999999").status_code == 404
+    assert client.get("/no/such/path").status_code == 404
+    assert client.get("/health/").status_code == 200
+    lines = scrape(client)
+
+    assert 'http_request_duration_seconds_count{method="GET",route="/products/{product_id}",status="200"} 1' in lines
+    assert 'http_request_duration_seconds_count{method="GET",route="/products/{product_id}",status="404"} 1' in lines
+    assert 'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"} 1' in lines
+    assert 'http_request_duration_seconds_count{method="GET",route="/health/",status="200"} 1' in lines
+    # the scrape itself is the only request in flight
+    assert "http_requests_in_flight 1" in lines
+
+
+def test_unknown_methods_share_one_label(client):
+    assert client.request("BREW", "/health/").status_code == 405
+    assert client.request("PROPFIND", "/health/").status_code == 405
+    lines = scrape(client)
+
+    assert 'http_request_duration_seconds_count{method="other",route="/health/",status="405"} 2' in lines
+
+
+def test_metrics_require_the_token(client, monkeypatch):
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    monkeypatch.setattr("app.api.deps.METRICS_TOKEN", None)
+    assert client.get("/metrics", headers={"Authorization": f"Bearer {METRICS_TOKEN}"}).status_code == 404
+
+
+def test_pool_counters_require_the_metrics_token(client):
+    assert client.get("/health/db-check").json() == {"db_connected": True}
+    assert client.get("/health/db-pool").status_code == 401
+
+    response = client.get("/health/db-pool", headers={"Authorization": f"Bearer {METRICS_TOKEN}"})
+    assert response.status_code == 200
+    assert response.json() == pool_stats()
+
+
+def test_recognition_counters_require_the_metrics_token(client):
+    assert client.get("/health/ai-recognition").status_code == 401
+
+    response = client.get("/health/ai-recognition", headers={"Authorization": f"Bearer {METRICS_TOKEN}"})
+    assert response.status_code == 200
+    assert response.json()["cache"]["size"] == 0
+
+
+def test_dal_methods_are_timed(db_session, user):
+    ProductDAL(db_session).get_all_by_user_id(user_id=user.user_id)
+    ProductDAL(db_session).get_all_by_user_id(user_id=user.user_id)
+
+    counts, total = dal_call_duration.snapshot()[("ProductDAL", "get_all_by_user_id")]
+    assert sum(counts) == 2
+    assert total > 0
+    # the wrapper keeps the method's name and signature
+    assert ProductDAL.get_all_by_user_id.__name__ == "get_all_by_user_id"
+
+
+def test_decode_token_is_timed_by_result(monkeypatch, firebase_claims_dict):
+    monkeypatch.setattr(firebase.auth, "verify_id_token", Mock(return_value={**firebase_claims_dict, "exp": 2**40}))
+    firebase.decode_token("token123")
+    firebase.decode_token("token123")
+    monkeypatch.setattr(firebase.auth, "verify_id_token", Mock(side_effect=ValueError("bad token")))
+    with pytest.raises(ValueError):
+        firebase.decode_token("other-token")
+
+    observed = {result: sum(counts) for (result,), (counts, _) in auth_verify_duration.snapshot().items()}
+    assert observed == {"verified": 1, "cached": 1, "failed": 1}
+
+
+def test_metrics_include_pool_and_ai_recognition(client):
+    lines = scrape(client)
+
+    assert "# TYPE ai_recognition_duration_seconds histogram" in lines
+    assert 'ai_recognition_calls_total{outcome="success"} 0' in lines
+    assert "# TYPE db_pool_checkout_wait_seconds histogram" in lines
@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import StaticPool
+
+from app.commands import migrate
+from app.db.base import Base
+from app.db.schema import SCHEMA_REVISION
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / "alembic.ini"
+
+
+@pytest.fixture
+def alembic_config():
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+@pytest.fixture
+def migrated(alembic_config):
+    """Empty in-memory database, upgraded to head through the migrations."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as connection:
+        alembic_config.attributes["connection"] = connection
+        command.upgrade(alembic_config, "head")
+    yield engine
+    engine.dispose()
+
+
+def test_schema_revision_is_the_migration_head(alembic_config):
+    # a new migration must bump app.db.schema.SCHEMA_REVISION, or startup would reject the migrated database
+    assert ScriptDirectory.from_config(alembic_config).get_heads() == [SCHEMA_REVISION]
+
+
+def test_migrations_build_the_models_schema(migrated):
+    with migrated.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+
+    assert diff == []
+
+
+def test_downgrade_to_base_removes_everything(migrated, alembic_config):
+    with migrated.begin() as connection:
+        alembic_config.attributes["connection"] = connection
+        command.downgrade(alembic_config, "base")
+
+    assert inspect(migrated).get_table_names() == ["alembic_version"]
+
+
+def test_migrate_command_upgrades_an_empty_database(alembic_config):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+
+    assert migrate.upgrade(engine, alembic_config) == SCHEMA_REVISION
+    assert "category_versions" in inspect(engine).get_table_names()
+    engine.dispose()
+
+
+def test_migrate_command_adopts_a_create_all_database(alembic_config):
+    # what the old startup create_all built: the 0001 tables, no alembic_version
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[
+        table for table in Base.metadata.sorted_tables if table.name != "category_versions"
+    ])
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO categories (category_name) VALUES ('Dairy')"))
+
+    assert migrate.upgrade(engine, alembic_config) == SCHEMA_REVISION
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT category_name FROM categories")).scalars().all() == ["Dairy"]
+        assert connection.execute(text("SELECT version FROM category_versions")).scalar() == 0
+    # a second run is a no-op
+    assert migrate.upgrade(engine, alembic_config) == SCHEMA_REVISION
+    engine.dispose()
@@ -0,0 +1,90 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.core.exceptions import InvalidCursorError
+from app.data_access.grocery_run_dal import GroceryRunDAL
+from app.data_access.inventory_batch_dal import InventoryBatchDAL
+from app.data_access.pagination import decode_cursor, encode_cursor
+from app.data_access.product_dal import ProductDAL
+from app.models.grocery_run import GroceryRun
+from app.models.inventory_batch import InventoryBatch
+from app.models.product import Product
+
+
+def walk_pages(fetch, cursor_for, *, limit: int) -> list[list[int]]:
+    """Follow cursors until a short page; returns the ids of every page."""
+    pages, cursor = [], None
+    while True:
+        rows = fetch(limit=limit, cursor=cursor)
+        pages.append([row.id for row in rows])
+        if len(rows) < limit:
+            return pages
+        cursor = cursor_for(rows[-1])
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(date(2026, 1, 2), 7)
+    assert decode_cursor(cursor, date.fromisoformat, int) == (date(2026, 1, 2), 7)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor(1), encode_cursor("x", "y")])
+def test_invalid_cursor_raises(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, date.fromisoformat, int)
+
+
+def test_grocery_runs_keyset_pages_cover_every_row_once(db_session, user):
+    # duplicate trip dates so the id tiebreaker matters
+    runs = [GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1 + i // 2)) for i in range(7)]
+    db_session.add_all(runs)
+    db_session.flush()
+    dal = GroceryRunDAL(db_session)
+
+    pages = walk_pages(
+        lambda **kw: dal.get_all_by_user_id(user_id=user.user_id, **kw), dal.cursor_for, limit=3
+    )
+
+    expected = [r.id for r in sorted(runs, key=lambda r: (r.trip_date, r.id), reverse=True)]
+    assert [i for page in pages for i in page] == expected
+    assert [len(page) for page in pages] == [3, 3, 1]
+
+
+def test_products_keyset_pages_cover_every_row_once(db_session, user):
+    products = [Product(user_id=user.user_id, name=name, type="packaged") for name in ["b", "a", "b", "c", "a"]]
+    db_session.add_all(products)
+    db_session.flush()
+    dal = ProductDAL(db_session)
+
+    pages = walk_pages(
+        lambda **kw: dal.get_all_by_user_id(user_id=user.user_id, **kw), dal.cursor_for, limit=2
+    )
+
+    expected = [p.id for p in sorted(products, key=lambda p: (p.name, p.id))]
+    assert [i for page in pages for i in page] == expected
+
+
+def test_inventory_batches_keyset_pages_handle_null_expiry(db_session, user):
+    run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+    product = Product(user_id=user.user_id, name="milk", type="packaged")
+    db_session.add_all([run, product])
+    db_session.flush()
+    base = datetime(2026, 2, 1)
+    expiries = [None, base, None, base + timedelta(days=1), base, None]
+    batches = [
+        InventoryBatch(grocery_run_id=run.id, product_id=product.id, quantity_added=Decimal("1"), expired_at=e)
+        for e in expiries
+    ]
+    db_session.add_all(batches)
+    db_session.flush()
+    dal = InventoryBatchDAL(db_session)
+
+    pages = walk_pages(
+        lambda **kw: dal.get_all_by_user_id(user_id=user.user_id, **kw), dal.cursor_for, limit=2
+    )
+
+    # expired_at desc with NULLs first, id desc
+    nulls = sorted((b for b in batches if b.expired_at is None), key=lambda b: b.id, reverse=True)
+    dated = sorted((b for b in batches if b.expired_at), key=lambda b: (b.expired_at, b.id), reverse=True)
+    assert [i for page in pages for i in page] == [b.id for b in nulls + dated]
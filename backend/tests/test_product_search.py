@@ -0,0 +1,134 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.data_access.product_dal import ProductDAL
+from app.db.functions import trigram_similarity, trigram_word_similarity
+from app.models.grocery_run import GroceryRun
+from app.models.inventory_batch import InventoryBatch
+from app.models.product import Product
+from app.models.user import User
+
+
+@pytest.fixture
+def products(db_session, user) -> dict[str, Product]:
+    rows = {
+        name: Product(user_id=user.user_id, name=name, brand=brand, type="packaged")
+        for name, brand in (
+            ("Dark Chocolate", "Lindt"),
+            ("Chocolate Milk", None),
+            ("Whole Milk", "Organic Valley"),
+            ("Cheddar Cheese", "Tillamook"),
+            ("Hot Cocoa", "Swiss Miss"),
+            ("100% Juice", None),
+        )
+    }
+    db_session.add_all(rows.values())
+    db_session.flush()
+    return rows
+
+
+def search(db_session, user, query: str, **kwargs) -> list[str]:
+    return [p.name for p in ProductDAL(db_session).search(user_id=user.user_id, query=query, **kwargs)]
+
+
+def test_trigram_functions_match_pg_trgm():
+    # the examples from the pg_trgm documentation
+    assert trigram_similarity("word", "two words") == pytest.approx(0.363636, abs=1e-6)
+    assert trigram_word_similarity("word", "two words") == pytest.approx(0.8)
+    assert trigram_word_similarity("Choc", "dark chocolate") == pytest.approx(0.8)
+    assert trigram_word_similarity("milk", "") == 0.0
+
+
+def test_search_matches_name_and_brand_substrings(db_session, user, products):
+    assert set(search(db_session, user, "milk")) == {"Whole Milk", "Chocolate Milk"}
+    assert search(db_session, user, "tillamook") == ["Cheddar Cheese"]
+
+
+def test_name_prefix_ranks_first(db_session, user, products):
+    assert search(db_session, user, "choc") == ["Chocolate Milk", "Dark Chocolate"]
+
+
+def test_search_tolerates_typos(db_session, user, products):
+    assert search(db_session, user, "chedar") == ["Cheddar Cheese"]
+    assert search(db_session, user, "chocolat milk")[0] == "Chocolate Milk"
+
+
+def test_exact_matches_rank_before_typos(db_session, user, products):
+    db_session.add(Product(user_id=user.user_id, name="Chedar Crackers", type="packaged"))
+    db_session.flush()
+
+    assert search(db_session, user, "cheddar") == ["Cheddar Cheese", "Chedar Crackers"]
+    # a page filled by exact matches never looks for typos
+    assert search(db_session, user, "cheddar", limit=1) == ["Cheddar Cheese"]
+
+
+def test_short_queries_only_match_prefixes(db_session, user, products):
+    assert search(db_session, user, "ch") == ["Cheddar Cheese", "Chocolate Milk"]
+    assert search(db_session, user, "li") == ["Dark Chocolate"]
+
+
+def test_recently_stocked_products_rank_higher(db_session, user, products):
+    # equal matches: name order
+    assert search(db_session, user, "milk") == ["Chocolate Milk", "Whole Milk"]
+
+    run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+    db_session.add(run)
+    db_session.flush()
+    db_session.add(InventoryBatch(
+        grocery_run_id=run.id,
+        product_id=products["Whole Milk"].id,
+        quantity_added=Decimal("1"),
+        added_at=datetime.now(timezone.utc) - timedelta(days=1),
+    ))
+    db_session.flush()
+
+    assert search(db_session, user, "milk") == ["Whole Milk", "Chocolate Milk"]
+
+
+def test_like_wildcards_in_the_query_are_literal(db_session, user, products):
+    assert search(db_session, user, "100%") == ["100% Juice"]
+    assert search(db_session, user, "_ilk") == []
+
+
+def test_search_is_scoped_to_the_user(db_session, user, products):
+    other = User(firebase_uid="uid456", email="other@example.com", display_name="Other")
+    db_session.add(other)
+    db_session.flush()
+    db_session.add(Product(user_id=other.user_id, name="Milk Chocolate", type="packaged"))
+    db_session.flush()
+
+    assert "Milk Chocolate" not in search(db_session, user, "milk")
+
+
+def test_search_limit_and_blank_query(db_session, user, products):
+    assert len(search(db_session, user, "c", limit=1)) == 1
+    assert search(db_session, user, "   ") == []
+
+
+def test_search_endpoint(client, products):
+    response = client.get("/products/search", params={"q": "choco", "limit": 1})
+
+    assert response.status_code == 200
+    assert [p["name"] for p in response.json()] == ["Chocolate Milk"]
+    assert client.get("/products/search").status_code == 422
+
+
+def test_search_runs_on_postgres(pg_engine):
+    # the <% operator goes through the driver's paramstyle (pyformat for psycopg2)
+    with Session(pg_engine, autoflush=False) as session:
+        user = User(firebase_uid="uid123", email="user@example.com")
+        session.add(user)
+        session.flush()
+        session.add_all([
+            Product(user_id=user.user_id, name="Cheddar Cheese", brand="Tillamook", type="packaged"),
+            Product(user_id=user.user_id, name="Whole Milk", brand="Organic Valley", type="packaged"),
+            Product(user_id=user.user_id, name="100% Juice", type="packaged"),
+        ])
+        session.flush()
+
+        assert search(session, user, "chedar") == ["Cheddar Cheese"]
+        assert search(session, user, "tilamook") == ["Cheddar Cheese"]
+        assert search(session, user, "100%") == ["100% Juice"]
@@ -0,0 +1,128 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.data_access.grocery_run_dal import GroceryRunDAL
+from app.data_access.inventory_batch_dal import InventoryBatchDAL
+from app.data_access.product_stock_dal import ProductStockDAL
+from app.models.grocery_run import GroceryRun
+from app.models.product import Product
+from app.models.product_stock import ProductStock
+from app.models.user import User
+from app.schemas.inventory_batch import InventoryBatchBulkUpdateItem, InventoryBatchCreate, InventoryBatchUpdate
+
+
+@pytest.fixture
+def run(db_session, user) -> GroceryRun:
+    run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+    db_session.add(run)
+    db_session.flush()
+    return run
+
+
+@pytest.fixture
+def product(db_session, user) -> Product:
+    product = Product(user_id=user.user_id, name="milk", type="packaged")
+    db_session.add(product)
+    db_session.flush()
+    return product
+
+
+def stock(db_session, user) -> dict:
+    return {
+        (row.product_id, row.storage_location): (row.quantity_current, row.open_batch_count, row.next_expiry_at)
+        for row in ProductStockDAL(db_session).get_all_by_user_id(user_id=user.user_id)
+    }
+
+
+def create(dal, user, run, product, quantity: str, **fields):
+    return dal.create(
+        user_id=user.user_id,
+        data=InventoryBatchCreate(
+            grocery_run_id=run.id, product_id=product.id, quantity_added=Decimal(quantity), **fields
+        ),
+    )
+
+
+def test_batch_writes_keep_stock_current(db_session, user, run, product):
+    dal = InventoryBatchDAL(db_session)
+    fridge = create(dal, user, run, product, "2", storage_location="fridge", expired_at=datetime(2026, 1, 9))
+    create(dal, user, run, product, "3", storage_location="fridge", expired_at=datetime(2026, 1, 5))
+    loose = create(dal, user, run, product, "1")
+
+    assert stock(db_session, user) == {
+        (product.id, "fridge"): (Decimal("5"), 2, datetime(2026, 1, 5)),
+        (product.id, None): (Decimal("1"), 1, None),
+    }
+
+    # moving a batch updates both the location it leaves and the one it joins
+    dal.update(user_id=user.user_id, inventory_batch_id=fridge.id, data=InventoryBatchUpdate(storage_location="freezer"))
+    # completing the last open batch of a bucket removes the row
+    dal.update_many(user_id=user.user_id, items=[InventoryBatchBulkUpdateItem(id=loose.id, quantity_used=Decimal("1"))])
+
+    assert stock(db_session, user) == {
+        (product.id, "fridge"): (Decimal("3"), 1, datetime(2026, 1, 5)),
+        (product.id, "freezer"): (Decimal("2"), 1, datetime(2026, 1, 9)),
+    }
+
+    dal.delete_by_id(user_id=user.user_id, inventory_batch_id=fridge.id)
+    GroceryRunDAL(db_session).delete_by_id(user_id=user.user_id, grocery_run_id=run.id)
+
+    assert stock(db_session, user) == {}
+    assert ProductStockDAL(db_session).check() == []
+
+
+def test_check_reports_drift_and_rebuild_repairs_it(db_session, user, run, product):
+    dal = InventoryBatchDAL(db_session)
+    create(dal, user, run, product, "2", storage_location="fridge")
+    create(dal, user, run, product, "4", storage_location="pantry")
+    stock_dal = ProductStockDAL(db_session)
+
+    db_session.execute(
+        update(ProductStock).where(ProductStock.storage_location == "fridge").values(quantity_current=Decimal("9"))
+    )
+    db_session.execute(ProductStock.__table__.delete().where(ProductStock.storage_location == "pantry"))
+
+    drift = stock_dal.check(user_id=user.user_id)
+    assert {(row.storage_location, row.expected_quantity_current, row.actual_quantity_current) for row in drift} == {
+        ("fridge", Decimal("2"), Decimal("9")),
+        ("pantry", Decimal("4"), None),
+    }
+
+    assert stock_dal.rebuild(user_id=user.user_id) == 2
+    assert stock_dal.check() == []
+
+
+def test_stock_endpoint_filters(client, db_session, user, run, product):
+    dal = InventoryBatchDAL(db_session)
+    create(dal, user, run, product, "2", storage_location="fridge")
+    create(dal, user, run, product, "1", storage_location="pantry")
+
+    response = client.get("/stock/", params={"storage_location": "pantry"})
+
+    assert response.status_code == 200
+    assert [(row["product_id"], row["quantity_current"]) for row in response.json()] == [(product.id, "1.00")]
+
+
+def test_concurrent_first_batches_for_one_key(pg_engine, blocked_session):
+    start, finish = blocked_session
+    with Session(pg_engine, autoflush=False) as session:
+        user = User(firebase_uid="uid123", email="user@example.com")
+        session.add(user)
+        session.flush()
+        run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+        product = Product(user_id=user.user_id, name="milk", type="packaged")
+        session.add_all([run, product])
+        session.commit()
+
+        # both transactions create the first fridge batch; the second refresh waits for the first commit
+        create(InventoryBatchDAL(session), user, run, product, "2", storage_location="fridge")
+        start(lambda other: create(InventoryBatchDAL(other), user, run, product, "3", storage_location="fridge"))
+        session.commit()
+        finish()
+
+        assert stock(session, user) == {(product.id, "fridge"): (Decimal("5.00"), 2, None)}
+        assert ProductStockDAL(session).check() == []
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from app.api.middleware import QueryStatsMiddleware
+from app.db.query_stats import QueryStats, statement_shape, track_queries
+from app.models.grocery_run import GroceryRun
+from app.models.inventory_batch import InventoryBatch
+from app.models.product import Product
+from app.models.user import User
+
+
+@pytest.fixture
+def pantry(db_session, user) -> tuple[list[GroceryRun], list[Product]]:
+    products = [Product(user_id=user.user_id, name=f"product {i}", type="packaged") for i in range(6)]
+    runs = [GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, i + 1)) for i in range(5)]
+    db_session.add_all(products + runs)
+    db_session.flush()
+    db_session.add_all([
+        InventoryBatch(grocery_run_id=run.id, product_id=product.id, quantity_added=Decimal("1"))
+        for run in runs
+        for product in products[:4]
+    ])
+    db_session.flush()
+    return runs, products
+
+
+def test_statement_shape_collapses_parameter_lists():
+    assert statement_shape("SELECT *\n  FROM t WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (?)"
+    assert statement_shape("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s)") == "SELECT * FROM t WHERE id IN (?)"
+    assert statement_shape("SELECT * FROM t WHERE id = $1") == "SELECT * FROM t WHERE id = $1"
+    assert statement_shape("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4), ($5, $6)") == (
+        "INSERT INTO t (a, b) VALUES (?), ..."
+    )
+
+
+def test_queries_are_tracked_inside_the_context_only(db_session, user):
+    db_session.execute(select(User))
+
+    async def request():
+        with track_queries() as stats:
+            db_session.execute(select(User))
+            # DAL calls run in the threadpool on the sync stack
+            await run_in_threadpool(db_session.execute, select(User).where(User.user_id == user.user_id))
+        return stats
+
+    stats = asyncio.run(request())
+
+    assert stats.count == 2
+    assert stats.seconds > 0
+    assert sum(stats.statements.values()) == 2
+
+
+def test_headers_report_the_request_queries(client, monkeypatch, pantry):
+    assert "X-DB-Query-Count" not in client.get("/grocery-runs/").headers
+
+    monkeypatch.setattr("app.api.middleware.SQL_QUERY_STATS", "headers")
+    response = client.get("/grocery-runs/")
+
+    assert response.headers["X-DB-Query-Count"] == "2"
+    assert float(response.headers["X-DB-Query-Time-Ms"]) >= 0
+
+
+def test_repeated_groups_statements_by_shape_past_the_threshold(monkeypatch):
+    stats = QueryStats()
+    for ids in ("?", "?, ?", "?, ?, ?"):
+        stats.record(f"SELECT * FROM t WHERE id IN ({ids})", 0.0)
+    stats.record("SELECT * FROM users", 0.0)
+    shaped = []
+    monkeypatch.setattr("app.db.query_stats.statement_shape", lambda s: shaped.append(s) or statement_shape(s))
+
+    assert stats.repeated(4) == []
+    assert shaped == []
+    assert stats.repeated(2) == [("SELECT * FROM t WHERE id IN (?)", 3)]
+    assert len(shaped) == 4
+
+
+@pytest.mark.parametrize("lookups, warned", [(5, False), (6, True)])
+def test_repeated_statements_are_logged(db_session, user, caplog, lookups, warned):
+    async def n_plus_one(scope, receive, send):
+        for _ in range(lookups):
+            db_session.execute(select(User).where(User.user_id == user.user_id))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    with caplog.at_level(logging.WARNING, logger="app.api.middleware"):
+        asyncio.run(QueryStatsMiddleware(n_plus_one)({"type": "http", "method": "GET", "path": "/"}, receive, send))
+
+    messages = [record.getMessage() for record in caplog.records]
+    if warned:
+        assert len(messages) == 1
+        assert "GET unmatched ran the same statement 6 times (6 statements in total)" in messages[0]
+        assert "FROM users WHERE users.user_id = ?" in messages[0]
+    else:
+        assert messages == []
+
+
+# query budgets: the count must not grow with the number of rows returned
+@pytest.mark.parametrize("path, budget", [
+    # collection version (ETag), then one query for the page
+    ("/grocery-runs/", 2),
+    ("/inventory-batches/", 2),
+    # plus the categories snapshot: version check and load
+    ("/products/", 4),
+    ("/stock/", 1),
+])
+def test_list_endpoint_query_budgets(client, assert_num_queries, pantry, path, budget):
+    with assert_num_queries(budget):
+        assert client.get(path).status_code == 200
+
+
+def test_grocery_run_detail_query_budget(client, assert_num_queries, pantry):
+    runs, _ = pantry
+
+    with assert_num_queries(2):
+        assert client.get(f"/grocery-runs/{runs[0].id}").status_code == 200
+
+
+def test_create_inventory_batch_query_budget(client, assert_num_queries, pantry):
+    runs, products = pantry
+    body = {"grocery_run_id": runs[0].id, "product_id": products[5].id, "quantity_added": "2"}
+
+    # the INSERT, then product_stock and waste_rollups (delete + rebuild each) and the collection
+    # versions bump; Postgres adds one advisory lock statement before the rebuilds
+    with assert_num_queries(6):
+        assert client.post("/inventory-batches/", json=body).status_code == 201
@@ -0,0 +1,241 @@
+import asyncio
+import io
+import json
+import random
+import threading
+
+import pytest
+from PIL import Image, ImageDraw
+
+from app.api.routes import recognizeItem
+from app.services.recognition_cache import RecognitionCache, content_hash, perceptual_hash
+
+BANANA = {"item": "banana", "confidence": 0.93, "alternatives": [{"item": "plantain", "confidence": 0.05}]}
+
+
+def photo(*, flip: bool = False, format: str = "PNG", quality: int = 90, size: int = 256) -> bytes:
+    """A synthetic 'photo': a diagonal gradient with a dark block, optionally mirrored."""
+    image = Image.new("RGB", (size, size))
+    image.putdata([(x * 255 // size, y * 255 // size, 128) for y in range(size) for x in range(size)])
+    ImageDraw.Draw(image).rectangle((size // 4, size // 4, size // 2, size // 2), fill=(10, 10, 10))
+    if flip:
+        image = image.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+    out = io.BytesIO()
+    image.save(out, format=format, **({"quality": quality} if format == "JPEG" else {}))
+    return out.getvalue()
+
+
+class Recognizer:
+    def __init__(self, result=BANANA, delay: float = 0):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return dict(self.result)
+
+
+def make_cache(**overrides) -> RecognitionCache:
+    return RecognitionCache(**{"max_size": 100, "max_distance": 4, "min_confidence": 0.6, **overrides})
+
+
+def test_perceptual_hash_survives_reencoding_but_not_a_different_image():
+    original = perceptual_hash(photo())
+
+    assert perceptual_hash(photo(format="JPEG", quality=40)) is not None
+    assert (original ^ perceptual_hash(photo(format="JPEG", quality=40))).bit_count() <= 4
+    assert (original ^ perceptual_hash(photo(size=512))).bit_count() <= 4
+    assert (original ^ perceptual_hash(photo(flip=True))).bit_count() > 4
+    assert perceptual_hash(b"not an image") is None
+
+
+@pytest.mark.asyncio
+async def test_identical_upload_is_an_exact_hit():
+    cache = make_cache()
+    recognize = Recognizer()
+
+    assert await cache.get_or_recognize(photo(), recognize) == BANANA
+    assert await cache.get_or_recognize(photo(), recognize) == BANANA
+
+    assert recognize.calls == 1
+    assert cache.stats()["exact_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_photo_is_a_perceptual_hit():
+    cache = make_cache()
+    recognize = Recognizer()
+    await cache.get_or_recognize(photo(), recognize)
+
+    assert await cache.get_or_recognize(photo(format="JPEG", quality=60), recognize) == BANANA
+    assert recognize.calls == 1
+    assert cache.stats()["perceptual_hits"] == 1
+
+    await cache.get_or_recognize(photo(flip=True), recognize)
+    assert recognize.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_perceptual_matching_can_be_disabled():
+    cache = make_cache(max_distance=-1)
+    recognize = Recognizer()
+    await cache.get_or_recognize(photo(), recognize)
+    await cache.get_or_recognize(photo(format="JPEG"), recognize)
+
+    assert recognize.calls == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("result", [
+    {"item": "banana", "confidence": 0.3, "alternatives": []},
+    {"item": "unknown", "confidence": 0, "alternatives": [], "error": "Request timed out."},
+])
+async def test_low_confidence_and_failed_results_are_not_cached(result):
+    cache = make_cache()
+    recognize = Recognizer(result)
+
+    assert await cache.get_or_recognize(photo(), recognize) == result
+    assert await cache.get_or_recognize(photo(), recognize) == result
+    assert recognize.calls == 2
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted():
+    cache = make_cache(max_size=2, max_distance=-1)
+    images = [photo(size=64 + i) for i in range(3)]
+    recognize = Recognizer()
+    await cache.get_or_recognize(images[0], recognize)
+    await cache.get_or_recognize(images[1], recognize)
+    await cache.get_or_recognize(images[0], recognize)  # touch: images[1] is now the LRU entry
+    await cache.get_or_recognize(images[2], recognize)
+
+    assert cache.get_exact(content_hash(images[0])) == BANANA
+    assert cache.get_exact(content_hash(images[1])) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_similar_lookup_in_a_full_cache_matches_a_scan():
+    rng = random.Random(7)
+    cache = make_cache(max_size=5000)
+    for i in range(6000):
+        cache.store(f"d{i}", rng.getrandbits(64), {**BANANA, "item": f"item {i}"})
+    assert len(cache) == 5000
+    stored = {entry.phash: entry.payload["item"] for entry in cache._entries.values()}
+
+    def scan(phash: int) -> str | None:
+        distance, item = min(((p ^ phash).bit_count(), item) for p, item in stored.items())
+        return item if distance <= cache.max_distance else None
+
+    near = [p ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for p in rng.sample(list(stored), 200)]
+    for phash in near + [rng.getrandbits(64) for _ in range(200)]:
+        found = cache.get_similar(phash)
+        assert (found and found["item"]) == scan(phash)
+        # a handful of entries share a band with the query, not the whole cache
+        assert len(cache._candidates(phash)) < 50
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_uploads_share_one_recognition():
+    cache = make_cache()
+    recognize = Recognizer(delay=0.05)
+
+    results = await asyncio.gather(*(cache.get_or_recognize(photo(), recognize) for _ in range(5)))
+
+    assert results == [BANANA] * 5
+    assert recognize.calls == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_waiters_outlive_a_cancelled_leader():
+    cache = make_cache()
+    leader_recognize = Recognizer(delay=10)
+    recognize = Recognizer(delay=0.01)
+
+    leader = asyncio.create_task(cache.get_or_recognize(photo(), leader_recognize))
+    await asyncio.sleep(0.05)
+    waiters = [asyncio.create_task(cache.get_or_recognize(photo(), recognize)) for _ in range(3)]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await asyncio.gather(*waiters) == [BANANA] * 3
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    # one waiter took over as the leader; the others waited on it
+    assert recognize.calls == 1
+    assert cache.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_payload_cannot_be_mutated_by_callers():
+    cache = make_cache()
+    result = await cache.get_or_recognize(photo(), Recognizer())
+    result["alternatives"].append({"item": "mango", "confidence": 0.01})
+
+    assert cache.get_exact(content_hash(photo())) == BANANA
+
+
+@pytest.mark.asyncio
+async def test_entries_persist_across_restarts(tmp_path):
+    path = str(tmp_path / "recognition-cache.jsonl")
+    cache = make_cache(path=path, max_size=1, max_distance=-1)
+    await cache.get_or_recognize(photo(size=64), Recognizer({**BANANA, "item": "apple"}))
+    await cache.get_or_recognize(photo(), Recognizer())
+    cache.flush()
+    with open(path, "a") as f:
+        f.write("{truncated\n")
+
+    reloaded = make_cache(path=path, max_size=1)
+    recognize = Recognizer()
+
+    assert await reloaded.get_or_recognize(photo(), recognize) == BANANA
+    assert recognize.calls == 0
+    # reloading compacts the file to the retained entries
+    with open(path) as f:
+        assert [json.loads(line)["digest"] for line in f] == [content_hash(photo())]
+
+
+def test_file_is_compacted_once_it_reaches_a_multiple_of_max_size(tmp_path, monkeypatch):
+    path = str(tmp_path / "recognition-cache.jsonl")
+    cache = make_cache(path=path, max_size=2)
+    writers = set()
+    append = cache._append
+    monkeypatch.setattr(cache, "_append", lambda *args: writers.add(threading.current_thread().name) or append(*args))
+
+    def lines() -> list[str]:
+        cache.flush()
+        with open(path) as f:
+            return [json.loads(line)["digest"] for line in f]
+
+    for digest in ("a", "b", "c"):
+        cache.store(digest, None, BANANA)
+    assert lines() == ["a", "b", "c"]
+    assert writers == {"recognition-cache_0"}
+
+    # the fourth line would be 2 x max_size: the file is rewritten with the live entries instead
+    cache.store("d", None, BANANA)
+    assert lines() == ["c", "d"]
+    cache.store("e", None, BANANA)
+    assert lines() == ["c", "d", "e"]
+
+
+def test_route_answers_repeat_uploads_from_the_cache(client, monkeypatch):
+    calls = []
+
+    async def fake_recognize(data_url: str):
+        calls.append(data_url)
+        return dict(BANANA)
+
+    monkeypatch.setattr(recognizeItem, "recognize_item_with_ai", fake_recognize)
+    files = {"image": ("banana.png", photo(), "image/png")}
+
+    first = client.post("/recognize-item/", files=files)
+    second = client.post("/recognize-item/", files=files)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json() == BANANA
+    assert len(calls) == 1
+    assert calls[0].startswith("data:image/jpeg;base64,")
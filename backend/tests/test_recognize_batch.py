@@ -0,0 +1,137 @@
+import asyncio
+import base64
+import io
+import json
+
+import pytest
+from PIL import Image
+
+from app.api.routes import recognizeItem
+from app.services.recognition_cache import recognition_cache
+
+
+def png(size: int) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (size, size), (size % 256, 90, 30)).save(out, format="PNG")
+    return out.getvalue()
+
+
+class FakeModel:
+    """Stands in for recognize_item_with_ai; answers with the image width after `delays[width]`."""
+    def __init__(self, delays: dict[int, float] | None = None):
+        self.delays = delays or {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.calls = 0
+
+    async def __call__(self, data_url: str):
+        width = Image.open(io.BytesIO(base64.b64decode(data_url.split(",", 1)[1]))).width
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(width, 0.01))
+        finally:
+            self.in_flight -= 1
+        return {"item": f"item {width}", "confidence": 0.9, "alternatives": []}
+
+
+@pytest.fixture
+def model(monkeypatch) -> FakeModel:
+    fake = FakeModel()
+    monkeypatch.setattr(recognizeItem, "recognize_item_with_ai", fake)
+    # distinct test images must not be matched as near-duplicates
+    monkeypatch.setattr(recognition_cache, "max_distance", -1)
+    return fake
+
+
+def upload(*images: tuple[str, bytes, str]) -> list[tuple[str, tuple[str, bytes, str]]]:
+    return [("images", image) for image in images]
+
+
+def test_results_come_back_in_input_order_with_per_image_failures(client, model):
+    response = client.post("/recognize-item/batch", files=upload(
+        ("a.png", png(40), "image/png"),
+        ("notes.txt", b"hello", "text/plain"),
+        ("broken.png", b"not a png", "image/png"),
+        ("b.png", png(50), "image/png"),
+    ))
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert [r["status_code"] for r in results] == [200, 400, 400, 200]
+    assert results[0] == {
+        "index": 0,
+        "filename": "a.png",
+        "status_code": 200,
+        "result": {"item": "item 40", "confidence": 0.9, "alternatives": []},
+        "error": None,
+    }
+    assert results[1]["error"] == "Unsupported image type"
+    assert results[2]["error"] == "Could not decode image"
+    assert results[3]["result"]["item"] == "item 50"
+    assert model.calls == 2
+
+
+def test_oversized_image_fails_alone(client, model, monkeypatch):
+    monkeypatch.setattr(recognizeItem, "MAX_FILE_SIZE", 1000)
+
+    results = client.post("/recognize-item/batch", files=upload(
+        ("small.png", png(8), "image/png"),
+        ("large.png", png(400), "image/png"),
+    )).json()["results"]
+
+    assert [r["status_code"] for r in results] == [200, 413]
+
+
+def test_fan_out_is_capped_per_request(client, model, monkeypatch):
+    monkeypatch.setattr(recognizeItem, "AI_RECOGNITION_BATCH_CONCURRENCY", 2)
+    model.delays = {size: 0.05 for size in range(20, 26)}
+
+    response = client.post(
+        "/recognize-item/batch",
+        files=upload(*((f"{size}.png", png(size), "image/png") for size in range(20, 26))),
+    )
+
+    assert [r["status_code"] for r in response.json()["results"]] == [200] * 6
+    assert model.calls == 6
+    assert model.peak_in_flight == 2
+
+
+def test_unexpected_failures_are_reported_per_image(client, model, monkeypatch):
+    async def flaky(data_url: str):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(recognizeItem, "recognize_item_with_ai", flaky)
+
+    results = client.post("/recognize-item/batch", files=upload(("a.png", png(40), "image/png"))).json()["results"]
+
+    assert results == [
+        {"index": 0, "filename": "a.png", "status_code": 500, "result": None, "error": "Internal server error"}
+    ]
+
+
+def test_too_many_images_are_rejected(client, model, monkeypatch):
+    monkeypatch.setattr(recognizeItem, "AI_RECOGNITION_BATCH_MAX_IMAGES", 2)
+
+    response = client.post(
+        "/recognize-item/batch", files=upload(*((f"{i}.png", png(20 + i), "image/png") for i in range(3)))
+    )
+
+    assert response.status_code == 400
+    assert model.calls == 0
+
+
+def test_stream_sends_each_result_as_it_completes(client, model):
+    model.delays = {40: 0.2, 50: 0.01}
+
+    with client.stream("POST", "/recognize-item/batch?stream=true", files=upload(
+        ("slow.png", png(40), "image/png"),
+        ("fast.png", png(50), "image/png"),
+    )) as response:
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert [line["index"] for line in lines] == [1, 0]
+    assert [line["result"]["item"] for line in lines] == ["item 50", "item 40"]
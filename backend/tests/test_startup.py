@@ -0,0 +1,108 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.exceptions import SchemaRevisionError
+from app.core.readiness import readiness
+from app.data_access.category_dal import category_snapshot_cache
+from app.db.schema import SCHEMA_REVISION, check_schema_revision
+from app.db.warmup import warm_pool, warm_statements
+
+
+def stamp(engine, revision: str) -> None:
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        connection.execute(text("INSERT INTO alembic_version VALUES (:r)"), {"r": revision})
+
+
+def test_schema_check_passes_at_the_expected_revision(db_engine, statements):
+    stamp(db_engine, SCHEMA_REVISION)
+    statements.clear()
+
+    assert check_schema_revision(db_engine, "require") == SCHEMA_REVISION
+    # one read, no reflection
+    assert len(statements) == 1
+
+
+def test_schema_check_rejects_an_unmigrated_database(db_engine):
+    with pytest.raises(SchemaRevisionError, match="app.commands.migrate upgrade"):
+        check_schema_revision(db_engine, "require")
+    assert check_schema_revision(db_engine, "warn") is None
+
+
+def test_schema_check_rejects_another_revision(db_engine):
+    stamp(db_engine, "0000")
+
+    with pytest.raises(SchemaRevisionError, match="revision 0000"):
+        check_schema_revision(db_engine, "require")
+
+
+def test_schema_check_off_runs_no_query(db_engine, statements):
+    statements.clear()
+
+    assert check_schema_revision(db_engine, "off") is None
+    assert statements == []
+
+
+def test_warm_pool_opens_up_to_the_pool_size(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'warm.db'}", pool_size=3)
+
+    assert warm_pool(engine, 10) == 3
+    assert engine.pool.checkedin() == 3
+    assert warm_pool(engine, 0) == 0
+    engine.dispose()
+
+
+def test_warm_statements_runs_the_hot_reads(db_session, statements):
+    statements.clear()
+
+    warm_statements(db_session)
+
+    assert any("collection_versions" in s for s in statements)
+    assert any("FROM products" in s for s in statements)
+    assert category_snapshot_cache.stats()["reloads"] == 1
+
+
+def test_ready_is_503_until_warm_up_finishes(client):
+    readiness.reset()
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+
+
+def test_lifespan_checks_schema_and_warms_up(db_engine, monkeypatch):
+    from app import main
+
+    stamp(db_engine, SCHEMA_REVISION)
+    monkeypatch.setattr(main.session, "engine", db_engine)
+    monkeypatch.setattr(main.session, "SessionLocal", sessionmaker(bind=db_engine))
+    monkeypatch.setattr(main, "DB_MODE", "sync")
+    monkeypatch.setattr(main, "DB_SCHEMA_CHECK", "require")
+    monkeypatch.setattr(main, "FIREBASE_INIT_ON_STARTUP", False)
+
+    with TestClient(main.app) as client:
+        deadline = time.monotonic() + 5
+        while (response := client.get("/health/ready")).status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    report = response.json()
+    assert report["ready"] is True
+    assert report["steps"]["schema"]["revision"] == SCHEMA_REVISION
+    assert set(report["steps"]) == {"schema", "pool", "statements"}
+    assert "error" not in report["steps"]["statements"]
+
+
+def test_lifespan_refuses_an_unmigrated_database(db_engine, monkeypatch):
+    from app import main
+
+    monkeypatch.setattr(main.session, "engine", db_engine)
+    monkeypatch.setattr(main, "DB_SCHEMA_CHECK", "require")
+
+    with pytest.raises(SchemaRevisionError):
+        with TestClient(main.app):
+            pass
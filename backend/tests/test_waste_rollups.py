@@ -0,0 +1,170 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.data_access.grocery_run_dal import GroceryRunDAL
+from app.data_access.inventory_batch_dal import InventoryBatchDAL
+from app.data_access.waste_rollup_dal import WasteRollupDAL
+from app.models.category import Category
+from app.models.grocery_run import GroceryRun
+from app.models.inventory_batch import InventoryBatch
+from app.models.product import Product
+from app.models.user import User
+from app.models.waste_rollup import WasteRollup
+from app.schemas.inventory_batch import InventoryBatchBulkUpdateItem, InventoryBatchCreate, InventoryBatchUpdate
+
+
+@pytest.fixture
+def run(db_session, user) -> GroceryRun:
+    run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+    db_session.add(run)
+    db_session.flush()
+    return run
+
+
+@pytest.fixture
+def products(db_session, user) -> tuple[Product, Product]:
+    dairy = Category(category_name="dairy")
+    db_session.add(dairy)
+    db_session.flush()
+    milk = Product(user_id=user.user_id, name="milk", type="packaged", category_id=dairy.category_id)
+    apples = Product(user_id=user.user_id, name="apples", type="fruit")
+    db_session.add_all([milk, apples])
+    db_session.flush()
+    return milk, apples
+
+
+def create(dal, user, run, product, quantity: str, **fields) -> InventoryBatch:
+    return dal.create(
+        user_id=user.user_id,
+        data=InventoryBatchCreate(
+            grocery_run_id=run.id, product_id=product.id, quantity_added=Decimal(quantity), **fields
+        ),
+    )
+
+
+def move_to(db_session, batch: InventoryBatch, added_at: datetime) -> None:
+    # added_at is server-generated; backdate it as history would be
+    db_session.execute(update(InventoryBatch).where(InventoryBatch.id == batch.id).values(added_at=added_at))
+
+
+def rollups(db_session) -> dict:
+    return {
+        (row.product_id, row.month): (
+            row.batch_count, row.quantity_added, row.quantity_used, row.quantity_spoiled, row.quantity_disposed
+        )
+        for row in db_session.scalars(select(WasteRollup))
+    }
+
+
+def test_batch_writes_keep_rollups_current(db_session, user, run, products):
+    milk, apples = products
+    dal = InventoryBatchDAL(db_session)
+    first = create(dal, user, run, milk, "4", quantity_used=Decimal("1"))
+    second = create(dal, user, run, milk, "2")
+    month = first.added_at.date().replace(day=1)
+
+    assert rollups(db_session) == {
+        (milk.id, month): (2, Decimal("6"), Decimal("1"), Decimal("0"), Decimal("0")),
+    }
+
+    dal.update(user_id=user.user_id, inventory_batch_id=first.id, data=InventoryBatchUpdate(quantity_spoiled=Decimal("2")))
+    dal.update_many(
+        user_id=user.user_id,
+        items=[InventoryBatchBulkUpdateItem(id=second.id, quantity_disposed=Decimal("2"))],
+    )
+    # moving a batch to another product updates the rollup it leaves as well
+    dal.update(user_id=user.user_id, inventory_batch_id=second.id, data=InventoryBatchUpdate(product_id=apples.id))
+
+    assert rollups(db_session) == {
+        (milk.id, month): (1, Decimal("4"), Decimal("1"), Decimal("2"), Decimal("0")),
+        (apples.id, month): (1, Decimal("2"), Decimal("0"), Decimal("0"), Decimal("2")),
+    }
+
+    dal.delete_by_id(user_id=user.user_id, inventory_batch_id=second.id)
+    GroceryRunDAL(db_session).delete_by_id(user_id=user.user_id, grocery_run_id=run.id)
+
+    assert rollups(db_session) == {}
+
+
+def test_backfill_builds_monthly_rollups_from_history(db_session, user, run, products):
+    milk, apples = products
+    dal = InventoryBatchDAL(db_session)
+    january = create(dal, user, run, milk, "3", quantity_spoiled=Decimal("3"))
+    february = create(dal, user, run, milk, "2", quantity_used=Decimal("2"))
+    other = create(dal, user, run, apples, "5", quantity_used=Decimal("4"), quantity_disposed=Decimal("1"))
+    move_to(db_session, january, datetime(2026, 1, 31, 23, 59))
+    move_to(db_session, february, datetime(2026, 2, 1))
+    move_to(db_session, other, datetime(2026, 2, 14))
+
+    assert WasteRollupDAL(db_session).rebuild(user_id=user.user_id) == 3
+    assert rollups(db_session) == {
+        (milk.id, date(2026, 1, 1)): (1, Decimal("3"), Decimal("0"), Decimal("3"), Decimal("0")),
+        (milk.id, date(2026, 2, 1)): (1, Decimal("2"), Decimal("2"), Decimal("0"), Decimal("0")),
+        (apples.id, date(2026, 2, 1)): (1, Decimal("5"), Decimal("4"), Decimal("0"), Decimal("1")),
+    }
+
+    # the incremental refresh agrees with the backfill on a backdated batch
+    dal.update(user_id=user.user_id, inventory_batch_id=february.id, data=InventoryBatchUpdate(quantity_used=Decimal("1")))
+    assert rollups(db_session)[(milk.id, date(2026, 2, 1))] == (1, Decimal("2"), Decimal("1"), Decimal("0"), Decimal("0"))
+
+
+def test_waste_report_groups_rollups(client, db_session, user, run, products):
+    milk, apples = products
+    dal = InventoryBatchDAL(db_session)
+    january = create(dal, user, run, milk, "4", quantity_used=Decimal("1"), quantity_spoiled=Decimal("3"))
+    february = create(dal, user, run, apples, "4", quantity_used=Decimal("3"), quantity_disposed=Decimal("1"))
+    move_to(db_session, january, datetime(2026, 1, 10))
+    move_to(db_session, february, datetime(2026, 2, 10))
+    WasteRollupDAL(db_session).rebuild()
+
+    totals = client.get("/reports/waste").json()
+    assert totals == [{
+        "month": None, "product_id": None, "product_name": None, "category_id": None, "category_name": None,
+        "batch_count": 2, "quantity_added": "8.00", "quantity_used": "4.00",
+        "quantity_spoiled": "3.00", "quantity_disposed": "1.00", "waste_ratio": 0.5,
+    }]
+
+    by_month = client.get("/reports/waste", params={"group_by": "month"}).json()
+    assert [(row["month"], row["waste_ratio"]) for row in by_month] == [("2026-01-01", 0.75), ("2026-02-01", 0.25)]
+
+    by_category = client.get(
+        "/reports/waste", params={"group_by": ["category", "product"], "start": "2026-02-20", "end": "2026-02-20"}
+    ).json()
+    assert [(row["category_name"], row["product_name"], row["quantity_disposed"]) for row in by_category] == [
+        (None, "apples", "1.00"),
+    ]
+
+
+def test_concurrent_refreshes_of_one_rollup(pg_engine, blocked_session):
+    start, finish = blocked_session
+    added_at = datetime(2026, 1, 5)
+
+    def add_batch(session, quantity: str) -> None:
+        session.add(InventoryBatch(
+            grocery_run_id=run.id, product_id=product.id, quantity_added=Decimal(quantity), added_at=added_at
+        ))
+        session.flush()
+        WasteRollupDAL(session).refresh([(product.id, date(2026, 1, 1))])
+
+    with Session(pg_engine, autoflush=False) as session:
+        user = User(firebase_uid="uid123", email="user@example.com")
+        session.add(user)
+        session.flush()
+        run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+        product = Product(user_id=user.user_id, name="milk", type="packaged")
+        session.add_all([run, product])
+        session.commit()
+
+        # the second refresh waits for the first commit, then counts both batches
+        add_batch(session, "2")
+        start(lambda other: add_batch(other, "3"))
+        session.commit()
+        finish()
+
+        assert rollups(session) == {
+            (product.id, date(2026, 1, 1)): (2, Decimal("5.00"), Decimal("0.00"), Decimal("0.00"), Decimal("0.00")),
+        }
@@ -0,0 +1,138 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.api.deps import get_firebase_claims
+from app.main import app
+from app.models.grocery_run import GroceryRun
+from app.models.inventory_batch import InventoryBatch
+from app.models.product import Product
+from app.schemas.firebase import FirebaseClaims
+
+
+# Budgets count every statement a write sends, including the upkeep of derived tables:
+# - a collection_versions bump (one upsert) after every write to a synced collection;
+# - for inventory batches also product_stock and waste_rollups, each rebuilt for the touched
+#   keys with DELETE + INSERT ... SELECT (and, on Postgres only, one advisory lock statement
+#   before them, see app.db.locks), so a batch write is 1 + 5 statements here.
+BATCH_BOOKKEEPING = 5
+
+
+@pytest.fixture
+def run(db_session, user) -> GroceryRun:
+    run = GroceryRun(user_id=user.user_id, trip_date=date(2026, 1, 1))
+    db_session.add(run)
+    db_session.flush()
+    return run
+
+
+@pytest.fixture
+def product(db_session, user) -> Product:
+    product = Product(user_id=user.user_id, name="milk", type="packaged", default_storage_location="fridge")
+    db_session.add(product)
+    db_session.flush()
+    return product
+
+
+@pytest.fixture
+def batch(db_session, run, product) -> InventoryBatch:
+    batch = InventoryBatch(grocery_run_id=run.id, product_id=product.id, quantity_added=Decimal("2"))
+    db_session.add(batch)
+    db_session.flush()
+    return batch
+
+
+def test_create_user_is_one_statement(client, statements):
+    app.dependency_overrides[get_firebase_claims] = lambda: FirebaseClaims(uid="new", email="new@example.com")
+    statements.clear()
+
+    response = client.post("/user/")
+
+    assert response.status_code == 201
+    assert len(statements) == 1
+
+
+def test_create_grocery_run_round_trips(client, statements):
+    statements.clear()
+    response = client.post("/grocery-runs/", json={"trip_date": "2026-01-02"})
+
+    assert response.status_code == 201
+    # the write and the collection version bump
+    assert len(statements) == 2
+
+
+def test_patch_grocery_run_round_trips(client, statements, run, batch):
+    statements.clear()
+    response = client.patch(f"/grocery-runs/{run.id}", json={"notes": "weekly shop"})
+
+    assert response.status_code == 200
+    assert response.json()["notes"] == "weekly shop"
+    # the write and the collection version bump
+    assert len(statements) == 2
+
+
+def test_create_product_round_trips(client, statements):
+    statements.clear()
+    response = client.post("/products/", json={"name": "eggs", "type": "packaged"})
+
+    assert response.status_code == 201
+    # the write and the collection version bump
+    assert len(statements) == 2
+
+
+def test_patch_product_round_trips(client, statements, product):
+    statements.clear()
+    response = client.patch(f"/products/{product.id}", json={"brand": "acme"})
+
+    assert response.status_code == 200
+    assert response.json()["brand"] == "acme"
+    # the write and the collection version bump
+    assert len(statements) == 2
+
+
+def test_create_inventory_batch_round_trips(client, statements, run, product):
+    statements.clear()
+    response = client.post(
+        "/inventory-batches/",
+        json={"grocery_run_id": run.id, "product_id": product.id, "quantity_added": "2", "quantity_used": "2"},
+    )
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["storage_location"] == "fridge"
+    assert body["quantity_current"] == "0.00"
+    assert body["completed_at"] is not None
+    assert len(statements) == 1 + BATCH_BOOKKEEPING
+
+
+def test_create_inventory_batch_for_unowned_run_is_404(client, statements, product):
+    statements.clear()
+    response = client.post(
+        "/inventory-batches/",
+        json={"grocery_run_id": 9999, "product_id": product.id, "quantity_added": "2"},
+    )
+
+    assert response.status_code == 404
+    assert len(statements) == 1
+
+
+def test_patch_inventory_batch_round_trips(client, statements, batch):
+    statements.clear()
+    response = client.patch(f"/inventory-batches/{batch.id}", json={"quantity_spoiled": "2"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["quantity_current"] == "0.00"
+    assert body["completed_at"] is not None
+    assert len(statements) == 1 + BATCH_BOOKKEEPING
+
+
+def test_patch_inventory_batch_rejections(client, batch):
+    invalid = client.patch(f"/inventory-batches/{batch.id}", json={"quantity_used": "3"})
+    missing = client.patch("/inventory-batches/9999", json={"quantity_used": "1"})
+    unowned_run = client.patch(f"/inventory-batches/{batch.id}", json={"grocery_run_id": 9999})
+
+    assert invalid.status_code == 422
+    assert missing.status_code == 404
+    assert unowned_run.status_code == 404